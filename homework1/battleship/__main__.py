@@ -1,9 +1,20 @@
+import asyncio
+import time
 from curses import wrapper, error as curses_error
+from typing import Optional
 
 import click
 
+from battleship.client import format_load_test_report, load_test
+from battleship.exceptions import BattleshipException
+from battleship.fleet import compose_fleet
 from battleship.game import Game
-from battleship.player import ConsolePlayer, RandomPlayer
+from battleship.journal import Replayer, first_divergence
+from battleship.player import ConsolePlayer, RandomPlayer, player_seed
+from battleship.server import GameServer
+from battleship.simulation import PLAYER_TYPES, format_report, simulate
+from battleship.tournament import (CSV_FORMAT, REPORT_FORMATS, ROUND_ROBIN, SYSTEMS, ReportWriter, Tournament,
+                                   format_standings)
 
 
 def get_player_name() -> str:
@@ -73,14 +84,24 @@ def play(screen, n: int, k: int, player_name: str) -> None:
         elif c == ord('l'):
             # load game from file
             try:
-                game.load()
-            except curses_error:
+                index = game.load()
+            except (curses_error, OSError, BattleshipException):
                 screen.clear()
                 screen.addstr(0, 0, 'Couldn\'t load the game.\nPress any key to continue...')
                 screen.getch()
                 continue
             # run game
-            game.loop()
+            game.loop(index)
+
+
+def check_occupancy(ctx, param, value: float) -> float:
+    """
+    check the share of the grid occupied by ships
+    :type value: float
+    """
+    if not 0 <= value <= 1:
+        raise click.BadParameter('occupancy must be between 0 and 1')
+    return value
 
 
 def check_grid_side(ctx, param, value: int) -> int:
@@ -93,14 +114,174 @@ def check_grid_side(ctx, param, value: int) -> int:
     return value
 
 
-@click.command()
+class DefaultGroup(click.Group):
+    """
+    the group of commands which runs the default command when the first argument is not a command,
+    so `python -m battleship N K` still plays the game
+    """
+
+    def __init__(self, *args, default: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default = default
+
+    def parse_args(self, ctx, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and not args[0].startswith('-')):
+            args = [self.default, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup, default='play')
+def cli() -> None:
+    pass
+
+
+@cli.command('play')
 @click.argument('n', default=10, type=int, callback=check_grid_side)
 @click.argument('k', default=10, type=int, callback=check_grid_side)
 def main(n: int, k: int) -> None:
+    """
+    play the game against the randomer
+    """
     player1_name = get_player_name()
 
     wrapper(play, n, k, player1_name)
 
 
+@cli.command('simulate')
+@click.argument('n', default=10, type=int, callback=check_grid_side)
+@click.argument('k', default=10, type=int, callback=check_grid_side)
+@click.option('-g', '--games', default=1000, show_default=True, help='count of games to play')
+@click.option('-j', '--jobs', type=int, help='count of worker processes  [default: count of cpus]')
+@click.option('-s', '--seed', default=0, show_default=True, help='seed of the first game')
+@click.option('-1', '--first', 'first', default='random', show_default=True,
+              type=click.Choice(sorted(PLAYER_TYPES)), help='the first player')
+@click.option('-2', '--second', 'second', default='random', show_default=True,
+              type=click.Choice(sorted(PLAYER_TYPES)), help='the second player')
+@click.option('-o', '--occupancy', default=0.2, show_default=True, callback=check_occupancy,
+              help='share of the grid occupied by ships')
+@click.option('--journal', 'journal_dir', type=click.Path(exists=True, file_okay=False, writable=True),
+              help='the folder to write journals of games to')
+def simulate_command(n: int, k: int, games: int, jobs: int, seed: int, first: str, second: str,
+                     occupancy: float, journal_dir: Optional[str]) -> None:
+    """
+    play many games between two computer players without drawing
+    """
+    player_types = first, second
+    report = simulate(player_types, games, n, k, jobs, seed, occupancy, journal_dir)
+    click.echo(format_report(report, player_types))
+
+
+@cli.command('tournament')
+@click.argument('n', default=10, type=int, callback=check_grid_side)
+@click.argument('k', default=10, type=int, callback=check_grid_side)
+@click.option('--player', 'players', multiple=True, type=click.Choice(sorted(PLAYER_TYPES)),
+              help='the player of the tournament, can be repeated  [default: all players]')
+@click.option('--system', default=ROUND_ROBIN, show_default=True, type=click.Choice(SYSTEMS),
+              help='the tournament system')
+@click.option('-r', '--rounds', type=int, help='count of rounds of the swiss system')
+@click.option('-g', '--games', default=10, show_default=True, help='count of games in every match')
+@click.option('-j', '--jobs', type=int, help='count of worker processes  [default: count of cpus]')
+@click.option('-s', '--seed', default=0, show_default=True, help='seed of the first game')
+@click.option('-o', '--output', type=click.File('w'), help='the file to stream results of games to')
+@click.option('-f', '--format', 'report_format', default=CSV_FORMAT, show_default=True,
+              type=click.Choice(REPORT_FORMATS), help='the format of the output, json means JSON lines')
+def tournament_command(n: int, k: int, players: tuple[str], system: str, rounds: Optional[int], games: int,
+                       jobs: Optional[int], seed: int, output, report_format: str) -> None:
+    """
+    play the tournament between computer players, all of them by default
+    """
+    try:
+        tournament = Tournament(players or sorted(PLAYER_TYPES), n, k, games, seed)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    on_game = ReportWriter(output, report_format) if output is not None else None
+    standings = tournament.run(system, rounds, jobs, on_game)
+    click.echo(format_standings(standings))
+
+
+@cli.command('replay')
+@click.argument('journals', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--check', type=click.Choice(sorted(PLAYER_TYPES)),
+              help='the player to compare with moves of the journal')
+@click.option('--index', default=0, show_default=True, type=click.IntRange(0, 1),
+              help='the index of the player of the journal to compare with')
+def replay_command(journals: tuple[str], check: Optional[str], index: int) -> None:
+    """
+    re-simulate journals of games without players
+    """
+    wins, shots, diverged = [0, 0], 0, 0
+    start = time.perf_counter()
+    for path in journals:
+        try:
+            with open(path, 'rb') as file:
+                replayer = Replayer(file)
+            if check is None:
+                result = replayer.run()
+                if result.winner is not None:
+                    wins[result.winner] += 1
+                shots += sum(result.shot_counts)
+                continue
+            # the generator of the player is seeded like in simulation
+            number = first_divergence(replayer, index, PLAYER_TYPES[check](player_seed(replayer.seed, index)))
+        except BattleshipException as e:
+            raise click.ClickException(f'{path}: {e}')
+        if number is not None:
+            diverged += 1
+            click.echo(f'{path}: the player made another move at the shot {number}')
+    seconds = time.perf_counter() - start
+
+    click.echo(f'journals: {len(journals)}, {len(journals) / seconds if seconds else float("inf"):.1f} games/s')
+    if check is None:
+        click.echo(f'wins: {wins[0]} and {wins[1]}, {shots} shots')
+    else:
+        click.echo(f'{diverged} journals diverged')
+
+
+@cli.command('serve')
+@click.argument('n', default=10, type=int, callback=check_grid_side)
+@click.argument('k', default=10, type=int, callback=check_grid_side)
+@click.option('-h', '--host', default='127.0.0.1', show_default=True, help='the address to listen on')
+@click.option('-p', '--port', default=8765, show_default=True, help='the port to listen on')
+@click.option('-t', '--timeout', default=60., show_default=True, help='seconds to wait for a move')
+@click.option('-o', '--occupancy', default=0.2, show_default=True, callback=check_occupancy,
+              help='share of the grid occupied by ships')
+def serve_command(n: int, k: int, host: str, port: int, timeout: float, occupancy: float) -> None:
+    """
+    host network games between connected players
+    """
+    async def serve():
+        server = await GameServer(n, k, timeout, compose_fleet(k, n, occupancy)).start(host, port)
+        click.echo(f'serving on {host}:{port}')
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command('loadtest')
+@click.option('-h', '--host', default='127.0.0.1', show_default=True, help='the address of the server')
+@click.option('-p', '--port', default=8765, show_default=True,
+              help='the port of the server, 0 to start the server inside of the test')
+@click.option('-g', '--games', default=100, show_default=True, help='count of games to play')
+@click.option('-c', '--concurrency', default=10, show_default=True, help='count of games played at the same time')
+@click.option('--player', default='random', show_default=True,
+              type=click.Choice(sorted(PLAYER_TYPES)), help='players of the games')
+def load_test_command(host: str, port: int, games: int, concurrency: int, player: str) -> None:
+    """
+    play many network games between computer players and measure the server
+    """
+    async def run():
+        nonlocal port
+        if not port:
+            server = await GameServer(10, 10).start(host, 0)
+            port = server.sockets[0].getsockname()[1]
+        return await load_test(host, port, games, concurrency, PLAYER_TYPES[player])
+
+    click.echo(format_load_test_report(asyncio.run(run())))
+
+
 if __name__ == '__main__':
-    main()
+    cli()
@@ -0,0 +1,147 @@
+import asyncio
+import statistics
+import time
+from typing import NamedTuple
+
+from battleship import protocol
+from battleship.exceptions import ProtocolException
+from battleship.grid import FieldView, Grid
+from battleship.player import AbstractPlayer
+from battleship.ships import Ship
+from battleship.utils import Coordinate, MoveStatus, ShotStatus
+
+
+class RemoteGameResult(NamedTuple):
+    """
+    result of one network game from the side of the client
+    """
+    won: bool
+    latencies: list[float]  # seconds from sending every shot to receiving its result
+
+
+class LoadTestReport(NamedTuple):
+    """
+    aggregated results of many network games
+    """
+    games: int
+    errors: int  # count of games which failed because of the connection or the protocol
+    seconds: float
+    latencies: list[float]
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else float('inf')
+
+    def latency_percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[percent - 1]
+
+
+def _unpack_ship(packed: list[int]) -> Ship:
+    x, y, length, rotation = packed
+    return Ship(length, Coordinate(x, y), rotation)
+
+
+async def play_remote(player: AbstractPlayer, host: str, port: int) -> RemoteGameResult:
+    """
+    plays one game on the server for the given player
+    can raise ConnectionError and ProtocolException
+    :return: the result of the game
+    :rtype: RemoteGameResult
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=protocol.MAX_MESSAGE_SIZE)
+    latencies: list[float] = []
+    try:
+        writer.write(protocol.encode({'type': 'join', 'name': player.name}))
+
+        grid = field_op = None
+        opponent_cells = bytearray()
+        width = 0
+        sent_at = 0.
+        while True:
+            message = await protocol.receive(reader)
+            if message is None:
+                raise ConnectionError('the server has closed the connection')
+            kind = message.get('type')
+
+            if kind == 'start':
+                width, height = message['width'], message['height']
+                grid = Grid(width, height, dict(message['fleet']))
+                for packed in message['ships']:
+                    grid.place_ship(_unpack_ship(packed))
+                # the client knows only the shots at opponent grid, so it keeps the field of the opponent itself
+                opponent_cells = bytearray(Grid.EMPTY_CELL_CHARACTER.encode()) * (width * height)
+                field_op = FieldView(opponent_cells, width)
+                player.new_game(grid)
+            elif kind == 'turn':
+                move, coord = player.make_move(field_op, grid.make_field(for_opponent=False), grid)
+                if move != MoveStatus.MOVEMENT:
+                    # a network game can be neither saved nor left without losing
+                    break
+                sent_at = time.perf_counter()
+                writer.write(protocol.encode({'type': 'shot', 'x': coord.x, 'y': coord.y}))
+            elif kind == 'result':
+                latencies.append(time.perf_counter() - sent_at)
+                coord, status = Coordinate(message['x'], message['y']), ShotStatus[message['status']]
+                if status == ShotStatus.HIT:
+                    opponent_cells[coord.y * width + coord.x] = ord(Grid.DAMAGED_SHIP_CHARACTER)
+                elif status == ShotStatus.SINK:
+                    for cell in _unpack_ship(message['ship']).coordinates:
+                        opponent_cells[cell.y * width + cell.x] = ord(Grid.DESTROYED_SHIP_CHARACTER)
+                player.shot_result(coord, status)
+            elif kind == 'opponent_shot':
+                grid.shot(Coordinate(message['x'], message['y']))
+            elif kind == 'end':
+                return RemoteGameResult(bool(message['winner']), latencies)
+            elif kind == 'error':
+                raise ProtocolException(message.get('message', 'unknown error'))
+        return RemoteGameResult(False, latencies)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ProtocolException('the message of the server is malformed') from e
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, games: int, concurrency: int,
+                    player_type: type[AbstractPlayer]) -> LoadTestReport:
+    """
+    plays games on the server by computer players, both players of every game are clients of this test
+    :param games: count of games to play
+    :param concurrency: count of games played at the same time
+    :param player_type: the class of players
+    :return: the report of the test
+    :rtype: LoadTestReport
+    """
+    semaphore = asyncio.Semaphore(concurrency * 2)
+    latencies: list[float] = []
+    errors = 0
+
+    async def play_client():
+        nonlocal errors
+        async with semaphore:
+            try:
+                result = await play_remote(player_type(), host, port)
+            except (ConnectionError, ProtocolException):
+                errors += 1
+            else:
+                latencies.extend(result.latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(play_client() for _ in range(games * 2)))
+    seconds = time.perf_counter() - start
+    # every game has two clients
+    return LoadTestReport(games, (errors + 1) // 2, seconds, latencies)
+
+
+def format_load_test_report(report: LoadTestReport) -> str:
+    """
+    :return: the human readable representation of the report
+    :rtype: str
+    """
+    mean = statistics.fmean(report.latencies) if report.latencies else 0.
+    return f'{report.games} games in {report.seconds:.2f} s ({report.games_per_second:.1f} games/s), ' \
+           f'{report.errors} failed\n' \
+           f'move latency: mean {mean * 1000:.2f} ms, ' \
+           f'p50 {report.latency_percentile(50) * 1000:.2f} ms, ' \
+           f'p99 {report.latency_percentile(99) * 1000:.2f} ms'
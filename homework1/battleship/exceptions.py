@@ -12,3 +12,15 @@ class InvalidCoordinateException(BattleshipException):
 
 class CantPlaceShipException(BattleshipException):
     pass
+
+
+class InvalidSaveException(BattleshipException):
+    pass
+
+
+class ProtocolException(BattleshipException):
+    pass
+
+
+class InvalidJournalException(BattleshipException):
+    pass
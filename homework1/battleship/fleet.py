@@ -0,0 +1,100 @@
+"""
+composition of the fleet for the grid of any size
+
+the default fleet consists of ships of lengths from 1 to `t`, where there is one ship of length `t`,
+two ships of length `t - 1`, ..., and `t` ships of length 1.
+Such fleet occupies the tetrahedral number of cells `t * (t + 1) * (t + 2) / 6`,
+`t` is the largest class whose fleet fits into the requested share of the grid area.
+"""
+from fractions import Fraction
+from functools import lru_cache
+from numbers import Rational
+from types import MappingProxyType
+from typing import Mapping, Union
+
+# the share of the grid area occupied by ships
+DEFAULT_OCCUPANCY = Fraction(1, 5)
+
+# count of distinct (width, height, occupancy) fleets kept in memory
+CACHE_SIZE = 1024
+
+# occupancies given as floats are rounded to fractions with denominators up to this one
+MAX_DENOMINATOR = 10 ** 6
+
+
+def tetrahedral(t: int) -> int:
+    """
+    :return: the area occupied by the fleet of the class `t`
+    :rtype: int
+    """
+    return t * (t + 1) * (t + 2) // 6
+
+
+def fleet_class(area: int) -> int:
+    """
+    :param area: the area which can be occupied by ships
+    :return: the largest `t` whose fleet occupies at most `area` cells
+    :rtype: int
+    """
+    if area <= 0:
+        return 0
+    # the float cube root is only a guess, it is fixed by exact integer comparisons
+    t = int((6 * area) ** (1 / 3))
+    while tetrahedral(t) > area:
+        t -= 1
+    while tetrahedral(t + 1) <= area:
+        t += 1
+    return t
+
+
+def compose_fleet(width: int, height: int,
+                  occupancy: Union[Rational, float] = DEFAULT_OCCUPANCY) -> MappingProxyType[int, int]:
+    """
+    computes the default fleet for the grid, fleets are cached, so the repeated call is cheap
+    :param width: the width of the grid
+    :param height: the height of the grid
+    :param occupancy: the share of the grid area occupied by ships, from 0 to 1
+    :return: the read-only dictionary of such pairs: ships_length: ships_count
+    :rtype: MappingProxyType
+    """
+    if not isinstance(occupancy, Fraction):
+        occupancy = Fraction(occupancy).limit_denominator(MAX_DENOMINATOR)
+    # hashing of integers is much cheaper than hashing of the fraction
+    return _compose_fleet(width, height, occupancy.numerator, occupancy.denominator)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compose_fleet(width: int, height: int, numerator: int, denominator: int) -> MappingProxyType[int, int]:
+    if not 0 <= numerator <= denominator:
+        raise ValueError('occupancy must be between 0 and 1')
+    area = width * height * numerator // denominator
+    # ships must not be longer than the half of the shortest side, e.g. for grids of size 100x5
+    t = min(fleet_class(area), width // 2, height // 2)
+    return MappingProxyType({length: t - length + 1 for length in range(1, t + 1)})
+
+
+def check_fleet(fleet: Mapping[int, int], width: int, height: int) -> MappingProxyType[int, int]:
+    """
+    checks the custom fleet for the grid
+    can raise ValueError
+    :param fleet: the dictionary of such pairs: ships_length: ships_count
+    :return: the read-only copy of the fleet
+    :rtype: MappingProxyType
+    """
+    longest = max(width, height)
+    for length, count in fleet.items():
+        if not isinstance(length, int) or not 1 <= length <= longest:
+            raise ValueError(f'ships of length {length} do not fit into the grid')
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f'count of ships of length {length} must be a non-negative integer')
+    if fleet_area(fleet) > width * height:
+        raise ValueError('ships occupy more cells than the grid has')
+    return MappingProxyType(dict(fleet))
+
+
+def fleet_area(fleet: Mapping[int, int]) -> int:
+    """
+    :return: count of cells occupied by all ships of the fleet
+    :rtype: int
+    """
+    return sum(length * count for length, count in fleet.items())
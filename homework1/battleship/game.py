@@ -1,11 +1,14 @@
 import curses
-import pickle
-from typing import Optional
+import random
+from typing import Mapping, Optional
 
+from battleship import savefile
 from battleship.exceptions import PlayersNotSetException
+from battleship.fleet import check_fleet, compose_fleet
 from battleship.grid import Grid
+from battleship.journal import JournalWriter
 from battleship.player import AbstractPlayer
-from battleship.utils import ShotStatus, MoveStatus
+from battleship.utils import Coordinate, ShotStatus, MoveStatus
 
 
 class Game:
@@ -15,23 +18,36 @@ class Game:
     Manages main elements of the application
     """
 
-    def __init__(self, screen, n: int, k: int):
+    def __init__(self, screen, n: int, k: int, seed: Optional[int] = None,
+                 fleet: Optional[Mapping[int, int]] = None):
         """
         Initialize game instance
-        :param screen is the curses screen to draw on
+        :param screen is the curses screen to draw on or None to play without drawing
         :param n is the height of playing field
         :param k is the width of playing field
+        :param seed is the seed of ships placement
+        :param fleet is the dictionary of such pairs: ships_length: ships_count, the default fleet if None
         """
         self._screen = screen
         self._kn = k, n
+        self._seed = seed
+        self._random = random.Random(seed)
+        # the fleet is checked once, grids of next games share it
+        self._fleet = compose_fleet(k, n) if fleet is None else check_fleet(fleet, k, n)
 
-        self._grid1 = Grid(*self._kn)
-        self._grid2 = Grid(*self._kn)
+        self._grid1 = Grid(*self._kn, self._fleet)
+        self._grid2 = Grid(*self._kn, self._fleet)
 
         self._player1: Optional[AbstractPlayer] = None
         self._player2: Optional[AbstractPlayer] = None
 
         self._winner: Optional[AbstractPlayer] = None
+        # count of shots made by every player
+        self._shot_counts = [0, 0]
+        # grows after every miss, the player to move is `self._player_index % 2`
+        self._player_index = 0
+        # records placements and shots of the game if set
+        self.journal: Optional[JournalWriter] = None
 
     @property
     def player1(self) -> AbstractPlayer:
@@ -57,68 +73,116 @@ class Game:
     def winner(self) -> Optional[AbstractPlayer]:
         return self._winner
 
+    @property
+    def grids(self) -> tuple[Grid, Grid]:
+        return self._grid1, self._grid2
+
+    @property
+    def shot_counts(self) -> tuple[int, int]:
+        return self._shot_counts[0], self._shot_counts[1]
+
     def restart(self):
         self._winner = None
-        self._grid1 = Grid(*self._kn)
-        self._grid2 = Grid(*self._kn)
+        self._shot_counts = [0, 0]
+        self._grid1 = Grid(*self._kn, self._fleet)
+        self._grid2 = Grid(*self._kn, self._fleet)
 
-    def loop(self, index: int = 0) -> None:
+    @property
+    def current_player_index(self) -> int:
+        """
+        :return: the index of the player to move: 0 for the first player and 1 for the second one
+        :rtype: int
+        """
+        return self._player_index % 2
+
+    def start(self, index: int = 0) -> None:
+        """
+        prepares the game to the first move
+        :param index: the index of the player to move first
+        :type index: int
+        """
         if self._player1 is None and self._player2 is None:
             raise PlayersNotSetException("players must not be None")
 
-        # players place ships to their grids
-        self.player1.place_ships(self._grid1)
-        self.player2.place_ships(self._grid2)
+        # players place ships to their grids, loaded grids have ships already
+        if not len(self._grid1.ships):
+            self.player1.place_ships(self._grid1, self._random.getrandbits(64))
+        if not len(self._grid2.ships):
+            self.player2.place_ships(self._grid2, self._random.getrandbits(64))
+        self.player1.new_game(self._grid1)
+        self.player2.new_game(self._grid2)
 
-        # to prettify code
-        player_list = [self.player1, self.player2]
-        player_index = index
+        self._player_index = index
+        if self.journal is not None:
+            self.journal.start(self.grids, index, self._seed)
 
-        grid_list = [self._grid1, self._grid2]
+    def shoot(self, coord: Coordinate) -> ShotStatus:
+        """
+        makes the shot of the current player to the opponent grid
+        the turn passes to the opponent after a miss, the winner is determined after the last sink
+        :return: the status of the shot
+        :rtype: ShotStatus
+        """
+        cur_player_index = self.current_player_index
+        cur_player = [self.player1, self.player2][cur_player_index]
+        opponent_grid = [self._grid2, self._grid1][cur_player_index]
+
+        status = opponent_grid.shot(coord)
+        self._shot_counts[cur_player_index] += 1
+        if self.journal is not None:
+            self.journal.shot(coord)
+        cur_player.shot_result(coord, status)
+
+        if self._lost(opponent_grid):
+            self._winner = cur_player
+        # if it misses, change the player
+        elif status == ShotStatus.MISS:
+            self._player_index += 1
+        return status
 
-        while True:
-            # if winner is determined exit game loop
-            if self.winner:
-                break
+    def loop(self, index: int = 0) -> None:
+        self.start(index)
 
-            # just another clear
-            self._screen.clear()
+        # to prettify code
+        player_list = [self.player1, self.player2]
+        grid_list = [self._grid1, self._grid2]
 
+        # if winner is determined exit game loop
+        while not self.winner:
             # some variables for better code reading
-            cur_player_index = player_index % 2
-            next_player_index = (cur_player_index + 1) % 2
+            cur_player_index = self.current_player_index
             cur_grid = grid_list[cur_player_index]
-            opponent_grid = grid_list[next_player_index]
+            opponent_grid = grid_list[1 - cur_player_index]
             cur_player = player_list[cur_player_index]
 
-            # if some player lost exit the loop
-            while not self._lost(opponent_grid):
-                # "my" field
-                field_not_op = cur_grid.make_field(for_opponent=False)
-                # opponent field
-                field_op = opponent_grid.make_field(for_opponent=True)
-
-                # let player to choose the move
-                move, coord = cur_player.make_move(field_op, field_not_op, cur_grid)
-
-                # if player want to exit the game...
-                if move == MoveStatus.EXIT_GAME:
-                    return
-                # ...or save the game
-                elif move == MoveStatus.SAVE_GAME:
-                    self.save(player_index)
-
-                # do shot to opponent grid
-                status = opponent_grid.shot(coord)
-                # if it misses, change the player
-                if status == ShotStatus.MISS:
-                    break
-            else:
-                # if someone loses, determine winner and exit to main menu
+            # the loaded game may be finished already
+            if self._lost(opponent_grid):
                 self._winner = cur_player
                 break
-            # swap players
-            player_index += 1
+
+            # "my" field
+            field_not_op = cur_grid.make_field(for_opponent=False)
+            # opponent field
+            field_op = opponent_grid.make_field(for_opponent=True)
+
+            # let player to choose the move
+            move, coord = cur_player.make_move(field_op, field_not_op, cur_grid)
+
+            # if player want to exit the game...
+            if move == MoveStatus.EXIT_GAME:
+                return
+            # ...or save the game
+            elif move == MoveStatus.SAVE_GAME:
+                self.save(self._player_index)
+                # the player still has to make the move
+                continue
+
+            # do shot to opponent grid
+            status = self.shoot(coord)
+            # just another clear before the move of the next player,
+            # `erase` does not force the repaint of the whole terminal
+            if status == ShotStatus.MISS and self._screen is not None:
+                self._screen.erase()
 
     def save(self, index: int) -> None:
         """
@@ -129,10 +193,10 @@ class Game:
         """
         try:
             # prompting filename
-            path = self._get_filename('Enter a filename to save(with *.pkl extension):')
+            path = self._get_filename('Enter a filename to save(with *.bship extension):')
             with open(path, 'wb') as file:
                 # dump all data
-                pickle.dump([self._grid1, self._grid2, index], file)
+                savefile.dump(file, [self._grid1, self._grid2], index)
         except:
             # in case of error just print some message
             self._screen.clear()
@@ -146,10 +210,10 @@ class Game:
         :rtype: int
         """
         # get filename
-        path = self._get_filename('Enter a filename with a save of the game(with *.pkl extension):')
+        path = self._get_filename('Enter a filename with a save of the game(*.bship or old *.pkl):')
         with open(path, 'rb') as file:
             # loads the state
-            self._grid1, self._grid2, index = pickle.load(file)
+            (self._grid1, self._grid2), index = savefile.load(file)
             # reset winner
             self._winner = None
         return index
@@ -184,10 +248,7 @@ class Game:
         :return: whether the player lost the game
         :rtype: bool
         """
-        for ship in grid.ships:
-            if not ship.is_destroyed:
-                return False
-        return True
+        return grid.lost
 
     @staticmethod
     def check_terminal_size(screen_size: tuple[int, int], string: str) -> bool:
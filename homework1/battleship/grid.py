@@ -1,10 +1,12 @@
-from copy import deepcopy
-from math import sqrt
+from array import array
+from collections.abc import Sequence
 from types import MappingProxyType
+from typing import Mapping, Optional
 
 from battleship.exceptions import CantPlaceShipException
+from battleship.fleet import check_fleet, compose_fleet
 from battleship.ships import Ship
-from battleship.utils import Size, ShotStatus, Coordinate
+from battleship.utils import Size, ShotStatus, Coordinate, Rotation
 
 
 class Grid:
@@ -14,54 +16,66 @@ class Grid:
     EMPTY_CELL_CHARACTER = '.'
     HERE_CHARACTER = 'H'  # player cursor to check cells
 
-    def __init__(self, k: int, n: int):
+    # the state matrix keeps cells as characters of the field of the owner
+    _EMPTY_CELL = ord(EMPTY_CELL_CHARACTER)
+    _SHIP_CELL = ord(SHIP_CHARACTER)
+    _DAMAGED_CELL = ord(DAMAGED_SHIP_CHARACTER)
+    _DESTROYED_CELL = ord(DESTROYED_SHIP_CHARACTER)
+    # the opponent does not see intact cells of ships
+    _OPPONENT_TABLE = bytes.maketrans(SHIP_CHARACTER.encode(), EMPTY_CELL_CHARACTER.encode())
+
+    def __init__(self, k: int, n: int, fleet: Optional[Mapping[int, int]] = None):
         """
         :param k: the k from the statement
         :param n: the n from the statement
+        :param fleet: the dictionary of such pairs: ships_length: ships_count,
+        the default fleet occupies nearly 20% of the grid(see `battleship.fleet`)
         """
         self._grid_size = Size(n, k)
-        self._ship_counts = self._compute_ship_count(self._grid_size)
+        if fleet is None:
+            self._ship_counts = compose_fleet(k, n)
+        else:
+            self._ship_counts = check_fleet(fleet, k, n)
 
         self._ships: list[Ship] = []
 
-    @staticmethod
-    def _compute_ship_count(grid_size: Size) -> dict[int, int]:
+        self._reset_boards()
+
+    def _reset_boards(self):
         """
-        for size of the grid calculate the count of ships of every type
-        total occupied area of ships is nearly equal to 20%
-        :return the dictionary of such pairs: ships_type: ships_count
-        :rtype dict
+        (re)builds the flat boards of the grid from the list of ships
+        every board is indexed by `y * width + x`
         """
-        counts = {}
-
-        occupied_field_area = grid_size.height * grid_size.width // 5  # 20% of field
-
-        # magic
-
-        # this is a solution of equation
-        # |1/6 * t**3 + 1/2 * t**2 + t/3 - occupied_field_area|, where meaning of t if explained below
-        # and occupied_field_area is an area occupied by ships
-
-        # ships of length of t is 1, of (t-1) is 2 ..., of 2 is (t-1) and of 1 is t
+        area = self._grid_size.height * self._grid_size.width
+        # the index of the ship in `self._ships` plus one, zero means the cell is empty
+        self._ship_ids = array('I', [0]) * area
+        # the state matrix, it is updated by `shot` and projected to fields by `make_field`
+        self._cells = bytearray((self._EMPTY_CELL,)) * area
+        # live counters updated by `shot`
+        self._intact_cells = 0
+        self._afloat_ships = 0
 
-        # and the above equation is the count of area occupied depending on t
-        x = (3 * occupied_field_area + 1 / 3 * sqrt(81 * occupied_field_area ** 2 - 1 / 3)) ** (1 / 3)
-        ship_coefficient = int(
-            x + 1 / (3 * x) - 1
-        )
+        for ship_id, ship in enumerate(self._ships, start=1):
+            self._mark_ship(ship, ship_id, self._ship_cells(ship))
 
-        # to avoid the overflow of ship size in case of size of grid is 100x5 or so
-        ship_coefficient = min(ship_coefficient, grid_size.width // 2, grid_size.height // 2)
+    def __getstate__(self) -> dict:
+        # the boards are not pickled, so saves stay compatible with the plain list of ships
+        state = self.__dict__.copy()
+        for key in ('_ship_ids', '_cells', '_intact_cells', '_afloat_ships'):
+            del state[key]
+        # mapping proxies can not be pickled
+        state['_ship_counts'] = dict(self._ship_counts)
+        return state
 
-        for ship_size in range(1, ship_coefficient + 1):
-            counts[ship_size] = ship_coefficient - ship_size + 1
-
-        return counts
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._ship_counts = MappingProxyType(self._ship_counts)
+        self._reset_boards()
 
     @property
     def ship_counts(self) -> MappingProxyType[int, int]:
-        # helps to avoid changing
-        return MappingProxyType(self._ship_counts)
+        # the fleet is kept read-only, it may be shared by many grids
+        return self._ship_counts
 
     @property
     def size(self):
@@ -76,60 +90,103 @@ class Grid:
     def place_ship(self, ship: Ship):
         """
         places the ship into the grid
-        :param ship: ship to place
+        :param ship: ship to place, it may be damaged already
         :return: whether the method could place the ship or not
         :rtype: bool
         """
-        if not self.can_place_ship(ship):
+        cells = self._free_cells(ship)
+        if cells is None:
             raise CantPlaceShipException()
         self._ships.append(ship)
+        self._mark_ship(ship, len(self._ships), cells)
 
     def can_place_ship(self, ship: Ship) -> bool:
         """
         checks opportunity to place the ship
         """
-        for inner_ship in self._ships:
-            # if sets intersection not empty
-            if inner_ship.coordinates & ship.coordinates:
-                return False
-        return True
+        return self._free_cells(ship) is not None
+
+    def _free_cells(self, ship: Ship) -> Optional[range]:
+        """
+        :return: the range of flat indexes occupied by the ship or None if the ship can not be placed
+        :rtype: range
+        """
+        cells = self._ship_cells(ship)
+        # all cells under the ship must be empty
+        if cells is None or any(self._ship_ids[cells.start:cells.stop:cells.step]):
+            return None
+        return cells
+
+    def _cell_index(self, coord: Coordinate) -> int:
+        """
+        :return: the index of the cell in the flat boards
+        :rtype: int
+        """
+        return coord.y * self._grid_size.width + coord.x
+
+    def _in_bounds(self, coord: Coordinate) -> bool:
+        return 0 <= coord.x < self._grid_size.width and 0 <= coord.y < self._grid_size.height
+
+    def _ship_cells(self, ship: Ship) -> Optional[range]:
+        """
+        :return: the range of flat indexes occupied by the ship or None if the ship is out of the grid
+        :rtype: range
+        """
+        head = ship.head_coord
+        if ship.rotation == Rotation.HORIZONTAL:
+            tail, step = Coordinate(head.x + ship.size - 1, head.y), 1
+        elif ship.rotation == Rotation.VERTICAL:
+            tail, step = Coordinate(head.x, head.y + ship.size - 1), self._grid_size.width
+        else:
+            raise RuntimeError("unknown rotation parameter")
+
+        if not self._in_bounds(head) or not self._in_bounds(tail):
+            return None
+        start = self._cell_index(head)
+        return range(start, start + step * ship.size, step)
+
+    def _mark_ship(self, ship: Ship, ship_id: int, cells: range):
+        """
+        writes the id and the state of the ship(it may be damaged already) into all cells it occupies
+        """
+        self._ship_ids[cells.start:cells.stop:cells.step] = array('I', [ship_id]) * ship.size
 
-    def make_field(self, for_opponent: bool = False) -> list[list[str]]:
+        if ship.is_destroyed:
+            self._paint_ship(cells, self._DESTROYED_CELL)
+            return
+        self._paint_ship(cells, self._SHIP_CELL)
+        self._afloat_ships += 1
+        self._intact_cells += ship.size
+
+        hits = ship.hit_mask
+        while hits:
+            # the lowest set bit is the next damaged cell
+            offset = (hits & -hits).bit_length() - 1
+            self._cells[cells[offset]] = self._DAMAGED_CELL
+            self._intact_cells -= 1
+            hits &= hits - 1
+
+    def _paint_ship(self, cells: range, cell: int):
+        """
+        writes the given state into all cells of the ship in the state matrix
+        :param cells: the range of flat indexes occupied by the ship
+        """
+        self._cells[cells.start:cells.stop:cells.step] = bytes((cell,)) * len(cells)
+
+    def make_field(self, for_opponent: bool = False) -> 'FieldView':
         """
-        map the grid into the list of list of chars(a.k.a. field)
+        map the grid into the field, `field[y][x]` is the character of the cell
+        the field is a projection of the state matrix, so it does not copy cells and
+        always shows the current state of the grid
         :param for_opponent: whether this for opponent or not
         :type for_opponent: bool
         :return: the field of this grid
-        :rtype: list
-        """
-        field = [[self.EMPTY_CELL_CHARACTER for _ in range(self.size.height)] for _ in range(self.size.width)]
-
-        if not for_opponent:
-            for ship in self._ships:
-                for coord in ship.coordinates:
-                    if ship.is_destroyed:
-                        char = self.DESTROYED_SHIP_CHARACTER
-                    elif ship.damaged and coord in ship.damaged_cells:
-                        char = self.DAMAGED_SHIP_CHARACTER
-                    else:
-                        char = self.SHIP_CHARACTER
-                    field[coord.y][coord.x] = char
-        else:
-            for ship in self._ships:
-                # skip ship if it is intact
-                if not ship.damaged and not ship.is_destroyed:
-                    continue
-                if ship.is_destroyed:
-                    for coord in ship.coordinates:
-                        field[coord.y][coord.x] = self.DESTROYED_SHIP_CHARACTER
-                elif ship.damaged:
-                    for coord in ship.damaged_cells:
-                        field[coord.y][coord.x] = self.DAMAGED_SHIP_CHARACTER
-
-        return field
+        :rtype: FieldView
+        """
+        return FieldView(self._cells, self._grid_size.width, self._OPPONENT_TABLE if for_opponent else None)
 
     @staticmethod
-    def concat_field(field: list[list[str]]) -> str:
+    def concat_field(field: Sequence[Sequence[str]]) -> str:
         """
         concatenate the field returned by `make_field`
         :return: the resulting text
@@ -143,15 +200,108 @@ class Grid:
         :return: the status of shot
         :rtype: ShotStatus
         """
-        for ship in self._ships:
-            if coord in ship.coordinates:
-                ship.shot(coord)
-                if ship.is_destroyed:
-                    return ShotStatus.SINK
-                return ShotStatus.HIT
-        return ShotStatus.MISS
+        if not self._in_bounds(coord):
+            return ShotStatus.MISS
+        index = self._cell_index(coord)
+        ship_id = self._ship_ids[index]
+        if not ship_id:
+            return ShotStatus.MISS
+
+        ship = self._ships[ship_id - 1]
+        ship.shot(coord)
+        if self._cells[index] == self._SHIP_CELL:
+            # only the first shot to the cell changes the counters
+            self._cells[index] = self._DAMAGED_CELL
+            self._intact_cells -= 1
+            if ship.is_destroyed:
+                self._afloat_ships -= 1
+                self._paint_ship(self._ship_cells(ship), self._DESTROYED_CELL)
+        if ship.is_destroyed:
+            return ShotStatus.SINK
+        return ShotStatus.HIT
+
+    def ship_at(self, coord: Coordinate) -> Optional[Ship]:
+        """
+        :return: the ship which occupies the cell or None if the cell is empty
+        :rtype: Ship
+        """
+        if not self._in_bounds(coord):
+            return None
+        ship_id = self._ship_ids[self._cell_index(coord)]
+        return self._ships[ship_id - 1] if ship_id else None
+
+    @property
+    def intact_cells(self) -> int:
+        """
+        :return: count of ship cells that were not shot yet
+        :rtype: int
+        """
+        return self._intact_cells
+
+    @property
+    def afloat_ships(self) -> int:
+        """
+        :return: count of ships that were not destroyed yet
+        :rtype: int
+        """
+        return self._afloat_ships
+
+    @property
+    def lost(self) -> bool:
+        """
+        check if all ships of the grid were destroyed
+        """
+        return not self._intact_cells
 
     @property
-    def ships(self) -> list[Ship]:
-        # deepcopy to avoid changing from outside
-        return deepcopy(self._ships)
+    def ships(self) -> 'ShipsView':
+        # the view avoids both copying and changing the list from outside
+        return ShipsView(self._ships)
+
+
+class ShipsView(Sequence):
+    """
+    read-only view of the ships list of the grid
+    """
+
+    __slots__ = ('_ships',)
+
+    def __init__(self, ships: list[Ship]):
+        self._ships = ships
+
+    def __getitem__(self, index):
+        return self._ships[index]
+
+    def __len__(self) -> int:
+        return len(self._ships)
+
+
+class FieldView(Sequence):
+    """
+    read-only projection of the state matrix of the grid, rows of the field are strings
+    """
+
+    __slots__ = ('_cells', '_width', '_table')
+
+    def __init__(self, cells: bytearray, width: int, table: Optional[bytes] = None):
+        """
+        :param cells: the state matrix of the grid
+        :param width: the width of the grid
+        :param table: the translation table from cells to characters of the field
+        """
+        self._cells = cells
+        self._width = width
+        self._table = table
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [self[i] for i in range(*y.indices(len(self)))]
+        if y < 0:
+            y += len(self)
+        if not 0 <= y < len(self):
+            raise IndexError('row index out of range')
+        row = self._cells[y * self._width:(y + 1) * self._width]
+        return row.translate(self._table).decode('ascii')
+
+    def __len__(self) -> int:
+        return len(self._cells) // self._width
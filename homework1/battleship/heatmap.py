@@ -0,0 +1,139 @@
+from typing import Mapping
+
+import numpy as np
+
+from battleship.utils import Coordinate, Size
+
+# the score of cells which were already shot, it is less than any possible density
+SHOT_SCORE = -1
+
+
+def coverage(blocked: np.ndarray, ship_length: int) -> np.ndarray:
+    """
+    counts for every cell the horizontal placements of a ship which cover the cell
+    and do not cover any blocked cell
+    :param blocked: the 2d boolean array of blocked cells
+    :param ship_length: the length of the ship
+    :return: the 2d array of the same shape with counts of placements
+    :rtype: np.ndarray
+    """
+    rows, row_length = blocked.shape
+    if ship_length > row_length:
+        return np.zeros(blocked.shape, dtype=np.int64)
+
+    # prefix sums of blocked cells give the count of blocked cells in every window at once
+    blocked_prefix = np.zeros((rows, row_length + 1), dtype=np.int64)
+    np.cumsum(blocked, axis=1, out=blocked_prefix[:, 1:])
+    free_windows = blocked_prefix[:, ship_length:] == blocked_prefix[:, :-ship_length]
+
+    # `starts[:, i]` is the count of free windows which start before the i-th cell
+    starts = np.zeros((rows, row_length - ship_length + 2), dtype=np.int64)
+    np.cumsum(free_windows, axis=1, out=starts[:, 1:])
+
+    # the cell is covered by windows which start at most `ship_length - 1` cells before it
+    cells = np.arange(row_length)
+    return starts[:, np.minimum(cells + 1, row_length - ship_length + 1)] - starts[:, np.maximum(cells - ship_length + 1, 0)]
+
+
+class Heatmap:
+    """
+    probability density of remaining ships over the opponent grid
+
+    The density of a cell is the count of placements of all remaining ships which cover the cell
+    and do not cover blocked cells(misses and cells of sunk ships).
+    The density is updated incrementally: blocking a cell changes only its row and column,
+    sinking a ship subtracts the placements of one ship.
+    """
+
+    def __init__(self, size: Size, ship_counts: Mapping[int, int]):
+        """
+        :param size: the size of the opponent grid
+        :param ship_counts: the dictionary of such pairs: ships_length: ships_count
+        """
+        self._ship_counts = {length: count for length, count in ship_counts.items() if count}
+        self._blocked = np.zeros(size, dtype=bool)
+        self._shot = np.zeros(size, dtype=bool)
+
+        # nothing is blocked yet, so all rows(and all columns) have the same density
+        row_density = self._line_density(self._blocked[0], vertical=False)
+        column_density = self._line_density(self._blocked[:, 0], vertical=True)
+        self._density = row_density[np.newaxis, :] + column_density[:, np.newaxis]
+
+    @staticmethod
+    def _placements(blocked: np.ndarray, ship_length: int) -> np.ndarray:
+        """
+        :return: the count of placements of one ship in both rotations for every cell
+        :rtype: np.ndarray
+        """
+        placements = coverage(blocked, ship_length)
+        # one-cell ships are the same in both rotations
+        if ship_length > 1:
+            placements += coverage(blocked.T, ship_length).T
+        return placements
+
+    def _line_density(self, line: np.ndarray, vertical: bool) -> np.ndarray:
+        """
+        :param line: blocked cells of one row or column
+        :return: the density of the line for ships placed along it
+        :rtype: np.ndarray
+        """
+        density = np.zeros(line.shape, dtype=np.int64)
+        for length, count in self._ship_counts.items():
+            if vertical and length == 1:
+                continue
+            density += count * coverage(line[np.newaxis], length)[0]
+        return density
+
+    def __getitem__(self, coord: Coordinate) -> int:
+        return int(self._density[coord.y, coord.x])
+
+    def is_shot(self, coord: Coordinate) -> bool:
+        return bool(self._shot[coord.y, coord.x])
+
+    def is_blocked(self, coord: Coordinate) -> bool:
+        return bool(self._blocked[coord.y, coord.x])
+
+    def mark_shot(self, coord: Coordinate):
+        """
+        excludes the cell from the next moves
+        """
+        self._shot[coord.y, coord.x] = True
+        self._density[coord.y, coord.x] = SHOT_SCORE
+
+    def block(self, coord: Coordinate):
+        """
+        marks the cell as one that can not contain any remaining ship
+        """
+        if self._blocked[coord.y, coord.x]:
+            return
+        row = self._blocked[coord.y]
+        column = self._blocked[:, coord.x]
+        row_before = self._line_density(row, vertical=False)
+        column_before = self._line_density(column, vertical=True)
+
+        self._blocked[coord.y, coord.x] = True
+
+        self._density[coord.y] += self._line_density(row, vertical=False) - row_before
+        self._density[:, coord.x] += self._line_density(column, vertical=True) - column_before
+        self._density[coord.y, self._shot[coord.y]] = SHOT_SCORE
+        self._density[self._shot[:, coord.x], coord.x] = SHOT_SCORE
+
+    def remove_ship(self, ship_length: int):
+        """
+        removes one ship from remaining ones, must be called before blocking the cells of the sunk ship
+        """
+        if not self._ship_counts.get(ship_length):
+            return
+        self._density -= self._placements(self._blocked, ship_length)
+        self._ship_counts[ship_length] -= 1
+        if not self._ship_counts[ship_length]:
+            del self._ship_counts[ship_length]
+        self._density[self._shot] = SHOT_SCORE
+
+    def best(self) -> Coordinate:
+        """
+        :return: the cell with the highest density among cells which were not shot
+        :rtype: Coordinate
+        """
+        y, x = np.unravel_index(np.argmax(self._density), self._density.shape)
+        return Coordinate(int(x), int(y))
@@ -0,0 +1,181 @@
+"""
+append-only journal of the game, it is enough to replay the game without players
+
+the layout(all numbers are little-endian):
+    header: magic, version, version of the grids layout, flags, index of the player to move first, seed
+    grids of both players at the start of the game in the layout of the save payload(see `battleship/savefile.py`)
+    shots: x and y of every shot in the order of making, they are appended while the game runs
+"""
+import struct
+from typing import BinaryIO, NamedTuple, Optional, Sequence
+
+from battleship import savefile
+from battleship.exceptions import InvalidJournalException, InvalidSaveException
+from battleship.grid import Grid
+from battleship.player import AbstractPlayer
+from battleship.utils import Coordinate, MoveStatus, ShotStatus
+
+MAGIC = b'BSHJ'
+VERSION = 1
+JOURNAL_EXTENSION = '.bsj'
+
+# the seed of the game is known
+FLAG_SEED = 0x01
+# coordinates of shots do not fit into 16 bits
+FLAG_WIDE = 0x02
+
+HEADER = struct.Struct('<4sBBBBq')
+SHOT = struct.Struct('<HH')
+WIDE_SHOT = struct.Struct('<II')
+
+SEED_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+class JournalWriter:
+    """
+    writes the journal of the game into the binary file while the game runs
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._shot = SHOT
+
+    def start(self, grids: Sequence[Grid], index: int, seed: Optional[int] = None):
+        """
+        writes the header, must be called before the first shot
+        :param grids: grids of players before the first shot
+        :param index: the index of the player to move first
+        :param seed: the seed of the game, it is kept only if it fits into 64 bits
+        """
+        wide = any(max(grid.size) > 0xFFFF for grid in grids)
+        self._shot = WIDE_SHOT if wide else SHOT
+        has_seed = seed is not None and seed in SEED_RANGE
+        flags = (FLAG_SEED if has_seed else 0) | (FLAG_WIDE if wide else 0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, savefile.VERSION, flags, index % 2, seed if has_seed else 0))
+        for grid in grids:
+            savefile.write_grid(self._file, grid)
+
+    def shot(self, coord: Coordinate):
+        self._file.write(self._shot.pack(coord.x, coord.y))
+
+
+class ReplayResult(NamedTuple):
+    """
+    result of the replayed game
+    """
+    winner: Optional[int]  # index of the winner or None if the journal ends before the end of the game
+    shot_counts: tuple[int, int]
+
+
+class Replayer:
+    """
+    re-simulates the journal on grids without players
+    """
+
+    def __init__(self, file: BinaryIO):
+        """
+        reads the whole journal
+        can raise InvalidJournalException
+        """
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size or not header.startswith(MAGIC):
+            raise InvalidJournalException('the file is not a journal')
+        _, version, grids_version, flags, index, seed = HEADER.unpack(header)
+        if version != VERSION or grids_version not in savefile.SUPPORTED_VERSIONS:
+            raise InvalidJournalException(f'unsupported version of the journal: {version}')
+
+        try:
+            self._grids = [savefile.read_grid(file, grids_version) for _ in range(2)]
+        except InvalidSaveException as e:
+            raise InvalidJournalException('grids of the journal are corrupted') from e
+
+        shot = WIDE_SHOT if flags & FLAG_WIDE else SHOT
+        data = file.read()
+        # the game could be interrupted in the middle of writing of the last shot
+        data = data[:len(data) - len(data) % shot.size]
+        self._shots = [Coordinate(x, y) for x, y in shot.iter_unpack(data)]
+
+        self.seed: Optional[int] = seed if flags & FLAG_SEED else None
+        self._player_index = index
+        self._shot_counts = [0, 0]
+        self._winner: Optional[int] = None
+
+    @property
+    def grids(self) -> tuple[Grid, Grid]:
+        return self._grids[0], self._grids[1]
+
+    @property
+    def shots(self) -> list[Coordinate]:
+        return self._shots
+
+    @property
+    def current_player_index(self) -> int:
+        return self._player_index
+
+    @property
+    def winner(self) -> Optional[int]:
+        return self._winner
+
+    def step(self, coord: Coordinate) -> ShotStatus:
+        """
+        makes the shot of the current player like `Game.shoot` does
+        can raise InvalidJournalException
+        :return: the status of the shot
+        :rtype: ShotStatus
+        """
+        if self._winner is not None:
+            raise InvalidJournalException('the journal has shots after the end of the game')
+        opponent_grid = self._grids[1 - self._player_index]
+        status = opponent_grid.shot(coord)
+        self._shot_counts[self._player_index] += 1
+        if opponent_grid.lost:
+            self._winner = self._player_index
+        elif status == ShotStatus.MISS:
+            self._player_index = 1 - self._player_index
+        return status
+
+    def run(self) -> ReplayResult:
+        """
+        replays all remaining shots
+        can raise InvalidJournalException
+        :return: the result of the game
+        :rtype: ReplayResult
+        """
+        for coord in self._shots[sum(self._shot_counts):]:
+            self.step(coord)
+        return ReplayResult(self._winner, (self._shot_counts[0], self._shot_counts[1]))
+
+
+def replay(file: BinaryIO) -> ReplayResult:
+    """
+    replays the journal
+    can raise InvalidJournalException
+    :return: the result of the game
+    :rtype: ReplayResult
+    """
+    return Replayer(file).run()
+
+
+def first_divergence(replayer: Replayer, index: int, player: AbstractPlayer) -> Optional[int]:
+    """
+    replays the journal and asks the player to make moves instead of the player with the given index
+    it helps to check that a computer player still plays the same way
+    can raise InvalidJournalException
+    :param replayer: the replayer of the journal which was not run yet
+    :param index: the index of the player to check
+    :param player: the player to check, its generator must be seeded like in the game(see `player_seed`)
+    :return: the number of the first shot the player made differently or None if all moves are the same
+    :rtype: int
+    """
+    own_grid, opponent_grid = replayer.grids[index], replayer.grids[1 - index]
+    player.new_game(own_grid)
+    for number, coord in enumerate(replayer.shots):
+        if replayer.current_player_index != index:
+            replayer.step(coord)
+            continue
+        move, chosen = player.make_move(opponent_grid.make_field(for_opponent=True),
+                                        own_grid.make_field(for_opponent=False), own_grid)
+        if move != MoveStatus.MOVEMENT or chosen != coord:
+            return number
+        player.shot_result(coord, replayer.step(coord))
+    return None
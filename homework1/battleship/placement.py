@@ -0,0 +1,154 @@
+import random
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Mapping, Optional
+
+from battleship.exceptions import CantPlaceShipException
+from battleship.grid import Grid
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+
+FREE_CELL = 0
+OCCUPIED_CELL = 1
+
+
+class ShipPlacer:
+    """
+    places ships to the grid uniformly at random among all free positions
+
+    The free-cell index is the occupancy of every row and every column of the grid,
+    each line is terminated by an occupied sentinel cell, so a run of free cells never crosses
+    the border of the grid. The valid heads of a ship of length `l` are the starts of all
+    windows of `l` free cells in the lines of its rotation.
+    """
+
+    # count of random draws before the whole index is scanned for valid heads
+    MAX_ATTEMPTS = 32
+
+    def __init__(self, grid: Grid, seed: Optional[int] = None):
+        """
+        :param grid: the grid to place ships to
+        :param seed: the seed of random generator to get deterministic placement
+        """
+        self._grid = grid
+        self._random = random.Random(seed)
+
+        width, height = grid.size.width, grid.size.height
+        # line number and line length for every rotation
+        self._shapes = {
+            Rotation.HORIZONTAL: (height, width),
+            Rotation.VERTICAL: (width, height),
+        }
+        self._lines = {
+            rotation: bytearray((bytes(length) + bytes((OCCUPIED_CELL,))) * count)
+            for rotation, (count, length) in self._shapes.items()
+        }
+
+        for ship in grid.ships:
+            self._mark(ship)
+
+    def place_fleet(self, ship_counts: Mapping[int, int]) -> list[Ship]:
+        """
+        places all ships from the biggest to the smallest
+        :param ship_counts: the dictionary of such pairs: ships_length: ships_count
+        :return: placed ships
+        :rtype: list
+        """
+        return [
+            self.place(ship_length)
+            for ship_length in sorted(ship_counts, reverse=True)
+            for _ in range(ship_counts[ship_length])
+        ]
+
+    def place(self, ship_length: int) -> Ship:
+        """
+        places one ship of the given length
+        can raise CantPlaceShipException if there is no room for the ship
+        :return: the placed ship
+        :rtype: Ship
+        """
+        position = self._draw(ship_length) or self._scan(ship_length)
+        if position is None:
+            raise CantPlaceShipException(f'there is no room for a ship of length {ship_length}')
+
+        rotation, line, offset = position
+        if rotation is Rotation.HORIZONTAL:
+            head = Coordinate(offset, line)
+        else:
+            head = Coordinate(line, offset)
+
+        ship = Ship(ship_length, head, rotation)
+        self._grid.place_ship(ship)
+        self._mark(ship)
+        return ship
+
+    def _is_free(self, rotation: Rotation, line: int, offset: int, ship_length: int) -> bool:
+        start = line * (self._shapes[rotation][1] + 1) + offset
+        return self._lines[rotation].find(OCCUPIED_CELL, start, start + ship_length) == -1
+
+    def _draw(self, ship_length: int) -> Optional[tuple[Rotation, int, int]]:
+        """
+        rejection sampling over all positions where the ship does not cross the border
+        :return: the tuple of rotation, line and offset in the line or None if all attempts failed
+        """
+        fits = {
+            rotation: (count, max(length - ship_length + 1, 0))
+            for rotation, (count, length) in self._shapes.items()
+        }
+        horizontal = fits[Rotation.HORIZONTAL][0] * fits[Rotation.HORIZONTAL][1]
+        total = horizontal + fits[Rotation.VERTICAL][0] * fits[Rotation.VERTICAL][1]
+        if not total:
+            return None
+
+        for _ in range(self.MAX_ATTEMPTS):
+            number = self._random.randrange(total)
+            rotation = Rotation.HORIZONTAL
+            if number >= horizontal:
+                number -= horizontal
+                rotation = Rotation.VERTICAL
+            line, offset = divmod(number, fits[rotation][1])
+            if self._is_free(rotation, line, offset, ship_length):
+                return rotation, line, offset
+        return None
+
+    def _scan(self, ship_length: int) -> Optional[tuple[Rotation, int, int]]:
+        """
+        collects all runs of free cells long enough for the ship and picks a head uniformly
+        :return: the tuple of rotation, line and offset in the line or None if there is no room
+        """
+        pattern = re.compile(b'%c{%d,}' % (FREE_CELL, ship_length))
+
+        runs: list[tuple[Rotation, int]] = []
+        weights: list[int] = []
+        for rotation, lines in self._lines.items():
+            for match in pattern.finditer(lines):
+                runs.append((rotation, match.start()))
+                weights.append(match.end() - match.start() - ship_length + 1)
+        if not runs:
+            return None
+
+        cumulative = list(accumulate(weights))
+        number = self._random.randrange(cumulative[-1])
+        run_index = bisect_right(cumulative, number)
+        rotation, start = runs[run_index]
+        start += number - (cumulative[run_index] - weights[run_index])
+
+        line, offset = divmod(start, self._shapes[rotation][1] + 1)
+        return rotation, line, offset
+
+    def _mark(self, ship: Ship):
+        """
+        marks cells of the ship as occupied in the lines of both rotations
+        """
+        head = ship.head_coord
+        positions = {
+            Rotation.HORIZONTAL: (head.y, head.x),
+            Rotation.VERTICAL: (head.x, head.y),
+        }
+        for rotation, (line, offset) in positions.items():
+            line_step = self._shapes[rotation][1] + 1
+            start = line * line_step + offset
+            # along the ship lines cells are adjacent, across the ship they are in the same place of next lines
+            step = 1 if rotation is ship.rotation else line_step
+            self._lines[rotation][start:start + step * ship.size:step] = bytes((OCCUPIED_CELL,)) * ship.size
@@ -1,15 +1,23 @@
 import curses
 import random
 from abc import ABC, abstractmethod
-from collections import OrderedDict
-from copy import deepcopy
 from typing import Optional
 
-# this manner was used due to cycle import problem
-import battleship.game
-from battleship.grid import Grid
-from battleship.ships import Ship
-from battleship.utils import Rotation, Coordinate, MoveStatus
+from battleship.grid import FieldView, Grid
+from battleship.heatmap import Heatmap
+from battleship.placement import ShipPlacer
+from battleship.renderer import FieldRenderer, Viewport
+from battleship.utils import Coordinate, MoveStatus, ShotStatus
+
+
+def player_seed(seed: Optional[int], index: int) -> Optional[str]:
+    """
+    :param seed: the seed of the game
+    :param index: the index of the player in the game
+    :return: the seed of the generator of the player, players of one game get different seeds
+    :rtype: str
+    """
+    return None if seed is None else f'{seed}:{index}'
 
 
 class AbstractPlayer(ABC):
@@ -17,19 +25,24 @@ class AbstractPlayer(ABC):
     An abstract class for all players
     """
 
-    def __init__(self):
+    def __init__(self, seed: Optional[str] = None):
+        """
+        :param seed: the seed of the own random generator of the player(see `player_seed`),
+        the replay of the game with the same seed gets the same moves of the player
+        """
         self._name = None
+        self._random = random.Random(seed)
 
     @abstractmethod
     def make_move(self,
-                  field_op: list[list[str]], field_not_op: list[list[str]],
+                  field_op: FieldView, field_not_op: FieldView,
                   grid: Grid) -> tuple[MoveStatus, Optional[Coordinate]]:
         """
         makes all interaction operations with user and ask him/her to choose the move
         :param field_op: the field of opponent
-        :type field_op: list
+        :type field_op: FieldView
         :param field_not_op: the field of current player
-        :type field_not_op: list
+        :type field_not_op: FieldView
         :param grid: the grid of current player
         :type grid: Grid
         :return: the tuple of MoveStatus and, in case of MoveStatus.MOVEMENT, the Coordinate where to move
@@ -37,6 +50,22 @@ class AbstractPlayer(ABC):
         """
         return NotImplemented
 
+    def new_game(self, grid: Grid):
+        """
+        called by the game before the first move of every game
+        :param grid: the grid of current player
+        :type grid: Grid
+        """
+
+    def shot_result(self, coord: Coordinate, status: ShotStatus):
+        """
+        called by the game after every shot of this player
+        :param coord: the coordinate of the shot
+        :type coord: Coordinate
+        :param status: the status of the shot
+        :type status: ShotStatus
+        """
+
     @property
     def name(self):
         return str(self._name)
@@ -45,42 +74,16 @@ class AbstractPlayer(ABC):
     def name(self, value):
         self._name = value
 
-    # I hope this would work
     @staticmethod
-    def place_ships(grid: Grid):
+    def place_ships(grid: Grid, seed: Optional[int] = None):
         """
         randomly places all ships to the grid
         :param grid: player grid
         :type grid: Grid
+        :param seed: the seed to get the same placement every time
+        :type seed: int
         """
-        # from the biggest ship to the smallest ship
-        for ship_length, ship_count in reversed(OrderedDict(grid.ship_counts).items()):
-            # add ship by its count
-            for i in range(ship_count):
-                # while not success
-                while True:
-                    # change some parameters randomly
-                    rotation = random.choice([Rotation.HORIZONTAL, Rotation.VERTICAL])
-                    max_x = grid.size.width - 1
-                    max_y = grid.size.height - 1
-                    # consider the chosen rotation and ship length
-                    if rotation is Rotation.HORIZONTAL:
-                        max_x -= ship_length
-                    elif rotation is Rotation.VERTICAL:
-                        max_y -= ship_length
-                    else:
-                        raise RuntimeError(f"unknown rotation")
-
-                    # randomize coordinates
-                    x = random.randrange(max_x)
-                    y = random.randrange(max_y)
-
-                    ship = Ship(ship_length, Coordinate(x, y), rotation)
-
-                    # check whether it worked
-                    if grid.place_ship(ship):
-                        # if yope just go to the next ship
-                        break
+        ShipPlacer(grid, seed).place_fleet(grid.ship_counts)
 
 
 class ConsolePlayer(AbstractPlayer):
@@ -92,32 +95,22 @@ class ConsolePlayer(AbstractPlayer):
         super().__init__()
         self.name = name
         self._screen = screen
+        self._renderer = FieldRenderer(screen)
+        self._viewport = Viewport()
 
     def make_move(self,
-                  field_op: list[list[str]], field_not_op: list[list[str]],
+                  field_op: FieldView, field_not_op: FieldView,
                   grid: Grid) -> tuple[MoveStatus, Optional[Coordinate]]:
         # command char
         ch = None
 
         # coordinates to move
         x, y = 0, 0
+        # the game could draw something else since the previous move
+        self._renderer.invalidate()
         # while not pressed enter or 'q'
         while ch != ord('\n') and ch != ord('q'):
-            # deepcopy to prevent the overriding of original player field
-            field = deepcopy(field_op)
-            field[y][x] = Grid.HERE_CHARACTER
-
-            res_text = f'This move of player {self.name}\n'
-            res_text += Grid.concat_field(field_not_op) + '\n\n'
-            res_text += Grid.concat_field(field) + '\n'
-
-            res_text += self._help_message()
-
-            # check the size of the terminal and place text on it
-            battleship.game.Game.change_terminal_size_message(self._screen, res_text)
-            self._screen.clear()
-            self._screen.addstr(0, 0, res_text)
-            self._screen.refresh()
+            self._renderer.draw(self._make_frame(field_op, field_not_op, Coordinate(x, y)))
 
             # get the command from user
             ch = self._screen.getch()
@@ -129,6 +122,8 @@ class ConsolePlayer(AbstractPlayer):
                 y = min(y + 1, grid.size.height - 1)
             elif ch == curses.KEY_RIGHT:
                 x = min(x + 1, grid.size.width - 1)
+            elif ch == curses.KEY_RESIZE:
+                self._renderer.invalidate()
             # if pressed Enter on hit cell just skip
             elif ch == ord('\n') and field_op[y][x] != Grid.EMPTY_CELL_CHARACTER:
                 ch = None
@@ -139,6 +134,38 @@ class ConsolePlayer(AbstractPlayer):
             return MoveStatus.EXIT_GAME, None
         return MoveStatus.MOVEMENT, Coordinate(x, y)
 
+    def _make_frame(self, field_op: FieldView, field_not_op: FieldView, cursor: Coordinate) -> list[str]:
+        """
+        makes the frame with both fields cropped to the size of the terminal
+        :return: lines of the frame
+        :rtype: list
+        """
+        screen_height, screen_width = self._screen.getmaxyx()
+        # the last column is not used, curses can't write to the bottom right corner
+        line_width = screen_width - 1
+        help_lines = self._help_message().splitlines()
+
+        # the title and the empty line between fields take two lines
+        field_height = (screen_height - len(help_lines) - 2) // 2
+        if field_height < 1 or line_width < 1:
+            return ['Please make your terminal screen larger.'[:max(line_width, 0)]]
+
+        self._viewport.resize(min(field_height, len(field_op)), min(line_width, len(field_op[0])))
+        self._viewport.follow(cursor)
+
+        title = f'This move of player {self.name}'
+        if self._viewport.height < len(field_op) or self._viewport.width < len(field_op[0]):
+            # the visible part of the field
+            title += f' (y {self._viewport.top}-{self._viewport.top + self._viewport.height - 1},' \
+                     f' x {self._viewport.left}-{self._viewport.left + self._viewport.width - 1})'
+
+        frame = [title]
+        frame += self._viewport.crop(field_not_op)
+        frame += ['']
+        frame += self._viewport.crop(field_op, cursor, Grid.HERE_CHARACTER)
+        frame += help_lines
+        return [line[:line_width] for line in frame]
+
     @staticmethod
     def _help_message() -> str:
         """
@@ -153,12 +180,12 @@ class RandomPlayer(AbstractPlayer):
     random player
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, seed: Optional[str] = None):
+        super().__init__(seed)
         # name may be better but no
         self.name = "randomer"
 
-    def make_move(self, field_op: list[list[str]], field_not_op: list[list[str]], grid: Grid) \
+    def make_move(self, field_op: FieldView, field_not_op: FieldView, grid: Grid) \
             -> tuple[MoveStatus, Optional[Coordinate]]:
         # fill out all available coordinates into this set
         coords_set: list[Coordinate] = []
@@ -168,4 +195,88 @@ class RandomPlayer(AbstractPlayer):
                 if col == Grid.EMPTY_CELL_CHARACTER:
                     coords_set.append(Coordinate(num_col, num_row))
         # choice random movement
-        return MoveStatus.MOVEMENT, random.choice(coords_set)
+        return MoveStatus.MOVEMENT, self._random.choice(coords_set)
+
+
+class DensityPlayer(AbstractPlayer):
+    """
+    the player who shoots the cell which is covered by the most placements of remaining ships
+    and finishes off damaged ships by shooting their neighbour cells
+    """
+
+    def __init__(self, seed: Optional[str] = None):
+        super().__init__(seed)
+        self.name = "hunter"
+        self._heatmap: Optional[Heatmap] = None
+        self._size = None
+        # damaged cells of ships which were not sunk yet
+        self._open_hits: set[Coordinate] = set()
+        # the shot which sunk a ship, its cells are found on the next move
+        self._sunk_at: Optional[Coordinate] = None
+
+    def new_game(self, grid: Grid):
+        # grids of both players have the same size and ships
+        self._size = grid.size
+        self._heatmap = Heatmap(grid.size, grid.ship_counts)
+        self._open_hits = set()
+        self._sunk_at = None
+
+    def shot_result(self, coord: Coordinate, status: ShotStatus):
+        self._heatmap.mark_shot(coord)
+        if status == ShotStatus.MISS:
+            self._heatmap.block(coord)
+            return
+        self._open_hits.add(coord)
+        if status == ShotStatus.SINK:
+            self._sunk_at = coord
+
+    def make_move(self, field_op: FieldView, field_not_op: FieldView, grid: Grid) \
+            -> tuple[MoveStatus, Optional[Coordinate]]:
+        if self._heatmap is None:
+            self.new_game(grid)
+        if self._sunk_at is not None:
+            self._remove_sunk_ship(field_op, self._sunk_at)
+            self._sunk_at = None
+
+        targets = self._targets()
+        if targets:
+            return MoveStatus.MOVEMENT, max(targets, key=lambda target: (targets[target], self._heatmap[target]))
+        return MoveStatus.MOVEMENT, self._heatmap.best()
+
+    def _in_bounds(self, coord: Coordinate) -> bool:
+        return 0 <= coord.x < self._size.width and 0 <= coord.y < self._size.height
+
+    def _remove_sunk_ship(self, field_op: FieldView, coord: Coordinate):
+        """
+        finds the cells of the sunk ship among damaged cells in line with the given one
+        and removes the ship from the heatmap
+        """
+        def is_sunk_cell(cell: Coordinate) -> bool:
+            return cell in self._open_hits and field_op[cell.y][cell.x] == Grid.DESTROYED_SHIP_CHARACTER
+
+        cells = [coord]
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            cell = Coordinate(coord.x + dx, coord.y + dy)
+            while self._in_bounds(cell) and is_sunk_cell(cell):
+                cells.append(cell)
+                cell = Coordinate(cell.x + dx, cell.y + dy)
+
+        self._heatmap.remove_ship(len(cells))
+        for cell in cells:
+            self._open_hits.discard(cell)
+            self._heatmap.block(cell)
+
+    def _targets(self) -> dict[Coordinate, int]:
+        """
+        :return: the cells near damaged ships with their priority,
+        cells which continue a line of damaged cells have the higher priority
+        """
+        targets: dict[Coordinate, int] = {}
+        for hit in self._open_hits:
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                cell = Coordinate(hit.x + dx, hit.y + dy)
+                if not self._in_bounds(cell) or self._heatmap.is_shot(cell) or self._heatmap.is_blocked(cell):
+                    continue
+                in_line = Coordinate(hit.x - dx, hit.y - dy) in self._open_hits
+                targets[cell] = max(targets.get(cell, 0), 2 if in_line else 1)
+        return targets
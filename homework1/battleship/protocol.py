@@ -0,0 +1,55 @@
+"""
+the protocol of network games: JSON messages, one per line
+
+client -> server:
+    {"type": "join", "name": str}
+    {"type": "shot", "x": int, "y": int}
+server -> client:
+    {"type": "start", "width": int, "height": int, "opponent": str,
+     "fleet": [[length, count], ...], "ships": [[x, y, length, rotation], ...]}
+    {"type": "turn"}
+    {"type": "result", "x": int, "y": int, "status": "MISS" | "HIT" | "SINK", "ship": [x, y, length, rotation]}
+    {"type": "opponent_shot", ...the same fields as in "result"}
+    {"type": "error", "message": str}
+    {"type": "end", "winner": bool}
+"ship" is sent only with "SINK"
+"""
+import asyncio
+import json
+from typing import Optional
+
+from battleship.exceptions import ProtocolException
+from battleship.ships import Ship
+
+# the longest message, the start message of a big grid lists all ships of the player
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+async def receive(reader: asyncio.StreamReader) -> Optional[dict]:
+    """
+    can raise ProtocolException
+    :return: the next message or None if the connection was closed
+    :rtype: dict
+    """
+    try:
+        line = await reader.readline()
+    except ValueError as e:
+        # the line is longer than the limit of the reader
+        raise ProtocolException('the message is too long') from e
+    if not line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise ProtocolException('the message is not a valid JSON') from e
+    if not isinstance(message, dict):
+        raise ProtocolException('the message must be an object')
+    return message
+
+
+def pack_ship(ship: Ship) -> list[int]:
+    return [ship.head_coord.x, ship.head_coord.y, ship.size, int(ship.rotation)]
@@ -0,0 +1,100 @@
+from collections.abc import Sequence
+
+from battleship.utils import Coordinate
+
+
+class Viewport:
+    """
+    the visible rectangle of the field which follows the cursor
+    lets to play on fields which are larger than the terminal
+    """
+
+    def __init__(self):
+        self.top = 0
+        self.left = 0
+        self.height = 0
+        self.width = 0
+
+    def resize(self, height: int, width: int):
+        """
+        changes the size of the viewport, the position is corrected by the next `follow` call
+        """
+        self.height = height
+        self.width = width
+
+    def follow(self, coord: Coordinate):
+        """
+        scrolls the viewport as little as possible to make the given cell visible
+        """
+        self.top = min(max(self.top, coord.y - self.height + 1), coord.y)
+        self.left = min(max(self.left, coord.x - self.width + 1), coord.x)
+
+    def crop(self, field: Sequence[Sequence[str]], cursor: Coordinate = None, cursor_char: str = '') -> list[str]:
+        """
+        :param field: the field returned by `Grid.make_field`
+        :param cursor: the cell to replace with `cursor_char`
+        :return: visible lines of the field
+        :rtype: list
+        """
+        lines = []
+        for y in range(self.top, min(self.top + self.height, len(field))):
+            line = ''.join(field[y][self.left:self.left + self.width])
+            if cursor is not None and cursor.y == y:
+                x = cursor.x - self.left
+                line = line[:x] + cursor_char + line[x + 1:]
+            lines.append(line)
+        return lines
+
+
+class FieldRenderer:
+    """
+    draws frames of text on the curses screen
+    caches the last drawn frame and repaints only the cells which were changed since then
+    """
+
+    def __init__(self, screen):
+        self._screen = screen
+        self._frame: list[str] = []
+
+    def invalidate(self):
+        """
+        forgets the last drawn frame, must be called when something else was drawn on the screen
+        """
+        self._screen.erase()
+        self._frame = []
+
+    def draw(self, frame: list[str]):
+        """
+        :param frame: lines of text, they must fit into the screen
+        :type frame: list
+        """
+        for y, line in enumerate(frame):
+            old_line = self._frame[y] if y < len(self._frame) else ''
+            if line != old_line:
+                self._draw_line(y, line, old_line)
+        # erase lines which are not the part of the frame anymore
+        for y in range(len(frame), len(self._frame)):
+            self._screen.move(y, 0)
+            self._screen.clrtoeol()
+
+        self._frame = frame
+        self._screen.refresh()
+
+    def _draw_line(self, y: int, line: str, old_line: str):
+        """
+        writes only runs of changed cells of the line
+        """
+        x = 0
+        while x < len(line):
+            if x < len(old_line) and line[x] == old_line[x]:
+                x += 1
+                continue
+            end = x + 1
+            while end < len(line) and (end >= len(old_line) or line[end] != old_line[end]):
+                end += 1
+            self._screen.addstr(y, x, line[x:end])
+            x = end
+
+        if len(old_line) > len(line):
+            self._screen.move(y, len(line))
+            self._screen.clrtoeol()
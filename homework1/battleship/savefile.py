@@ -0,0 +1,247 @@
+"""
+compact binary snapshot of the game
+
+the layout(all numbers are little-endian):
+    header: magic, version, flags, index of the player to move
+    payload(compressed with zlib if the flag is set), for every grid:
+        width, height, count of ships
+        fleet table: count of ship lengths, then the length and the count of ships of every length
+        ships table: x, y, length and rotation of every ship
+        hits bitmap: one bit per ship cell in the order of the ships table, from the head to the tail
+
+saves of the version 1 have no fleet table, their grids get the default fleet
+"""
+import pickle
+import struct
+import zlib
+from typing import BinaryIO
+
+from battleship.exceptions import CantPlaceShipException, InvalidSaveException
+from battleship.grid import Grid
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+
+MAGIC = b'BSHP'
+VERSION = 2
+# versions which can be loaded
+SUPPORTED_VERSIONS = frozenset((1, 2))
+
+# the payload is compressed with zlib
+FLAG_COMPRESSED = 0x01
+
+HEADER = struct.Struct('<4sBBB')
+GRID_HEADER = struct.Struct('<III')
+FLEET_HEADER = struct.Struct('<I')
+FLEET_ENTRY = struct.Struct('<II')
+SHIP = struct.Struct('<IIIB')
+
+# size of blocks to read and to compress
+BLOCK_SIZE = 64 * 1024
+# ships are read by batches of such size
+SHIPS_BATCH = 4096
+
+
+def _pack_bits(digits: str) -> bytes:
+    """
+    :param digits: the string of zeros and ones
+    :return: bits packed into bytes, the first bit is the highest bit of the first byte
+    """
+    if not digits:
+        return b''
+    padded = digits + '0' * (-len(digits) % 8)
+    return int(padded, 2).to_bytes(len(padded) // 8, 'big')
+
+
+def _unpack_bits(packed: bytes, count: int) -> str:
+    """
+    :return: first `count` bits of `packed` as the string of zeros and ones
+    """
+    if not count:
+        return ''
+    digits = bin(int.from_bytes(packed, 'big'))[2:].zfill(len(packed) * 8)
+    return digits[:count]
+
+
+class _CompressedWriter:
+    """
+    compresses everything written into it into the underlying file
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._compressor = zlib.compressobj(9)
+
+    def write(self, data: bytes):
+        self._file.write(self._compressor.compress(data))
+
+    def close(self):
+        self._file.write(self._compressor.flush())
+
+
+class _DecompressedReader:
+    """
+    reads the compressed data from the underlying file block by block
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._decompressor = zlib.decompressobj()
+        self._buffer = bytearray()
+
+    def read(self, size: int) -> bytes:
+        while len(self._buffer) < size and not self._decompressor.eof:
+            block = self._file.read(BLOCK_SIZE)
+            if not block:
+                break
+            self._buffer += self._decompressor.decompress(block)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise InvalidSaveException('the save is truncated')
+    return data
+
+
+def dump(file: BinaryIO, grids: list[Grid], index: int, compress: bool = True):
+    """
+    writes the snapshot of the game into the binary file
+    :param grids: grids of players
+    :param index: the index of the player to move
+    :param compress: whether to compress the payload
+    """
+    file.write(HEADER.pack(MAGIC, VERSION, FLAG_COMPRESSED if compress else 0, index % 2))
+    stream = _CompressedWriter(file) if compress else file
+
+    for grid in grids:
+        write_grid(stream, grid)
+
+    if compress:
+        stream.close()
+
+
+def write_grid(stream, grid: Grid):
+    """
+    writes the grid in the layout of the payload of the current version
+    """
+    stream.write(GRID_HEADER.pack(grid.size.width, grid.size.height, len(grid.ships)))
+    stream.write(FLEET_HEADER.pack(len(grid.ship_counts)))
+    stream.write(b''.join(FLEET_ENTRY.pack(length, count) for length, count in grid.ship_counts.items()))
+    hits: list[str] = []
+    for start in range(0, len(grid.ships), SHIPS_BATCH):
+        batch = grid.ships[start:start + SHIPS_BATCH]
+        stream.write(b''.join(
+            SHIP.pack(ship.head_coord.x, ship.head_coord.y, ship.size, ship.rotation) for ship in batch
+        ))
+        # the lowest bit of the mask is the head, it goes first
+        hits.extend(format(ship.hit_mask, f'0{ship.size}b')[::-1] for ship in batch)
+    stream.write(_pack_bits(''.join(hits)))
+
+
+def _read_fleet(stream) -> dict[int, int]:
+    lengths_count, = FLEET_HEADER.unpack(_read_exactly(stream, FLEET_HEADER.size))
+    return dict(FLEET_ENTRY.iter_unpack(_read_exactly(stream, FLEET_ENTRY.size * lengths_count)))
+
+
+def read_grid(stream, version: int = VERSION) -> Grid:
+    """
+    reads the grid written by `write_grid`
+    can raise InvalidSaveException
+    :param version: the version of the layout
+    :return: the grid
+    :rtype: Grid
+    """
+    width, height, ships_count = GRID_HEADER.unpack(_read_exactly(stream, GRID_HEADER.size))
+    fleet = _read_fleet(stream) if version >= 2 else None
+    try:
+        grid = Grid(width, height, fleet)
+    except ValueError as e:
+        raise InvalidSaveException('the fleet of the save does not fit into the grid') from e
+
+    records: list[tuple[int, int, int, int]] = []
+    while len(records) < ships_count:
+        batch = min(SHIPS_BATCH, ships_count - len(records))
+        records.extend(SHIP.iter_unpack(_read_exactly(stream, SHIP.size * batch)))
+
+    cells_count = sum(length for _, _, length, _ in records)
+    hits = _unpack_bits(_read_exactly(stream, (cells_count + 7) // 8), cells_count)
+
+    position = 0
+    for x, y, length, rotation in records:
+        # the head goes first in the bitmap and it is the lowest bit of the mask
+        hit_mask = int(hits[position:position + length][::-1], 2)
+        position += length
+        try:
+            ship = Ship(length, Coordinate(x, y), Rotation(rotation), hit_mask)
+        except ValueError as e:
+            raise InvalidSaveException('unknown rotation of the ship') from e
+        try:
+            grid.place_ship(ship)
+        except CantPlaceShipException as e:
+            raise InvalidSaveException('ships of the save overlap or are out of the grid') from e
+    return grid
+
+
+def load(file: BinaryIO, grids_count: int = 2) -> tuple[list[Grid], int]:
+    """
+    reads the snapshot written by `dump` or the old pickle save
+    can raise InvalidSaveException
+    :param grids_count: count of grids in the save
+    :return: grids of players and the index of the player to move
+    :rtype: tuple
+    """
+    header = file.read(HEADER.size)
+    if not header.startswith(MAGIC):
+        # saves made before the binary format are pickled lists of grids and the index
+        file.seek(0)
+        return _load_pickle(file)
+    if len(header) != HEADER.size:
+        raise InvalidSaveException('the save is truncated')
+
+    _, version, flags, index = HEADER.unpack(header)
+    if version not in SUPPORTED_VERSIONS:
+        raise InvalidSaveException(f'unsupported version of the save: {version}')
+
+    stream = _DecompressedReader(file) if flags & FLAG_COMPRESSED else file
+    try:
+        grids = [read_grid(stream, version) for _ in range(grids_count)]
+    except zlib.error as e:
+        raise InvalidSaveException('the save is corrupted') from e
+    return grids, index
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """
+    unpickler which creates only objects of the game and builtin containers
+    """
+
+    # exact globals of old saves, dotted names are never allowed,
+    # because the protocol 4 resolves them through attributes of the module
+    ALLOWED_GLOBALS = frozenset((
+        ('battleship.grid', 'Grid'),
+        ('battleship.ships', 'Ship'),
+        ('battleship.utils', 'Coordinate'),
+        ('battleship.utils', 'Size'),
+        ('battleship.utils', 'Rotation'),
+        ('builtins', 'set'),
+        ('builtins', 'frozenset'),
+        ('builtins', 'list'),
+        ('builtins', 'dict'),
+        ('builtins', 'tuple'),
+    ))
+
+    def find_class(self, module: str, name: str):
+        if '.' not in name and (module, name) in self.ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f'{module}.{name} is not allowed in the save')
+
+
+def _load_pickle(file: BinaryIO) -> tuple[list[Grid], int]:
+    try:
+        grid1, grid2, index = _LegacyUnpickler(file).load()
+    except (pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError) as e:
+        raise InvalidSaveException('the save is corrupted') from e
+    return [grid1, grid2], index
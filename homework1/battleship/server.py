@@ -0,0 +1,208 @@
+import asyncio
+import random
+from collections import deque
+from typing import Mapping, Optional
+
+from battleship import protocol
+from battleship.exceptions import ProtocolException
+from battleship.fleet import check_fleet, compose_fleet
+from battleship.game import Game
+from battleship.grid import FieldView, Grid
+from battleship.player import AbstractPlayer
+from battleship.utils import Coordinate, MoveStatus, ShotStatus
+
+
+class RemotePlayer(AbstractPlayer):
+    """
+    the player connected to the server
+    its moves are received from the network by the server and delivered to the player by `deliver_move`
+    """
+
+    def __init__(self, name: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        super().__init__()
+        self.name = name
+        self._reader = reader
+        self._writer = writer
+        # shots received from the network which were not made yet
+        self._moves: deque[Coordinate] = deque()
+        # resolved when the game of the player is over
+        self.finished: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def make_move(self, field_op: FieldView, field_not_op: FieldView, grid: Grid) \
+            -> tuple[MoveStatus, Optional[Coordinate]]:
+        # the player without received moves has left the game
+        if not self._moves:
+            return MoveStatus.EXIT_GAME, None
+        return MoveStatus.MOVEMENT, self._moves.popleft()
+
+    def deliver_move(self, coord: Coordinate):
+        """
+        keeps the shot received from the network until the game asks the player to move
+        """
+        self._moves.append(coord)
+
+    @property
+    def connected(self) -> bool:
+        """
+        check if the connection of the player is still open, e.g. while the player waits in the lobby
+        """
+        return not self._writer.is_closing() and not self._reader.at_eof()
+
+    def send(self, message: dict):
+        if not self._writer.is_closing():
+            self._writer.write(protocol.encode(message))
+
+    async def drain(self):
+        await self._writer.drain()
+
+    async def receive(self) -> dict:
+        """
+        can raise ConnectionError and ProtocolException
+        :return: the next message of the player
+        :rtype: dict
+        """
+        message = await protocol.receive(self._reader)
+        if message is None:
+            raise ConnectionError(f'{self.name} has left the game')
+        return message
+
+
+class GameServer:
+    """
+    hosts many concurrent games between remote players
+    connected players wait in the lobby and are matched in the order of joining
+    """
+
+    def __init__(self, n: int, k: int, move_timeout: float = 60., fleet: Optional[Mapping[int, int]] = None):
+        """
+        :param n: the height of playing field
+        :param k: the width of playing field
+        :param move_timeout: seconds to wait for a move, the player who did not move loses
+        :param fleet: the dictionary of such pairs: ships_length: ships_count, the default fleet if None
+        """
+        self._kn = k, n
+        # all games of the server share the fleet, so it is composed and checked once
+        self._fleet = compose_fleet(k, n) if fleet is None else check_fleet(fleet, k, n)
+        self._move_timeout = move_timeout
+        self._lobby: asyncio.Queue[RemotePlayer] = asyncio.Queue()
+        # running games, references keep tasks from the garbage collector
+        self._games: set[asyncio.Task] = set()
+        self.games_played = 0
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """
+        starts accepting players and matching them
+        :return: the started server, its sockets tell the real port if port 0 was given
+        :rtype: asyncio.AbstractServer
+        """
+        server = await asyncio.start_server(self._handle, host, port, limit=protocol.MAX_MESSAGE_SIZE)
+        matchmaker = asyncio.create_task(self._matchmaker())
+        self._games.add(matchmaker)
+        return server
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        joins the connected player into the lobby and keeps the connection until the game ends
+        """
+        try:
+            message = await protocol.receive(reader)
+            if message is None:
+                return
+            if message.get('type') != 'join':
+                writer.write(protocol.encode({'type': 'error', 'message': 'the first message must be "join"'}))
+                return
+            player = RemotePlayer(str(message.get('name', 'Player'))[:15], reader, writer)
+            await self._lobby.put(player)
+            await player.finished
+        except ProtocolException as e:
+            writer.write(protocol.encode({'type': 'error', 'message': str(e)}))
+        finally:
+            writer.close()
+
+    async def _next_player(self) -> RemotePlayer:
+        """
+        :return: the next player of the lobby who is still connected, players who left are dropped
+        :rtype: RemotePlayer
+        """
+        while True:
+            player = await self._lobby.get()
+            if player.connected:
+                return player
+            player.finished.set_result(None)
+
+    async def _matchmaker(self):
+        while True:
+            first = await self._next_player()
+            second = await self._next_player()
+            # the first player could leave while the second one was awaited
+            while not first.connected:
+                first.finished.set_result(None)
+                first, second = second, await self._next_player()
+            game = asyncio.create_task(self._play(first, second))
+            self._games.add(game)
+            game.add_done_callback(self._games.discard)
+
+    async def _play(self, first: RemotePlayer, second: RemotePlayer):
+        game = Game(None, self._kn[1], self._kn[0], fleet=self._fleet)
+        game.player1 = first
+        game.player2 = second
+        game.start(random.randrange(2))
+
+        players = [first, second]
+        for player, grid, opponent in zip(players, game.grids, reversed(players)):
+            player.send({
+                'type': 'start',
+                'width': grid.size.width,
+                'height': grid.size.height,
+                'opponent': opponent.name,
+                'fleet': list(self._fleet.items()),
+                'ships': [protocol.pack_ship(ship) for ship in grid.ships],
+            })
+
+        # the player who left or sent an invalid move loses
+        loser: Optional[RemotePlayer] = None
+        try:
+            while game.winner is None:
+                index = game.current_player_index
+                player, opponent = players[index], players[1 - index]
+                player.send({'type': 'turn'})
+                await player.drain()
+
+                message = await asyncio.wait_for(player.receive(), self._move_timeout)
+                coord = self._parse_shot(message, game.grids[1 - index])
+                if coord is None:
+                    player.send({'type': 'error', 'message': 'expected a shot inside of the grid'})
+                    continue
+
+                player.deliver_move(coord)
+                move, coord = player.make_move(game.grids[1 - index].make_field(for_opponent=True),
+                                               game.grids[index].make_field(for_opponent=False), game.grids[index])
+                if move != MoveStatus.MOVEMENT:
+                    raise ConnectionError(f'{player.name} has left the game')
+                status = game.shoot(coord)
+                result = {'x': coord.x, 'y': coord.y, 'status': status.name}
+                if status == ShotStatus.SINK:
+                    result['ship'] = protocol.pack_ship(game.grids[1 - index].ship_at(coord))
+                player.send({'type': 'result', **result})
+                opponent.send({'type': 'opponent_shot', **result})
+            self.games_played += 1
+        except (ConnectionError, ProtocolException, asyncio.TimeoutError):
+            loser = players[game.current_player_index]
+        finally:
+            for player in players:
+                won = player is game.winner if loser is None else player is not loser
+                player.send({'type': 'end', 'winner': won})
+                player.finished.set_result(None)
+
+    @staticmethod
+    def _parse_shot(message: dict, grid: Grid) -> Optional[Coordinate]:
+        """
+        :return: the coordinate of the shot or None if the message is not a valid shot
+        :rtype: Coordinate
+        """
+        x, y = message.get('x'), message.get('y')
+        if message.get('type') != 'shot' or not isinstance(x, int) or not isinstance(y, int):
+            return None
+        if not (0 <= x < grid.size.width and 0 <= y < grid.size.height):
+            return None
+        return Coordinate(x, y)
@@ -3,29 +3,73 @@ from typing import Union
 from battleship.exceptions import InvalidCoordinateException
 from battleship.utils import Coordinate, Rotation
 
+# looking up the member of the enum on every shot is noticeably slower
+HORIZONTAL = Rotation.HORIZONTAL
+
 
 class Ship:
     """
     this class represents the ship
+    damaged cells are kept as a bitmask, the bit `i` is set if the i-th cell from the head was shot
     """
 
-    def __init__(self, ship_size: int, head_coord: Coordinate, rotation: Rotation):
+    __slots__ = ('_size', '_head_coord', '_rotation', '_hits')
+
+    def __init__(self, ship_size: int, head_coord: Coordinate, rotation: Rotation, hit_mask: int = 0):
+        try:
+            # the member itself lets to compare rotations by identity
+            rotation = Rotation(rotation)
+        except ValueError as e:
+            raise RuntimeError("unknown rotation parameter") from e
         self._size = ship_size
         self._head_coord = head_coord
         self._rotation = rotation
-        self._coords: frozenset[Coordinate] = frozenset()
+        self._hits = hit_mask & ((1 << ship_size) - 1)
+
+    def __getstate__(self) -> dict:
+        return {
+            '_size': self._size,
+            '_head_coord': self._head_coord,
+            '_rotation': self._rotation,
+            '_hits': self._hits,
+        }
+
+    def __setstate__(self, state: dict):
+        self._size = state['_size']
+        self._head_coord = state['_head_coord']
+        self._rotation = state['_rotation']
+        self._hits = state.get('_hits', 0)
+        # saves made before the bitmask keep the set of damaged cells
+        for coord in state.get('_damaged_cells', ()):
+            self.shot(coord)
 
-        self._update_coords()
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def head_coord(self) -> Coordinate:
+        return self._head_coord
 
-        self._damaged_cells: set[Coordinate] = set()
+    @property
+    def rotation(self) -> Rotation:
+        return self._rotation
+
+    @property
+    def hit_mask(self) -> int:
+        """
+        :return: the bitmask of damaged cells, the lowest bit is the head of the ship
+        :rtype: int
+        """
+        return self._hits
 
     @property
     def coordinates(self) -> frozenset[Coordinate]:
         """
-        :return: precached coordinates of the ship(including damaged)
+        :return: coordinates of the ship(including damaged), they are computed on every access
         :rtype: frozenset
         """
-        return self._coords
+        return frozenset(self._cell(offset) for offset in range(self._size))
 
     @property
     def damaged_cells(self) -> frozenset[Coordinate]:
@@ -33,21 +77,21 @@ class Ship:
         :return: damaged cells of the ship
         :rtype: frozenset
         """
-        return frozenset(self._damaged_cells)
+        return frozenset(self._cell(offset) for offset in range(self._size) if self._hits >> offset & 1)
 
     @property
     def damaged(self) -> bool:
         """
         check if the ship was damaged
         """
-        return len(self._damaged_cells) > 0
+        return self._hits != 0
 
     @property
     def is_destroyed(self) -> bool:
         """
         check if the ship was destroyed at all
         """
-        return self._coords == self.damaged_cells
+        return self._hits == (1 << self._size) - 1
 
     def is_intersect(self, coord: Union[Coordinate, frozenset[Coordinate]]) -> bool:
         """
@@ -56,22 +100,32 @@ class Ship:
         :rtype: bool
         """
         if isinstance(coord, Coordinate):
-            coord = frozenset((Coordinate,))
-        return len(self._coords.intersection(coord)) > 0
+            coord = (coord,)
+        return any(self._offset(cell) != -1 for cell in coord)
+
+    def _cell(self, offset: int) -> Coordinate:
+        """
+        :return: the coordinate of the cell at the given distance from the head
+        :rtype: Coordinate
+        """
+        if self._rotation is HORIZONTAL:
+            return Coordinate(self._head_coord.x + offset, self._head_coord.y)
+        return Coordinate(self._head_coord.x, self._head_coord.y + offset)
 
-    def _update_coords(self):
+    def _offset(self, coord: Coordinate) -> int:
         """
-        updates the cached coordinates of ship
+        :return: the distance from the head to the given cell or -1 if the cell is not a part of the ship
+        :rtype: int
         """
-        x, y = self._head_coord.x, self._head_coord.y
-        dx, dy = 0, 0
-        if self._rotation == Rotation.HORIZONTAL:
-            dx = 1
-        elif self._rotation == Rotation.VERTICAL:
-            dy = 1
+        head_x, head_y = self._head_coord
+        x, y = coord
+        if self._rotation is HORIZONTAL:
+            along, across = x - head_x, y - head_y
         else:
-            raise RuntimeError("unknown rotation parameter")
-        self._coords = frozenset(Coordinate(x + dx * i, y + dy * i) for i in range(self._size))
+            along, across = y - head_y, x - head_x
+        if across or not 0 <= along < self._size:
+            return -1
+        return along
 
     def shot(self, coord: Coordinate):
         """
@@ -80,6 +134,7 @@ class Ship:
         :param coord: the coord to shot
         :type coord: Coordinate
         """
-        if coord not in self._coords:
+        offset = self._offset(coord)
+        if offset == -1:
             raise InvalidCoordinateException(f"given coordinate is invalid")
-        self._damaged_cells.add(coord)
+        self._hits |= 1 << offset
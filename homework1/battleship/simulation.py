@@ -0,0 +1,124 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import partial
+from typing import NamedTuple, Optional
+
+from battleship.fleet import DEFAULT_OCCUPANCY, compose_fleet
+from battleship.game import Game
+from battleship.journal import JOURNAL_EXTENSION, JournalWriter
+from battleship.player import AbstractPlayer, DensityPlayer, RandomPlayer, player_seed
+
+# players which can play without a human, by the name used in the command line
+PLAYER_TYPES: dict[str, type[AbstractPlayer]] = {
+    'random': RandomPlayer,
+    'density': DensityPlayer,
+}
+
+
+class GameResult(NamedTuple):
+    """
+    result of one game
+    """
+    winner: int  # index of the winner: 0 for the first player and 1 for the second one
+    shots: int  # count of shots made by the winner
+
+
+class SimulationReport(NamedTuple):
+    """
+    aggregated results of many games
+    """
+    games: int
+    wins: tuple[int, int]
+    winner_shots: tuple[int, int]  # total count of shots made by every player in won games
+    seconds: float
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else float('inf')
+
+    def win_rate(self, index: int) -> float:
+        return self.wins[index] / self.games if self.games else 0.
+
+    def average_shots_to_win(self, index: int) -> float:
+        return self.winner_shots[index] / self.wins[index] if self.wins[index] else 0.
+
+
+def play_game(player_types: tuple[str, str], n: int, k: int, seed: int,
+              occupancy: Fraction = DEFAULT_OCCUPANCY, journal_dir: Optional[str] = None) -> GameResult:
+    """
+    plays one game without drawing
+    the game with an odd seed is started by the second player
+    :param player_types: names of players from `PLAYER_TYPES`
+    :param n: the height of playing field
+    :param k: the width of playing field
+    :param seed: the seed of the game
+    :param occupancy: the share of the grid area occupied by ships
+    :param journal_dir: the folder to write the journal of the game to, the journal is named by the seed
+    :return: the result of the game
+    :rtype: GameResult
+    """
+    # fleets are cached, so every worker composes the fleet once
+    game = Game(None, n, k, seed, compose_fleet(k, n, occupancy))
+    # every player has its own generator, so the replay of one player makes the same moves
+    game.player1 = PLAYER_TYPES[player_types[0]](player_seed(seed, 0))
+    game.player2 = PLAYER_TYPES[player_types[1]](player_seed(seed, 1))
+    game.restart()
+    if journal_dir is None:
+        game.loop(seed % 2)
+    else:
+        with open(os.path.join(journal_dir, f'{seed}{JOURNAL_EXTENSION}'), 'wb') as file:
+            game.journal = JournalWriter(file)
+            game.loop(seed % 2)
+
+    winner = 0 if game.winner is game.player1 else 1
+    return GameResult(winner, game.shot_counts[winner])
+
+
+def simulate(player_types: tuple[str, str], games: int, n: int, k: int,
+             jobs: Optional[int] = None, seed: int = 0,
+             occupancy: Fraction = DEFAULT_OCCUPANCY, journal_dir: Optional[str] = None) -> SimulationReport:
+    """
+    plays `games` games across a process pool
+    :param player_types: names of players from `PLAYER_TYPES`
+    :param games: count of games to play
+    :param n: the height of playing field
+    :param k: the width of playing field
+    :param jobs: count of worker processes, all cpus by default
+    :param seed: the seed of the first game, next games get next seeds
+    :param occupancy: the share of the grid area occupied by ships
+    :param journal_dir: the folder to write journals of games to
+    :return: the report of all games
+    :rtype: SimulationReport
+    """
+    jobs = jobs or os.cpu_count() or 1
+    # a wrong occupancy fails here rather than in every worker
+    compose_fleet(k, n, occupancy)
+    seeds = range(seed, seed + games)
+    worker = partial(play_game, player_types, n, k, occupancy=occupancy, journal_dir=journal_dir)
+
+    wins, winner_shots = [0, 0], [0, 0]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(jobs) as executor:
+        # big chunks keep the overhead of interprocess communication low
+        for result in executor.map(worker, seeds, chunksize=max(1, games // (jobs * 4))):
+            wins[result.winner] += 1
+            winner_shots[result.winner] += result.shots
+    seconds = time.perf_counter() - start
+
+    return SimulationReport(games, (wins[0], wins[1]), (winner_shots[0], winner_shots[1]), seconds)
+
+
+def format_report(report: SimulationReport, player_types: tuple[str, str]) -> str:
+    """
+    :return: the text representation of the report
+    :rtype: str
+    """
+    lines = [f'games: {report.games}, {report.games_per_second:.1f} games/s']
+    for index, player_type in enumerate(player_types):
+        lines.append(
+            f'player {index + 1} ({player_type}): {report.win_rate(index):.1%} wins, '
+            f'{report.average_shots_to_win(index):.1f} shots to win on average'
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,263 @@
+"""
+tournaments between computer players
+
+every match between two players is a series of games, all games of a round are played across a process pool.
+Ratings are updated by the Elo system after every game in the order of the schedule,
+so the tournament with the same seed always gives the same ratings.
+"""
+import csv
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from fractions import Fraction
+from functools import partial
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence, TextIO
+
+from battleship.fleet import DEFAULT_OCCUPANCY, compose_fleet
+from battleship.simulation import PLAYER_TYPES, GameResult, play_game
+
+ROUND_ROBIN = 'round-robin'
+SWISS = 'swiss'
+SYSTEMS = (ROUND_ROBIN, SWISS)
+
+INITIAL_RATING = 1500.
+# the maximal change of the rating after one game
+K_FACTOR = 16.
+
+CSV_FORMAT = 'csv'
+JSON_FORMAT = 'json'
+REPORT_FORMATS = (CSV_FORMAT, JSON_FORMAT)
+
+
+class ScheduledGame(NamedTuple):
+    """
+    the game of the tournament before it is played
+    """
+    round: int
+    players: tuple[str, str]
+    seed: int  # the game with an odd seed is started by the second player
+
+
+class GameRecord(NamedTuple):
+    """
+    the played game with ratings of players after it
+    """
+    round: int
+    first: str
+    second: str
+    seed: int
+    winner: str
+    shots: int  # count of shots made by the winner
+    first_rating: float
+    second_rating: float
+
+
+class Standing(NamedTuple):
+    """
+    the place of the player in the tournament
+    """
+    player: str
+    rating: float
+    wins: int
+    losses: int
+
+
+class EloRatings:
+    """
+    ratings of players updated after every game
+    """
+
+    def __init__(self, players: Iterable[str], initial: float = INITIAL_RATING, k_factor: float = K_FACTOR):
+        self._ratings = {player: initial for player in players}
+        self._k_factor = k_factor
+
+    def __getitem__(self, player: str) -> float:
+        return self._ratings[player]
+
+    def expected_score(self, player: str, opponent: str) -> float:
+        """
+        :return: the probability of the player to win the opponent
+        :rtype: float
+        """
+        return 1 / (1 + 10 ** ((self._ratings[opponent] - self._ratings[player]) / 400))
+
+    def update(self, winner: str, loser: str):
+        delta = self._k_factor * (1 - self.expected_score(winner, loser))
+        self._ratings[winner] += delta
+        self._ratings[loser] -= delta
+
+
+def round_robin_rounds(players: Sequence[str]) -> list[list[tuple[str, str]]]:
+    """
+    schedules matches of every player with every other one by the circle method,
+    nobody plays twice in one round
+    :return: pairs of players of every round
+    :rtype: list
+    """
+    # the player who is paired with None rests in this round
+    circle: list[Optional[str]] = list(players) + ([None] if len(players) % 2 else [])
+    rounds = []
+    for _ in range(len(circle) - 1):
+        half = len(circle) // 2
+        pairs = zip(circle[:half], reversed(circle[half:]))
+        rounds.append([(first, second) for first, second in pairs if first is not None and second is not None])
+        # the first player stays, others rotate
+        circle.insert(1, circle.pop())
+    return rounds
+
+
+def swiss_pairs(players: Sequence[str], wins: dict[str, int], ratings: EloRatings,
+                played: set[frozenset[str]]) -> list[tuple[str, str]]:
+    """
+    pairs players with the same or the nearest count of wins, who did not play with each other yet if possible
+    the last player rests if the count of players is odd
+    :param played: pairs of players who already played
+    :return: pairs of players of the next round
+    :rtype: list
+    """
+    unpaired = sorted(players, key=lambda player: (wins[player], ratings[player]), reverse=True)
+    pairs = []
+    while len(unpaired) > 1:
+        first = unpaired.pop(0)
+        # the nearest player in the standings who was not met yet, otherwise just the nearest one
+        index = next((i for i, player in enumerate(unpaired) if frozenset((first, player)) not in played), 0)
+        pairs.append((first, unpaired.pop(index)))
+    return pairs
+
+
+def _play(n: int, k: int, occupancy: Fraction, game: ScheduledGame) -> GameResult:
+    return play_game(game.players, n, k, game.seed, occupancy)
+
+
+class Tournament:
+    """
+    plays the tournament between computer players from `PLAYER_TYPES`
+    """
+
+    def __init__(self, players: Sequence[str], n: int, k: int, games_per_match: int = 10, seed: int = 0,
+                 occupancy: Fraction = DEFAULT_OCCUPANCY):
+        """
+        :param players: names of players from `PLAYER_TYPES`, they must be unique
+        :param n: the height of playing field
+        :param k: the width of playing field
+        :param games_per_match: count of games between two players in every match
+        :param seed: the seed of the first game, next games get next seeds
+        :param occupancy: the share of the grid area occupied by ships
+        """
+        unknown = set(players) - PLAYER_TYPES.keys()
+        if unknown:
+            raise ValueError(f'unknown players: {", ".join(sorted(unknown))}')
+        if len(set(players)) != len(players) or len(players) < 2:
+            raise ValueError('the tournament needs at least two different players')
+        # a wrong occupancy fails here rather than in every worker
+        compose_fleet(k, n, occupancy)
+
+        self._players = list(players)
+        self._worker = partial(_play, n, k, occupancy)
+        self._games_per_match = games_per_match
+        self._next_seed = seed
+
+        self.ratings = EloRatings(self._players)
+        self._wins = dict.fromkeys(self._players, 0)
+        self._losses = dict.fromkeys(self._players, 0)
+        self._played: set[frozenset[str]] = set()
+
+    def _schedule(self, round_number: int, pairs: Iterable[tuple[str, str]]) -> list[ScheduledGame]:
+        games = []
+        for pair in pairs:
+            self._played.add(frozenset(pair))
+            for _ in range(self._games_per_match):
+                games.append(ScheduledGame(round_number, pair, self._next_seed))
+                self._next_seed += 1
+        return games
+
+    def _play_games(self, executor: Executor, jobs: int, games: list[ScheduledGame],
+                    on_game: Optional[Callable[[GameRecord], None]]):
+        # big chunks keep the overhead of interprocess communication low
+        chunk_size = max(1, len(games) // (jobs * 4))
+        for game, result in zip(games, executor.map(self._worker, games, chunksize=chunk_size)):
+            winner, loser = game.players[result.winner], game.players[1 - result.winner]
+            self.ratings.update(winner, loser)
+            self._wins[winner] += 1
+            self._losses[loser] += 1
+            if on_game is not None:
+                first, second = game.players
+                on_game(GameRecord(game.round, first, second, game.seed, winner, result.shots,
+                                   round(self.ratings[first], 2), round(self.ratings[second], 2)))
+
+    def run(self, system: str = ROUND_ROBIN, rounds: Optional[int] = None, jobs: Optional[int] = None,
+            on_game: Optional[Callable[[GameRecord], None]] = None) -> list[Standing]:
+        """
+        plays all games of the tournament
+        :param system: one of `SYSTEMS`
+        :param rounds: count of rounds of the swiss system, enough rounds to find the winner by default;
+        the round-robin tournament has as many rounds as needed for all players to meet each other
+        :param jobs: count of worker processes, all cpus by default
+        :param on_game: the function called with every game in the order of the schedule
+        :return: standings of players from the first place to the last one
+        :rtype: list
+        """
+        if system not in SYSTEMS:
+            raise ValueError(f'unknown tournament system: {system}')
+        jobs = jobs or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(jobs) as executor:
+            if system == ROUND_ROBIN:
+                # rounds do not depend on each other, so all of them go to the pool at once
+                games = []
+                for round_number, pairs in enumerate(round_robin_rounds(self._players), start=1):
+                    games.extend(self._schedule(round_number, pairs))
+                self._play_games(executor, jobs, games, on_game)
+            else:
+                # pairs of the next round depend on results of the previous one
+                rounds = rounds or (len(self._players) - 1).bit_length()
+                for round_number in range(1, rounds + 1):
+                    pairs = swiss_pairs(self._players, self._wins, self.ratings, self._played)
+                    self._play_games(executor, jobs, self._schedule(round_number, pairs), on_game)
+
+        return self.standings()
+
+    def standings(self) -> list[Standing]:
+        """
+        :return: standings of players from the first place to the last one
+        :rtype: list
+        """
+        standings = [
+            Standing(player, self.ratings[player], self._wins[player], self._losses[player])
+            for player in self._players
+        ]
+        return sorted(standings, key=lambda standing: (standing.rating, standing.wins), reverse=True)
+
+
+class ReportWriter:
+    """
+    streams records of games into the text file as CSV or as JSON lines
+    """
+
+    def __init__(self, file: TextIO, report_format: str = CSV_FORMAT):
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f'unknown report format: {report_format}')
+        self._file = file
+        self._csv = None
+        if report_format == CSV_FORMAT:
+            self._csv = csv.writer(file)
+            self._csv.writerow(GameRecord._fields)
+
+    def __call__(self, record: GameRecord):
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record._asdict()) + '\n')
+
+
+def format_standings(standings: Sequence[Standing]) -> str:
+    """
+    :return: the text table of standings
+    :rtype: str
+    """
+    width = max(len(standing.player) for standing in standings)
+    lines = [f'{"#":>2}  {"player":<{width}}  rating  wins  losses']
+    for place, standing in enumerate(standings, start=1):
+        lines.append(f'{place:>2}  {standing.player:<{width}}  {standing.rating:6.1f}  '
+                     f'{standing.wins:>4}  {standing.losses:>6}')
+    return '\n'.join(lines)
@@ -0,0 +1,106 @@
+"""
+frozen copy of the grid and the ship before flat boards, they are kept only to compare with
+
+the grid keeps the list of ships and looks through all of them on every shot and check,
+the field is built as the list of lists of characters, every ship caches the set of its cells
+"""
+from copy import deepcopy
+
+from battleship.utils import Coordinate, Rotation, ShotStatus
+
+
+class BaselineShip:
+    def __init__(self, ship_size: int, head_coord: Coordinate, rotation: Rotation):
+        self._size = ship_size
+        dx, dy = (1, 0) if rotation == Rotation.HORIZONTAL else (0, 1)
+        self._coords = frozenset(Coordinate(head_coord.x + dx * i, head_coord.y + dy * i) for i in range(ship_size))
+        self._damaged_cells: set[Coordinate] = set()
+
+    @property
+    def coordinates(self) -> frozenset[Coordinate]:
+        return self._coords
+
+    @property
+    def damaged_cells(self) -> frozenset[Coordinate]:
+        return frozenset(self._damaged_cells)
+
+    @property
+    def damaged(self) -> bool:
+        return len(self._damaged_cells) > 0
+
+    @property
+    def is_destroyed(self) -> bool:
+        return self._coords == self.damaged_cells
+
+    def shot(self, coord: Coordinate):
+        self._damaged_cells.add(coord)
+
+
+class BaselineGrid:
+    SHIP_CHARACTER = '#'
+    DAMAGED_SHIP_CHARACTER = '@'
+    DESTROYED_SHIP_CHARACTER = 'x'
+    EMPTY_CELL_CHARACTER = '.'
+
+    def __init__(self, k: int, n: int):
+        self._width, self._height = k, n
+        self._ships: list[BaselineShip] = []
+
+    def place_ship(self, ship: BaselineShip):
+        self._ships.append(ship)
+
+    def can_place_ship(self, ship: BaselineShip) -> bool:
+        for inner_ship in self._ships:
+            # if sets intersection not empty
+            if inner_ship.coordinates & ship.coordinates:
+                return False
+        return True
+
+    def make_field(self, for_opponent: bool = False) -> list[list[str]]:
+        field = [[self.EMPTY_CELL_CHARACTER for _ in range(self._height)] for _ in range(self._width)]
+
+        if not for_opponent:
+            for ship in self._ships:
+                for coord in ship.coordinates:
+                    if ship.is_destroyed:
+                        char = self.DESTROYED_SHIP_CHARACTER
+                    elif ship.damaged and coord in ship.damaged_cells:
+                        char = self.DAMAGED_SHIP_CHARACTER
+                    else:
+                        char = self.SHIP_CHARACTER
+                    field[coord.y][coord.x] = char
+        else:
+            for ship in self._ships:
+                # skip ship if it is intact
+                if not ship.damaged and not ship.is_destroyed:
+                    continue
+                if ship.is_destroyed:
+                    for coord in ship.coordinates:
+                        field[coord.y][coord.x] = self.DESTROYED_SHIP_CHARACTER
+                elif ship.damaged:
+                    for coord in ship.damaged_cells:
+                        field[coord.y][coord.x] = self.DAMAGED_SHIP_CHARACTER
+
+        return field
+
+    def shot(self, coord: Coordinate) -> ShotStatus:
+        for ship in self._ships:
+            if coord in ship.coordinates:
+                ship.shot(coord)
+                if ship.is_destroyed:
+                    return ShotStatus.SINK
+                return ShotStatus.HIT
+        return ShotStatus.MISS
+
+    @property
+    def ships(self) -> list[BaselineShip]:
+        # deepcopy to avoid changing from outside
+        return deepcopy(self._ships)
+
+    @property
+    def lost(self) -> bool:
+        # `Game._lost` of the old game
+        for ship in self.ships:
+            if not ship.is_destroyed:
+                return False
+        return True
@@ -0,0 +1,96 @@
+"""
+compares the main grid operations of flat boards with the old list of ships(see `baseline_grid.py`)
+on grids of different sizes, both grids have the same fleet and get the same shots and checks
+
+run it from the project folder:
+    python -m benchmarks.grid_benchmark
+"""
+import random
+import time
+import timeit
+from typing import Callable, Sequence
+
+from battleship.grid import Grid
+from battleship.player import AbstractPlayer
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+from benchmarks.baseline_grid import BaselineGrid, BaselineShip
+
+SIDES = (10, 100, 1000)
+REPEATS = 10000
+# the old grid is slow on big sizes, so every operation is measured at most so long
+BUDGET_SECONDS = 2.0
+# calls between checks of the budget
+CHUNK = 16
+
+
+def random_coordinates(side: int, count: int) -> list[Coordinate]:
+    return [Coordinate(random.randrange(side), random.randrange(side)) for _ in range(count)]
+
+
+def per_call(func: Callable, args: Sequence) -> float:
+    """
+    :return: microseconds per call of `func` for every argument,
+    calls stop when `BUDGET_SECONDS` are spent
+    :rtype: float
+    """
+    calls = 0
+    start = time.perf_counter()
+    while calls < len(args) and time.perf_counter() - start < BUDGET_SECONDS:
+        for arg in args[calls:calls + CHUNK]:
+            func(arg)
+        calls = min(calls + CHUNK, len(args))
+    return (time.perf_counter() - start) / calls * 10 ** 6
+
+
+def bench_grid(grid, probes: list, shots: list[Coordinate]) -> dict[str, float]:
+    """
+    :return: microseconds per shot, placement check, loss check and making of both fields,
+    fields are joined into text, because the new field is a lazy projection
+    :rtype: dict
+    """
+    return {
+        'shot': per_call(grid.shot, shots),
+        'can place': per_call(grid.can_place_ship, probes),
+        'lost': per_call(lambda _: grid.lost, range(REPEATS)),
+        'fields': per_call(
+            lambda _: (Grid.concat_field(grid.make_field(False)), Grid.concat_field(grid.make_field(True))),
+            range(REPEATS),
+        ),
+    }
+
+
+def bench_side(side: int) -> tuple[int, float, dict[str, tuple[float, float]]]:
+    """
+    :return: ships count, seconds to place the fleet and microseconds per operation
+    of the old and the new grid
+    :rtype: tuple
+    """
+    grid = Grid(side, side)
+    placement = timeit.timeit(lambda: AbstractPlayer.place_ships(grid), number=1)
+    baseline = BaselineGrid(side, side)
+    for ship in grid.ships:
+        baseline.place_ship(BaselineShip(ship.size, ship.head_coord, ship.rotation))
+
+    probes = [
+        (random.randint(1, 4), coord, random.choice([Rotation.HORIZONTAL, Rotation.VERTICAL]))
+        for coord in random_coordinates(side, REPEATS)
+    ]
+    shots = random_coordinates(side, REPEATS)
+    old = bench_grid(baseline, [BaselineShip(*probe) for probe in probes], shots)
+    new = bench_grid(grid, [Ship(*probe) for probe in probes], shots)
+    return len(grid), placement, {name: (old[name], new[name]) for name in new}
+
+
+def main():
+    print(f'{"grid":>11} {"ships":>7} {"place fleet, s":>15} {"operation":>10} {"old, us":>12} {"new, us":>9}'
+          f' {"speedup":>9}')
+    for side in SIDES:
+        ships, placement, timings = bench_side(side)
+        for name, (old, new) in timings.items():
+            print(f'{f"{side}x{side}":>11} {ships:>7} {placement:>15.3f} {name:>10} {old:>12.2f} {new:>9.2f}'
+                  f' {old / new:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+measures the placement of the whole fleet on grids of different sizes
+
+run it from the project folder:
+    python -m benchmarks.placement_benchmark
+"""
+import timeit
+
+from battleship.grid import Grid
+from battleship.placement import ShipPlacer
+
+SIDES = (10, 100, 500, 1000, 2000)
+SEED = 0
+
+
+def bench_side(side: int) -> tuple[int, int, float]:
+    """
+    :return: ships count, occupied cells and seconds to place the fleet
+    :rtype: tuple
+    """
+    grid = Grid(side, side)
+    seconds = timeit.timeit(lambda: ShipPlacer(grid, SEED).place_fleet(grid.ship_counts), number=1)
+    return len(grid), grid.intact_cells, seconds
+
+
+def main():
+    print(f'{"grid":>11} {"ships":>7} {"cells":>9} {"place fleet, s":>15}')
+    for side in SIDES:
+        ships, cells, seconds = bench_side(side)
+        print(f'{f"{side}x{side}":>11} {ships:>7} {cells:>9} {seconds:>15.3f}')
+
+
+if __name__ == '__main__':
+    main()
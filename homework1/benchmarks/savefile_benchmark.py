@@ -0,0 +1,69 @@
+"""
+compares the size and the speed of the binary save with the old pickle save
+
+run it from the project folder:
+    python -m benchmarks.savefile_benchmark
+"""
+import io
+import pickle
+import random
+import timeit
+
+from battleship import savefile
+from battleship.grid import Grid
+from battleship.placement import ShipPlacer
+from battleship.utils import Coordinate
+
+SIDES = (100, 500, 1000)
+SEED = 0
+# part of cells shot before saving
+SHOT_RATIO = 0.3
+
+
+def make_grid(side: int, rng: random.Random) -> Grid:
+    grid = Grid(side, side)
+    ShipPlacer(grid, SEED).place_fleet(grid.ship_counts)
+    for _ in range(int(side * side * SHOT_RATIO)):
+        grid.shot(Coordinate(rng.randrange(side), rng.randrange(side)))
+    return grid
+
+
+def bench(dump, load) -> tuple[int, float, float]:
+    """
+    :return: size in bytes, seconds to dump and seconds to load
+    :rtype: tuple
+    """
+    buffer = io.BytesIO()
+    dump_seconds = timeit.timeit(lambda: dump(buffer), number=1)
+    data = buffer.getvalue()
+    load_seconds = timeit.timeit(lambda: load(io.BytesIO(data)), number=1)
+    return len(data), dump_seconds, load_seconds
+
+
+def main():
+    rng = random.Random(SEED)
+    formats = {
+        'pickle': (
+            lambda grids: lambda file: pickle.dump([*grids, 0], file),
+            lambda file: pickle.load(file),
+        ),
+        'binary': (
+            lambda grids: lambda file: savefile.dump(file, grids, 0, compress=False),
+            savefile.load,
+        ),
+        'binary+zlib': (
+            lambda grids: lambda file: savefile.dump(file, grids, 0),
+            savefile.load,
+        ),
+    }
+
+    print(f'{"grid":>11} {"format":>12} {"size, KiB":>10} {"dump, s":>8} {"load, s":>8}')
+    for side in SIDES:
+        grids = [make_grid(side, rng), make_grid(side, rng)]
+        for name, (dump, load) in formats.items():
+            size, dump_seconds, load_seconds = bench(dump(grids), load)
+            print(f'{f"{side}x{side}":>11} {name:>12} {size / 1024:>10.1f} {dump_seconds:>8.3f} {load_seconds:>8.3f}')
+
+
+if __name__ == '__main__':
+    main()
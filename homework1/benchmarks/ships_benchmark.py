@@ -0,0 +1,55 @@
+"""
+measures the memory taken by ships and the time of shots to them
+
+run it from the project folder:
+    python -m benchmarks.ships_benchmark
+"""
+import random
+import timeit
+import tracemalloc
+
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+
+SHIPS = 300000
+MAX_SHIP_LENGTH = 10
+SEED = 0
+
+
+def make_ships(rng: random.Random) -> list[Ship]:
+    return [
+        Ship(rng.randint(1, MAX_SHIP_LENGTH), Coordinate(rng.randrange(1000), rng.randrange(1000)),
+             rng.choice([Rotation.HORIZONTAL, Rotation.VERTICAL]))
+        for _ in range(SHIPS)
+    ]
+
+
+def main():
+    rng = random.Random(SEED)
+
+    tracemalloc.start()
+    ships = make_ships(rng)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # every shot hits a random cell of a random ship
+    shots = []
+    for ship in ships:
+        offset = rng.randrange(ship.size)
+        head = ship.head_coord
+        if ship.rotation == Rotation.HORIZONTAL:
+            shots.append((ship, Coordinate(head.x + offset, head.y)))
+        else:
+            shots.append((ship, Coordinate(head.x, head.y + offset)))
+
+    shot = timeit.timeit(lambda: [ship.shot(coord) for ship, coord in shots], number=1)
+    destroyed = timeit.timeit(lambda: [ship.is_destroyed for ship in ships], number=1)
+
+    print(f'ships: {SHIPS}')
+    print(f'memory per ship(including the head coordinate): {memory / SHIPS:.1f} bytes')
+    print(f'shot: {shot / SHIPS * 10 ** 9:.0f} ns')
+    print(f'is_destroyed: {destroyed / SHIPS * 10 ** 9:.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from battleship.grid import Grid
+from battleship.placement import ShipPlacer
+from battleship.utils import Coordinate
+
+
+def ships_state(grid: Grid) -> list[tuple]:
+    """
+    the state of ships of the grid, which is compared between grids
+    """
+    return [(ship.head_coord, ship.size, ship.rotation, ship.hit_mask) for ship in grid.ships]
+
+
+@pytest.fixture()
+def grid_fixture():
+    """
+    the grid with the whole fleet placed and some cells shot, some ships are damaged or destroyed
+    """
+    grid = Grid(12, 10)
+    ShipPlacer(grid, 1).place_fleet(grid.ship_counts)
+    rng = random.Random(2)
+    for _ in range(70):
+        grid.shot(Coordinate(rng.randrange(12), rng.randrange(10)))
+    return grid
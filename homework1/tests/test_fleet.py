@@ -0,0 +1,56 @@
+from fractions import Fraction
+from types import MappingProxyType
+
+import pytest
+
+from battleship.fleet import check_fleet, compose_fleet, fleet_area, fleet_class, tetrahedral
+
+
+def test_fleet_class():
+    for t in range(1, 200):
+        area = tetrahedral(t)
+        assert fleet_class(area) == t
+        assert fleet_class(area - 1) == t - 1
+    assert fleet_class(0) == fleet_class(-5) == 0
+    # the float cube root is far from exact on huge areas
+    assert fleet_class(tetrahedral(10 ** 6)) == 10 ** 6
+
+
+@pytest.mark.parametrize('width, height', [(10, 10), (5, 5), (100, 5), (1000, 1000), (37, 91)])
+def test_compose_fleet(width, height):
+    fleet = compose_fleet(width, height)
+    t = max(fleet, default=0)
+
+    assert fleet == {length: t - length + 1 for length in range(1, t + 1)}
+    assert fleet_area(fleet) <= width * height // 5
+    # the next class takes too many cells or too long ships
+    assert tetrahedral(t + 1) > width * height // 5 or t + 1 > min(width, height) // 2
+
+
+def test_compose_fleet_cache():
+    fleet = compose_fleet(20, 30)
+
+    assert compose_fleet(20, 30, Fraction(1, 5)) is fleet
+    assert compose_fleet(20, 30, 0.2) is fleet
+    assert compose_fleet(20, 30, 0.5) != fleet
+    with pytest.raises(TypeError):
+        fleet[1] = 0  # pylint: disable=E1137
+    with pytest.raises(ValueError):
+        compose_fleet(20, 30, 1.5)
+
+
+def test_check_fleet():
+    fleet = {3: 1, 1: 2}
+    checked = check_fleet(fleet, 5, 5)
+    fleet[3] = 2
+
+    # the checked fleet is a copy
+    assert checked == {3: 1, 1: 2}
+    for wrong in ({6: 1}, {0: 1}, {2: -1}, {2: 1.5}, {5: 5, 1: 1}):
+        with pytest.raises(ValueError):
+            check_fleet(wrong, 5, 5)
+        # read-only fleets are checked too
+        with pytest.raises(ValueError):
+            check_fleet(MappingProxyType(wrong), 5, 5)
+    with pytest.raises(ValueError):
+        check_fleet(compose_fleet(100, 100), 5, 5)
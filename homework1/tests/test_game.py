@@ -0,0 +1,20 @@
+import pytest
+
+from battleship.game import Game
+from battleship.player import RandomPlayer, player_seed
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_loop(seed):
+    game = Game(None, 8, 9, seed)
+    game.player1 = RandomPlayer(player_seed(seed, 0))
+    game.player2 = RandomPlayer(player_seed(seed, 1))
+    game.loop(seed % 2)
+    loser_grid = game.grids[1 - game.current_player_index]
+
+    assert game.winner is (game.player1, game.player2)[game.current_player_index]
+    # counters of the loser reach zero with the last shot
+    assert (loser_grid.intact_cells, loser_grid.afloat_ships) == (0, 0)
+    assert Game._lost(loser_grid)  # pylint: disable=W0212
+    assert all(ship.is_destroyed for ship in loser_grid.ships)
+    assert not Game._lost(game.grids[game.current_player_index])  # pylint: disable=W0212
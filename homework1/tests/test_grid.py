@@ -0,0 +1,127 @@
+import pickle
+
+import pytest
+
+from battleship.exceptions import CantPlaceShipException
+from battleship.grid import Grid
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation, ShotStatus
+from tests.conftest import ships_state
+
+
+def expected_field(grid: Grid, for_opponent: bool) -> list[str]:
+    """
+    the field made from ships of the grid cell by cell
+    """
+    field = [[Grid.EMPTY_CELL_CHARACTER] * grid.size.width for _ in range(grid.size.height)]
+    for ship in grid.ships:
+        for coord in ship.coordinates:
+            if ship.is_destroyed:
+                char = Grid.DESTROYED_SHIP_CHARACTER
+            elif coord in ship.damaged_cells:
+                char = Grid.DAMAGED_SHIP_CHARACTER
+            elif for_opponent:
+                continue
+            else:
+                char = Grid.SHIP_CHARACTER
+            field[coord.y][coord.x] = char
+    return [''.join(row) for row in field]
+
+
+def test_shots():
+    grid = Grid(8, 6, {3: 1, 1: 1})
+    grid.place_ship(Ship(3, Coordinate(7, 1), Rotation.VERTICAL))
+    grid.place_ship(Ship(1, Coordinate(0, 5), Rotation.HORIZONTAL))
+
+    assert (grid.intact_cells, grid.afloat_ships, grid.lost) == (4, 2, False)
+    assert grid.shot(Coordinate(7, 2)) == ShotStatus.HIT
+    # the second shot to the cell does not change counters
+    assert grid.shot(Coordinate(7, 2)) == ShotStatus.HIT
+    assert grid.shot(Coordinate(8, 2)) == ShotStatus.MISS
+    assert grid.shot(Coordinate(0, 0)) == ShotStatus.MISS
+    assert (grid.intact_cells, grid.afloat_ships) == (3, 2)
+    assert grid.shot(Coordinate(0, 5)) == ShotStatus.SINK
+    assert (grid.intact_cells, grid.afloat_ships) == (2, 1)
+    assert grid.make_field()[2] == '.......@'
+    assert grid.make_field(True)[1] == '........'
+
+    for y in (1, 3):
+        grid.shot(Coordinate(7, y))
+
+    assert (grid.intact_cells, grid.afloat_ships, grid.lost) == (0, 0, True)
+    assert [row[7] for row in grid.make_field(True)[1:4]] == ['x'] * 3
+    assert grid.ship_at(Coordinate(7, 3)) is grid.ships[0]
+    assert grid.ship_at(Coordinate(6, 3)) is None
+
+
+def test_place_ship():
+    grid = Grid(5, 5, {3: 1, 2: 1})
+    grid.place_ship(Ship(3, Coordinate(1, 1), Rotation.HORIZONTAL))
+
+    for ship in (
+        Ship(2, Coordinate(2, 0), Rotation.VERTICAL),
+        Ship(2, Coordinate(4, 0), Rotation.HORIZONTAL),
+        Ship(2, Coordinate(0, 4), Rotation.VERTICAL),
+    ):
+        assert not grid.can_place_ship(ship)
+        with pytest.raises(CantPlaceShipException):
+            grid.place_ship(ship)
+    assert grid.can_place_ship(Ship(2, Coordinate(0, 2), Rotation.VERTICAL))
+    assert Grid.concat_field(grid.make_field()) == '.....\n.###.\n.....\n.....\n.....'
+
+
+@pytest.mark.parametrize('for_opponent', [False, True])
+def test_make_field(grid_fixture, for_opponent):
+    field = grid_fixture.make_field(for_opponent)
+    expected = expected_field(grid_fixture, for_opponent)
+
+    assert list(field) == expected
+    assert (len(field), len(field[0])) == (10, 12)
+    assert field[-1] == expected[-1]
+    assert field[2:5] == expected[2:5]
+    with pytest.raises(IndexError):
+        field[10]  # pylint: disable=W0104
+
+
+def test_counters(grid_fixture):
+    ships = grid_fixture.ships
+    intact = sum(ship.size - bin(ship.hit_mask).count('1') for ship in ships)
+
+    assert grid_fixture.intact_cells == intact
+    assert grid_fixture.afloat_ships == sum(not ship.is_destroyed for ship in ships)
+
+
+def test_pickle_round_trip(grid_fixture):
+    grid = pickle.loads(pickle.dumps(grid_fixture))
+
+    # boards are rebuilt from ships
+    assert ships_state(grid) == ships_state(grid_fixture)
+    assert list(grid.make_field()) == list(grid_fixture.make_field())
+    assert (grid.intact_cells, grid.afloat_ships) == (grid_fixture.intact_cells, grid_fixture.afloat_ships)
+    assert dict(grid.ship_counts) == dict(grid_fixture.ship_counts)
+
+
+def test_ships_view(grid_fixture):
+    ships = grid_fixture.ships
+
+    # the view shares ships with the grid instead of copying them
+    assert ships[0] is grid_fixture.ships[0]
+    assert list(ships[2:4]) == list(grid_fixture.ships)[2:4]
+    assert len(ships) == 10
+    with pytest.raises(TypeError):
+        ships[0] = ships[1]  # pylint: disable=E1137
+    assert not hasattr(ships, 'append')
+
+
+def test_field_view_projection():
+    grid = Grid(5, 5, {2: 1})
+    grid.place_ship(Ship(2, Coordinate(1, 3), Rotation.HORIZONTAL))
+    owner, opponent = grid.make_field(), grid.make_field(for_opponent=True)
+
+    assert (owner[3], opponent[3]) == ('.##..', '.....')
+    # both views are projections of the same state matrix, so they see later shots
+    grid.shot(Coordinate(2, 3))
+    assert (owner[3], opponent[-2]) == ('.#@..', '..@..')
+    grid.shot(Coordinate(1, 3))
+    assert owner[3] == opponent[3] == '.xx..'
+    assert Grid.concat_field(opponent) == '.....\n.....\n.....\n.xx..\n.....'
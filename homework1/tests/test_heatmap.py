@@ -0,0 +1,100 @@
+import random
+
+import numpy as np
+import pytest
+
+from battleship.game import Game
+from battleship.heatmap import SHOT_SCORE, Heatmap, coverage
+from battleship.player import DensityPlayer, RandomPlayer, player_seed
+from battleship.utils import Coordinate, Size
+
+
+def full_density(size: Size, ship_counts: dict[int, int], blocked: set, shot: set) -> list[list[int]]:
+    """
+    the density counted from scratch by trying every placement of every ship
+    """
+    density = [[0] * size.width for _ in range(size.height)]
+    for length, count in ship_counts.items():
+        rotations = [(1, 0)] if length == 1 else [(1, 0), (0, 1)]
+        for dx, dy in rotations:
+            for y in range(size.height - dy * (length - 1)):
+                for x in range(size.width - dx * (length - 1)):
+                    cells = [(x + dx * i, y + dy * i) for i in range(length)]
+                    if any(Coordinate(*cell) in blocked for cell in cells):
+                        continue
+                    for cell_x, cell_y in cells:
+                        density[cell_y][cell_x] += count
+    for coord in shot:
+        density[coord.y][coord.x] = SHOT_SCORE
+    return density
+
+
+def test_coverage():
+    rng = np.random.default_rng(0)
+    blocked = rng.random((6, 9)) < 0.3
+    for length in range(1, 11):
+        expected = np.zeros(blocked.shape, dtype=np.int64)
+        for y in range(6):
+            for x in range(9 - length + 1):
+                if not blocked[y, x:x + length].any():
+                    expected[y, x:x + length] += 1
+
+        assert (coverage(blocked, length) == expected).all()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_density(seed):
+    rng = random.Random(seed)
+    size = Size(9, 11)
+    ship_counts = {4: 1, 3: 2, 2: 3, 1: 4}
+    heatmap = Heatmap(size, ship_counts)
+    blocked, shot = set(), set()
+
+    for _ in range(60):
+        coord = Coordinate(rng.randrange(size.width), rng.randrange(size.height))
+        action = rng.random()
+        if action < 0.5:
+            heatmap.mark_shot(coord)
+            heatmap.block(coord)
+            shot.add(coord)
+            blocked.add(coord)
+        elif action < 0.8:
+            heatmap.mark_shot(coord)
+            shot.add(coord)
+        elif action < 0.9:
+            heatmap.block(coord)
+            blocked.add(coord)
+        elif ship_counts:
+            length = rng.choice(sorted(ship_counts))
+            heatmap.remove_ship(length)
+            ship_counts[length] -= 1
+            if not ship_counts[length]:
+                del ship_counts[length]
+
+        density = [[heatmap[Coordinate(x, y)] for x in range(size.width)] for y in range(size.height)]
+        assert density == full_density(size, ship_counts, blocked, shot)
+
+    best = heatmap.best()
+    assert best not in shot
+    assert heatmap[best] == max(max(row) for row in full_density(size, ship_counts, blocked, shot))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_density_player(seed):
+    game = Game(None, 12, 12, seed)
+    game.player1 = DensityPlayer()
+    game.player2 = RandomPlayer(player_seed(seed, 1))
+    shots = []
+    shoot = game.shoot
+
+    def record_shot(coord: Coordinate):
+        if game.current_player_index == 0:
+            shots.append(coord)
+        return shoot(coord)
+
+    game.shoot = record_shot
+    game.loop(seed % 2)
+
+    # the hunter never shoots the same cell twice and sinks the whole fleet much faster than the randomer
+    assert len(shots) == len(set(shots))
+    assert game.winner is game.player1
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from battleship.exceptions import InvalidJournalException
+from battleship.grid import Grid
+from battleship.journal import JOURNAL_EXTENSION, JournalWriter, Replayer, first_divergence, replay
+from battleship.player import DensityPlayer, RandomPlayer, player_seed
+from battleship.ships import Ship
+from battleship.simulation import play_game
+from battleship.utils import Coordinate, Rotation
+from tests.conftest import ships_state
+
+
+@pytest.fixture()
+def journal_path(tmp_path):
+    """
+    the path to the journal of the game of the hunter against the randomer and the result of the game
+    """
+    return tmp_path / f'4{JOURNAL_EXTENSION}', play_game(('density', 'random'), 10, 10, 4, journal_dir=str(tmp_path))
+
+
+def test_replay(journal_path):
+    path, game_result = journal_path
+    data = path.read_bytes()
+    result = replay(io.BytesIO(data))
+
+    assert result.winner == game_result.winner
+    assert result.shot_counts[result.winner] == game_result.shots
+    # the game interrupted in the middle of writing of the last shot
+    truncated = Replayer(io.BytesIO(data[:-1]))
+    assert truncated.seed == 4
+    assert truncated.run().winner is None
+
+
+@pytest.mark.parametrize('index, player, diverged', [
+    (0, DensityPlayer, False),
+    (1, DensityPlayer, True),
+    (1, RandomPlayer, False),
+    (0, RandomPlayer, True),
+])
+def test_first_divergence(journal_path, index, player, diverged):
+    with open(journal_path[0], 'rb') as file:
+        replayer = Replayer(file)
+
+    number = first_divergence(replayer, index, player(player_seed(replayer.seed, index)))
+
+    assert (number is not None) == diverged
+
+
+def test_wide_journal():
+    grids = [Grid(70000, 5, {2: 1}) for _ in range(2)]
+    for grid in grids:
+        grid.place_ship(Ship(2, Coordinate(69998, 4), Rotation.HORIZONTAL))
+    file = io.BytesIO()
+    writer = JournalWriter(file)
+    writer.start(grids, 1, seed=2 ** 70)
+    for coord in (Coordinate(0, 0), Coordinate(69998, 4), Coordinate(69999, 4)):
+        writer.shot(coord)
+    file.seek(0)
+    replayer = Replayer(file)
+
+    # the seed does not fit into the header
+    assert replayer.seed is None
+    assert ships_state(replayer.grids[0]) == ships_state(grids[0])
+    assert replayer.run() == (0, (2, 1))
+
+
+@pytest.mark.parametrize('data', [b'', b'BSHJ', b'XXXX' + bytes(20), b'BSHJ\x09' + bytes(20)])
+def test_invalid_journal(data):
+    with pytest.raises(InvalidJournalException):
+        replay(io.BytesIO(data))
@@ -0,0 +1,51 @@
+import pytest
+from click.testing import CliRunner
+
+import battleship.__main__
+
+
+@pytest.mark.parametrize('args, size', [
+    (['12', '15'], (12, 15)),
+    (['play', '12', '15'], (12, 15)),
+    (['7'], (7, 10)),
+    ([], (10, 10)),
+])
+def test_play_by_default(monkeypatch, args, size):
+    calls = []
+    monkeypatch.setattr(battleship.__main__, 'wrapper', lambda *args: calls.append(args))
+
+    result = CliRunner().invoke(battleship.__main__.cli, args, input='Alice\n')
+
+    assert result.exit_code == 0, result.output
+    assert calls == [(battleship.__main__.play, *size, 'Alice')]
+
+
+def test_commands():
+    runner = CliRunner()
+
+    assert 'simulate' in runner.invoke(battleship.__main__.cli, ['--help']).output
+    result = runner.invoke(battleship.__main__.cli, ['replay', '--help'])
+    assert result.exit_code == 0
+    assert 're-simulate journals' in result.output
+
+
+def test_tournament_options(monkeypatch):
+    calls = []
+
+    class Tournament:
+        def __init__(self, *args):
+            calls.append(args)
+
+        @staticmethod
+        def run(*args):
+            return []
+
+    monkeypatch.setattr(battleship.__main__, 'Tournament', Tournament)
+    monkeypatch.setattr(battleship.__main__, 'format_standings', lambda standings: '')
+    runner = CliRunner()
+
+    # the grid size is given like in the simulation
+    assert runner.invoke(battleship.__main__.cli, ['tournament', '12', '15', '--player', 'random',
+                                                   '--player', 'density', '-g', '3']).exit_code == 0
+    assert runner.invoke(battleship.__main__.cli, ['tournament']).exit_code == 0
+    assert calls == [(('random', 'density'), 12, 15, 3, 0), (sorted(battleship.__main__.PLAYER_TYPES), 10, 10, 10, 0)]
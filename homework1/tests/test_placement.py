@@ -0,0 +1,79 @@
+from collections import Counter
+
+import pytest
+
+from battleship.exceptions import CantPlaceShipException
+from battleship.grid import Grid
+from battleship.placement import ShipPlacer
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+from tests.conftest import ships_state
+
+
+def test_seed():
+    grids = [Grid(30, 20) for _ in range(3)]
+    for grid, seed in zip(grids, (7, 7, 8)):
+        ShipPlacer(grid, seed).place_fleet(grid.ship_counts)
+
+    assert ships_state(grids[0]) == ships_state(grids[1])
+    assert ships_state(grids[0]) != ships_state(grids[2])
+
+
+def test_place_fleet():
+    grid = Grid(30, 20)
+    ships = ShipPlacer(grid, 1).place_fleet(grid.ship_counts)
+
+    assert list(grid.ships) == ships
+    assert Counter(ship.size for ship in ships) == Counter(grid.ship_counts)
+    # ships do not overlap and do not cross the border
+    assert grid.intact_cells == sum(ship.size for ship in ships)
+    assert all(0 <= coord.x < 30 and 0 <= coord.y < 20 for ship in ships for coord in ship.coordinates)
+
+
+@pytest.mark.parametrize('max_attempts', [ShipPlacer.MAX_ATTEMPTS, 0])
+def test_dense_grid(monkeypatch, max_attempts):
+    # without attempts every ship is placed by the scan of the whole index
+    monkeypatch.setattr(ShipPlacer, 'MAX_ATTEMPTS', max_attempts)
+    grid = Grid(4, 3, {4: 1, 3: 1, 2: 1, 1: 3})
+    grid.place_ship(Ship(4, Coordinate(0, 1), Rotation.HORIZONTAL))
+    placer = ShipPlacer(grid, 3)
+    placer.place_fleet({3: 1, 2: 1, 1: 3})
+
+    # the grid is full, so the next ship has no room
+    assert grid.intact_cells == 12
+    with pytest.raises(CantPlaceShipException):
+        placer.place(1)
+
+
+def test_no_room():
+    grid = Grid(5, 2, {3: 2})
+    placer = ShipPlacer(grid)
+    placer.place(3)
+    placer.place(3)
+
+    with pytest.raises(CantPlaceShipException):
+        placer.place(3)
+    with pytest.raises(CantPlaceShipException):
+        ShipPlacer(Grid(5, 2, {})).place(6)
+
+
+@pytest.mark.parametrize('max_attempts', [ShipPlacer.MAX_ATTEMPTS, 0])
+def test_uniform(monkeypatch, max_attempts):
+    monkeypatch.setattr(ShipPlacer, 'MAX_ATTEMPTS', max_attempts)
+    # the only free cells are the first row and the first column,
+    # valid heads of the ship of length 2 are (0, 0) and (1, 0) horizontally and (0, 0) and (0, 1) vertically
+    heads = Counter()
+    for seed in range(4000):
+        grid = Grid(3, 3, {})
+        grid.place_ship(Ship(2, Coordinate(1, 1), Rotation.HORIZONTAL))
+        grid.place_ship(Ship(2, Coordinate(1, 2), Rotation.HORIZONTAL))
+        ship = ShipPlacer(grid, seed).place(2)
+        heads[ship.head_coord, ship.rotation] += 1
+
+    assert set(heads) == {
+        (Coordinate(0, 0), Rotation.HORIZONTAL),
+        (Coordinate(1, 0), Rotation.HORIZONTAL),
+        (Coordinate(0, 0), Rotation.VERTICAL),
+        (Coordinate(0, 1), Rotation.VERTICAL),
+    }
+    assert all(800 < count < 1200 for count in heads.values())
@@ -0,0 +1,88 @@
+import random
+
+from battleship.renderer import FieldRenderer, Viewport
+from battleship.utils import Coordinate
+
+
+class FakeScreen:
+    """
+    the curses screen which keeps its text and counts written characters
+    """
+
+    def __init__(self):
+        self.lines: dict[int, str] = {}
+        self.written = 0
+        self._cursor = (0, 0)
+
+    def erase(self):
+        self.lines = {}
+
+    def refresh(self):
+        pass
+
+    def addstr(self, y: int, x: int, text: str):
+        line = self.lines.get(y, '').ljust(x)
+        self.lines[y] = line[:x] + text + line[x + len(text):]
+        self.written += len(text)
+
+    def move(self, y: int, x: int):
+        self._cursor = (y, x)
+
+    def clrtoeol(self):
+        y, x = self._cursor
+        self.lines[y] = self.lines.get(y, '')[:x]
+
+    def text(self) -> list[str]:
+        return [self.lines.get(y, '') for y in range(max(self.lines, default=-1) + 1)]
+
+
+def test_draw_changed_cells():
+    screen = FakeScreen()
+    renderer = FieldRenderer(screen)
+    renderer.draw(['.....', '.##..', 'title'])
+    screen.written = 0
+
+    renderer.draw(['.....', '.@#.x', 'title'])
+
+    assert screen.text() == ['.....', '.@#.x', 'title']
+    # only two changed cells are repainted
+    assert screen.written == 2
+
+    renderer.draw(['..', '.@#.x'])
+    assert screen.text() == ['..', '.@#.x', '']
+
+    renderer.invalidate()
+    screen.written = 0
+    renderer.draw(['..', '.@#.x'])
+    assert screen.written == 7
+
+
+def test_draw_random_frames():
+    rng = random.Random(0)
+    screen = FakeScreen()
+    renderer = FieldRenderer(screen)
+    for _ in range(200):
+        frame = [''.join(rng.choice('.#@x') for _ in range(rng.randrange(8))) for _ in range(rng.randrange(6))]
+        renderer.draw(frame)
+
+        assert screen.text()[:len(frame)] == frame
+        assert not any(screen.text()[len(frame):])
+
+
+def test_viewport():
+    field = [''.join(chr(ord('a') + x + y) for x in range(10)) for y in range(8)]
+    viewport = Viewport()
+    viewport.resize(3, 4)
+
+    viewport.follow(Coordinate(0, 0))
+    assert viewport.crop(field) == [row[:4] for row in field[:3]]
+
+    # the viewport scrolls as little as possible
+    viewport.follow(Coordinate(5, 4))
+    assert (viewport.top, viewport.left) == (2, 2)
+    viewport.follow(Coordinate(3, 3))
+    assert (viewport.top, viewport.left) == (2, 2)
+    assert viewport.crop(field, Coordinate(3, 3), 'H') == [field[2][2:6], field[3][2] + 'H' + field[3][4:6], field[4][2:6]]
+
+    viewport.follow(Coordinate(9, 7))
+    assert viewport.crop(field) == [row[6:] for row in field[5:]]
@@ -0,0 +1,80 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from battleship import savefile
+from battleship.exceptions import InvalidSaveException
+from battleship.grid import Grid
+from tests.conftest import ships_state
+
+
+def assert_same_grids(loaded: Grid, grid: Grid):
+    assert loaded.size == grid.size
+    assert dict(loaded.ship_counts) == dict(grid.ship_counts)
+    assert ships_state(loaded) == ships_state(grid)
+    assert list(loaded.make_field()) == list(grid.make_field())
+    assert (loaded.intact_cells, loaded.afloat_ships) == (grid.intact_cells, grid.afloat_ships)
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_round_trip(grid_fixture, compress):
+    other = Grid(12, 10, {2: 1})
+    buffer = io.BytesIO()
+
+    savefile.dump(buffer, [grid_fixture, other], 3, compress)
+    buffer.seek(0)
+    (grid, loaded_other), index = savefile.load(buffer)
+
+    assert index == 1
+    assert_same_grids(grid, grid_fixture)
+    # custom fleets are kept
+    assert_same_grids(loaded_other, other)
+
+
+def test_legacy_round_trip(grid_fixture):
+    # old saves are pickled lists of both grids and the index
+    legacy = pickle.dumps([grid_fixture, Grid(12, 10), 0])
+
+    grids, index = savefile.load(io.BytesIO(legacy))
+    buffer = io.BytesIO()
+    savefile.dump(buffer, grids, index)
+    buffer.seek(0)
+    (grid, _), index = savefile.load(buffer)
+
+    assert index == 0
+    assert_same_grids(grids[0], grid_fixture)
+    assert_same_grids(grid, grid_fixture)
+
+
+def test_legacy_malicious_save(monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, 'system', calls.append)
+    # the protocol 4 resolves the dotted name through `os` imported by the module
+    payload = (
+        b'\x80\x04\x8c\x15battleship.simulation\x8c\tos.system\x93'
+        b'\x8c\x04true\x85R.'
+    )
+
+    with pytest.raises(InvalidSaveException):
+        savefile.load(io.BytesIO(payload))
+    assert not calls
+    with pytest.raises(InvalidSaveException):
+        savefile.load(io.BytesIO(pickle.dumps([os.getcwd, Grid(12, 10), 0])))
+
+
+@pytest.mark.parametrize(
+    'corrupt',
+    [
+        lambda data: data[: len(data) // 2],
+        lambda data: data[:4] + b'\x09' + data[5:],
+        lambda data: data[:8] + b'\x00' * (len(data) - 8),
+    ],
+)
+def test_invalid_save(grid_fixture, corrupt):
+    buffer = io.BytesIO()
+    savefile.dump(buffer, [grid_fixture, grid_fixture], 0)
+
+    with pytest.raises(InvalidSaveException):
+        savefile.load(io.BytesIO(corrupt(buffer.getvalue())))
@@ -0,0 +1,45 @@
+import asyncio
+
+from battleship import protocol
+from battleship.client import load_test
+from battleship.player import DensityPlayer
+from battleship.server import GameServer
+
+
+async def join(port: int, name: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(protocol.encode({'type': 'join', 'name': name}))
+    await writer.drain()
+    return reader, writer
+
+
+def test_games():
+    async def run():
+        server = await GameServer(10, 10).start('127.0.0.1', 0)
+        async with server:
+            return await load_test('127.0.0.1', server.sockets[0].getsockname()[1], 4, 2, DensityPlayer)
+
+    report = asyncio.run(run())
+
+    assert (report.games, report.errors) == (4, 0)
+    assert report.latencies
+
+
+def test_player_left_lobby():
+    async def run():
+        server = await GameServer(10, 10).start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            _, gone = await join(port, 'gone')
+            # the player leaves before the opponent comes
+            await asyncio.sleep(0.05)
+            gone.close()
+            await asyncio.sleep(0.05)
+            # writers are kept, otherwise connections are closed with them
+            players = [await join(port, 'first'), await join(port, 'second')]
+            return [await asyncio.wait_for(protocol.receive(reader), 5) for reader, _ in players]
+
+    first_start, second_start = asyncio.run(run())
+
+    assert (first_start['type'], first_start['opponent']) == ('start', 'second')
+    assert (second_start['type'], second_start['opponent']) == ('start', 'first')
@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from battleship.exceptions import InvalidCoordinateException
+from battleship.ships import Ship
+from battleship.utils import Coordinate, Rotation
+
+
+def test_hit_mask():
+    ship = Ship(3, Coordinate(2, 1), Rotation.VERTICAL)
+
+    assert not ship.damaged
+    ship.shot(Coordinate(2, 3))
+    # the second shot to the cell changes nothing
+    ship.shot(Coordinate(2, 3))
+    assert (ship.hit_mask, ship.damaged, ship.is_destroyed) == (0b100, True, False)
+    assert ship.damaged_cells == {Coordinate(2, 3)}
+    ship.shot(Coordinate(2, 1))
+    ship.shot(Coordinate(2, 2))
+    assert (ship.hit_mask, ship.is_destroyed) == (0b111, True)
+    assert ship.damaged_cells == ship.coordinates == {Coordinate(2, y) for y in range(1, 4)}
+
+    for coord in (Coordinate(3, 1), Coordinate(2, 0), Coordinate(2, 4)):
+        with pytest.raises(InvalidCoordinateException):
+            ship.shot(coord)
+
+
+def test_is_intersect():
+    ship = Ship(2, Coordinate(1, 1), Rotation.HORIZONTAL, hit_mask=0b110)
+
+    # bits above the size of the ship are dropped
+    assert ship.hit_mask == 0b10
+    assert ship.is_intersect(Coordinate(2, 1))
+    assert not ship.is_intersect(Coordinate(1, 2))
+    assert ship.is_intersect(frozenset((Coordinate(0, 0), Coordinate(1, 1))))
+    assert not ship.is_intersect(frozenset((Coordinate(0, 1), Coordinate(3, 1))))
+
+
+def test_pickle():
+    ship = Ship(4, Coordinate(0, 5), Rotation.HORIZONTAL, hit_mask=0b1010)
+    loaded = pickle.loads(pickle.dumps(ship))
+
+    assert (loaded.size, loaded.head_coord, loaded.rotation, loaded.hit_mask) == (4, Coordinate(0, 5),
+                                                                                   Rotation.HORIZONTAL, 0b1010)
+
+
+def test_legacy_state():
+    # the state of the ship pickled before the bitmask
+    state = {
+        '_size': 3,
+        '_head_coord': Coordinate(4, 4),
+        '_rotation': Rotation.HORIZONTAL,
+        '_damaged_cells': {Coordinate(4, 4), Coordinate(6, 4)},
+    }
+    ship = Ship.__new__(Ship)
+    ship.__setstate__(state)
+
+    assert ship.hit_mask == 0b101
+    assert ship.damaged_cells == {Coordinate(4, 4), Coordinate(6, 4)}
+    assert not ship.is_destroyed
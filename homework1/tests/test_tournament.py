@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from itertools import combinations
+
+import pytest
+
+from battleship.tournament import (JSON_FORMAT, SWISS, EloRatings, GameRecord, ReportWriter, Tournament,
+                                   round_robin_rounds, swiss_pairs)
+
+
+def test_elo_ratings():
+    ratings = EloRatings(['a', 'b', 'c'])
+
+    assert ratings.expected_score('a', 'b') == 0.5
+    ratings.update('a', 'b')
+    assert (ratings['a'], ratings['b'], ratings['c']) == (1508., 1492., 1500.)
+    assert ratings.expected_score('a', 'b') + ratings.expected_score('b', 'a') == pytest.approx(1)
+    # the win against the stronger player gives more
+    ratings.update('b', 'a')
+    assert ratings['b'] - 1492. > 8.
+
+
+@pytest.mark.parametrize('count', [2, 3, 6, 7])
+def test_round_robin_rounds(count):
+    players = [str(i) for i in range(count)]
+    rounds = round_robin_rounds(players)
+    pairs = [frozenset(pair) for pairs in rounds for pair in pairs]
+
+    assert sorted(map(sorted, pairs)) == sorted(map(sorted, combinations(players, 2)))
+    # nobody plays twice in one round
+    assert all(len({player for pair in pairs for player in pair}) == 2 * len(pairs) for pairs in rounds)
+
+
+def test_swiss_pairs():
+    players = ['a', 'b', 'c', 'd', 'e']
+    ratings = EloRatings(players)
+    wins = {'a': 2, 'b': 2, 'c': 1, 'd': 0, 'e': 0}
+
+    assert swiss_pairs(players, wins, ratings, set()) == [('a', 'b'), ('c', 'd')]
+    # players who already met are not paired again if possible
+    assert swiss_pairs(players, wins, ratings, {frozenset('ab')}) == [('a', 'c'), ('b', 'd')]
+
+
+@pytest.mark.parametrize('system', ['round-robin', SWISS])
+def test_tournament(system):
+    records = []
+    standings = Tournament(['random', 'density'], 8, 8, games_per_match=6, seed=3).run(system, jobs=1,
+                                                                                     on_game=records.append)
+    again = Tournament(['random', 'density'], 8, 8, games_per_match=6, seed=3).run(system, jobs=1)
+
+    assert standings == again
+    assert [record.seed for record in records] == list(range(3, 9))
+    assert sum(standing.wins for standing in standings) == sum(standing.losses for standing in standings) == 6
+    assert standings[0].rating >= standings[1].rating
+    assert sum(standing.rating for standing in standings) == pytest.approx(3000)
+
+
+def test_tournament_errors():
+    with pytest.raises(ValueError):
+        Tournament(['random', 'unknown'], 8, 8)
+    with pytest.raises(ValueError):
+        Tournament(['random', 'random'], 8, 8)
+    with pytest.raises(ValueError):
+        Tournament(['random', 'density'], 8, 8).run('knockout')
+
+
+def test_report_writer():
+    record = GameRecord(1, 'random', 'density', 7, 'density', 40, 1492., 1508.)
+    csv_file, json_file = io.StringIO(), io.StringIO()
+    ReportWriter(csv_file)(record)
+    ReportWriter(json_file, JSON_FORMAT)(record)
+
+    assert list(csv.reader(io.StringIO(csv_file.getvalue()))) == [list(GameRecord._fields),
+                                                                  [str(value) for value in record]]
+    assert json.loads(json_file.getvalue()) == record._asdict()
@@ -0,0 +1,114 @@
+"""
+compares the search of a tree with big binary, ignored and `.git` files and the search
+of the same tree which reads every file(the old behaviour, it is `--text --no-ignore` now),
+all searches find the same lines
+
+the corpus is generated from a fixed seed in a temporary directory:
+    src: python-like text files, only they contain the searched string
+    media: big binary files with NUL bytes
+    build: big text files ignored by `.gitignore`
+    .git: the big binary pack
+
+run it from the project folder:
+    python -m benchmarks.binary_benchmark
+"""
+
+import pathlib
+import random
+import tempfile
+import time
+
+from myapp.api import SearchOptions, search
+
+PATTERN = 'def __init__'
+SOURCE_FILES = 2000
+SOURCE_LINES = 200
+MEDIA_FILES = 12
+BUILD_FILES = 12
+BIG_FILE_SIZE = 10 * 1024 * 1024  # 10 MiB
+PACK_SIZE = 120 * 1024 * 1024  # 120 MiB
+REPEATS = 3
+MODES = {
+    'everything read': SearchOptions(text=True, gitignore=False),
+    'binaries skipped': SearchOptions(gitignore=False),
+    'binaries and ignored skipped': SearchOptions(),
+}
+
+
+def source_text(rnd: random.Random) -> str:
+    lines = []
+    while len(lines) < SOURCE_LINES:
+        name = f'name{rnd.randrange(10 ** 6)}'
+        lines += [
+            f'class Class{name}:',
+            f'    def __init__(self, {name}):',
+            f'        self.{name} = {name} * {rnd.randrange(100)}',
+            '',
+        ]
+    return '\n'.join(lines)
+
+
+def binary_data(rnd: random.Random, size: int) -> bytes:
+    # NUL bytes are in every sniffed head, the rest is not compressible
+    block = b'\x00' * 16 + rnd.randbytes(1024 * 1024 - 16)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def build_text(rnd: random.Random, size: int) -> bytes:
+    # ignored text does not contain the searched string, so the output is the same in every mode
+    line = (
+        ' '.join(f'token{rnd.randrange(10 ** 6)}' for _ in range(12)).encode() + b'\n'
+    )
+    return line * (size // len(line))
+
+
+def make_corpus(root: pathlib.Path) -> int:
+    """
+    :return: size of the corpus in bytes
+    :rtype: int
+    """
+    rnd = random.Random(0)
+    (root / '.gitignore').write_text('build/\n')
+    for path in 'src', 'media', 'build', '.git/objects/pack':
+        (root / path).mkdir(parents=True)
+    for i in range(SOURCE_FILES):
+        (root / 'src' / f'module{i}.py').write_text(source_text(rnd))
+    for i in range(MEDIA_FILES):
+        (root / 'media' / f'video{i}.mp4').write_bytes(binary_data(rnd, BIG_FILE_SIZE))
+    for i in range(BUILD_FILES):
+        (root / 'build' / f'output{i}.log').write_bytes(build_text(rnd, BIG_FILE_SIZE))
+    (root / '.git' / 'objects' / 'pack' / 'pack-0.pack').write_bytes(
+        binary_data(rnd, PACK_SIZE)
+    )
+    return sum(path.stat().st_size for path in root.rglob('*') if path.is_file())
+
+
+def bench_mode(root: pathlib.Path, options: SearchOptions) -> tuple[float, int]:
+    """
+    :return: the best seconds of the search of `REPEATS` and count of found lines
+    :rtype: tuple
+    """
+    best = float('inf')
+    found = 0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        found = sum(map(len, search(root, PATTERN, options)))
+        best = min(best, time.perf_counter() - start)
+    return best, found
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+        size = make_corpus(root)
+        print(f'corpus: {size / 1024 ** 2:.0f} MiB, searching {PATTERN!r}')
+        print(f'{"mode":>30} {"found":>7} {"time, s":>9} {"speedup":>9}')
+        baseline = None
+        for name, options in MODES.items():
+            seconds, found = bench_mode(root, options)
+            baseline = baseline or seconds
+            print(f'{name:>30} {found:>7} {seconds:>9.3f} {baseline / seconds:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
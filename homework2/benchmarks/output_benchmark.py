@@ -0,0 +1,104 @@
+"""
+compares the old output of occurrences, `print` of every formatted occurrence
+(see `print_occurrence`), with batches of `OccurrenceWriter` on a log where most lines are found,
+occurrences are written to a file like `mygrep ... > file`, the old and the new text outputs
+are the same
+
+the log is generated from a fixed seed in a temporary directory
+
+run it from the project folder:
+    python -m benchmarks.output_benchmark
+"""
+
+import contextlib
+import os
+import pathlib
+import random
+import tempfile
+import time
+from typing import Callable
+
+from myapp.api import search
+from myapp.occurrence import Occurrence
+from myapp.output import JSON, NULL, TEXT, OccurrenceWriter, print_occurrence
+
+PATTERN = 'ERROR'
+LINES = 500000
+# the share of found lines
+HIT_RATE = 0.9
+REPEATS = 3
+
+
+def make_log(path: pathlib.Path) -> int:
+    """
+    :return: count of found lines
+    :rtype: int
+    """
+    rnd = random.Random(0)
+    hits = 0
+    with path.open('w') as log:
+        for num in range(LINES):
+            level = PATTERN if rnd.random() < HIT_RATE else 'INFO'
+            hits += level == PATTERN
+            log.write(
+                f'2021-03-{num % 28 + 1:02} {level} request {rnd.randrange(10 ** 9)} failed\n'
+            )
+    return hits
+
+
+def write_old(occurrences: list[Occurrence], output: pathlib.Path):
+    with output.open('w') as stream, contextlib.redirect_stdout(stream):
+        for occurrence in occurrences:
+            print_occurrence(occurrence)
+
+
+def write_new(output_format: str) -> Callable[[list[Occurrence], pathlib.Path], None]:
+    def write(occurrences: list[Occurrence], output: pathlib.Path):
+        with output.open('wb') as stream:
+            writer = OccurrenceWriter(stream, output_format, interactive=False)
+            writer.write(occurrences)
+            writer.flush()
+
+    return write
+
+
+def best_seconds(
+    write: Callable[[list[Occurrence], pathlib.Path], None], occurrences, output
+) -> float:
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        write(occurrences, output)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+        hits = make_log(root / 'app.log')
+        cwd = os.getcwd()
+        # paths are written relative to the current directory like in the command line
+        os.chdir(root)
+        try:
+            # the search is the same for both outputs, so only the output is measured
+            occurrences = [
+                occurrence for batch in search(root, PATTERN) for occurrence in batch
+            ]
+            assert len(occurrences) == hits
+            old = best_seconds(write_old, occurrences, root / 'old.txt')
+            print(f'{LINES} lines, {hits} found')
+            print(f'{"output":>8} {"old, s":>8} {"new, s":>8} {"speedup":>9}')
+            for output_format in TEXT, NULL, JSON:
+                new = best_seconds(
+                    write_new(output_format), occurrences, root / f'new.{output_format}'
+                )
+                print(f'{output_format:>8} {old:>8.3f} {new:>8.3f} {old / new:>8.1f}x')
+            old_output = (root / 'old.txt').read_bytes()
+            assert old_output == (root / f'new.{TEXT}').read_bytes()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import mmap
+import re
+from collections import deque
+from typing import Optional, Sequence, Union
+
+Buffer = Union[bytes, mmap.mmap]
+
+# count of possible bytes, every state has so many transitions
+ALPHABET_SIZE = 256
+
+
+class AhoCorasick:
+    """
+    the automaton which finds many patterns in one pass over the buffer
+
+    the trie of patterns is turned into the full transition table,
+    so every byte is one lookup in the flat list
+    """
+
+    def __init__(self, patterns: Sequence[bytes]):
+        """
+        :param patterns: patterns to find, the first one wins if patterns are equal
+        """
+        self._lengths = [len(pattern) for pattern in patterns]
+        # transitions of the state `state` are `delta[state * ALPHABET_SIZE + byte]`,
+        # states in the table are multiplied by `ALPHABET_SIZE` to avoid multiplications
+        children: list[dict[int, int]] = [{}]
+        # the index of the pattern found in the state or -1
+        self._output = [-1]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for byte in pattern:
+                if byte not in children[state]:
+                    children[state][byte] = len(children)
+                    children.append({})
+                    self._output.append(-1)
+                state = children[state][byte]
+            if self._output[state] == -1:
+                self._output[state] = index
+        self._delta = self._build_delta(children)
+
+        first_bytes = b''.join(re.escape(bytes((byte,))) for byte in children[0])
+        # the automaton in the root state skips bytes which do not start any pattern
+        self._first_bytes: Optional[re.Pattern] = (
+            re.compile(b'[' + first_bytes + b']') if first_bytes else None
+        )
+
+    def _build_delta(self, children: list[dict[int, int]]) -> list[int]:
+        """
+        builds the transition table by walking through the trie breadth-first,
+        every state gets transitions of its failure state for missing bytes
+        """
+        delta = [0] * (len(children) * ALPHABET_SIZE)
+        for byte, child in children[0].items():
+            delta[byte] = child * ALPHABET_SIZE
+        queue = deque((child, 0) for child in children[0].values())
+        while queue:
+            state, failure = queue.popleft()
+            # the shorter pattern ending here is found too
+            if self._output[state] == -1:
+                self._output[state] = self._output[failure]
+            base, failure_base = state * ALPHABET_SIZE, failure * ALPHABET_SIZE
+            delta[base : base + ALPHABET_SIZE] = delta[
+                failure_base : failure_base + ALPHABET_SIZE
+            ]
+            for byte, child in children[state].items():
+                delta[base + byte] = child * ALPHABET_SIZE
+                queue.append((child, delta[failure_base + byte] // ALPHABET_SIZE))
+        return delta
+
+    def first_match(
+        self, buffer: Buffer, start: int = 0, end: Optional[int] = None
+    ) -> tuple[int, int]:
+        """
+        finds the pattern which ends first in `buffer[start:end]`,
+        the longest one if several patterns end at the same byte
+        :return: the position of the match and the index of the pattern
+        or (-1, -1) if nothing is found
+        :rtype: `tuple[int, int]`
+        """
+        if end is None:
+            end = len(buffer)
+        if self._output[0] != -1:
+            # the empty pattern is found everywhere
+            return start, self._output[0]
+        if self._first_bytes is None:
+            # there are no patterns
+            return -1, -1
+        delta, output, lengths = self._delta, self._output, self._lengths
+        state, position = 0, start
+        while position < end:
+            if not state:
+                found = self._first_bytes.search(buffer, position, end)
+                if found is None:
+                    break
+                position = found.start()
+            state = delta[state + buffer[position]]
+            position += 1
+            index = output[state // ALPHABET_SIZE]
+            if index != -1:
+                return position - lengths[index], index
+        return -1, -1
+
+    def find(self, buffer: Buffer, start: int = 0) -> int:
+        """
+        like `bytes.find` for any of patterns
+        :return: the position of the first match or -1
+        :rtype: int
+        """
+        return self.first_match(buffer, start)[0]
@@ -0,0 +1,278 @@
+"""
+the library interface of mygrep
+
+occurrences are yielded by batches while files are searched, files are searched
+only a little ahead of the caller, so the caller may stop early without searching
+the whole tree
+"""
+
+import asyncio
+import contextlib
+import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from myapp.context import Context, file_context
+from myapp.filters import PathFilter, make_index_filter
+from myapp.occurrence import FileCount, Occurrence
+from myapp.processes import search_processes
+from myapp.search import (
+    Matcher,
+    PatternsMatcher,
+    RegexMatcher,
+    SubstringMatcher,
+    count_file,
+    search_file,
+)
+from myapp.walker import EntryFilter, ParallelWalker, iter_files
+
+# occurrences of one file are yielded by batches of at most this size
+BATCH_SIZE = 1024
+
+
+class SearchOptions(NamedTuple):
+    """
+    options of the search, they are the same as options of the command line
+    """
+
+    # whether the substring is a regular expression
+    regexp: bool = False
+    # whether to search binary files
+    text: bool = False
+    # globs of names of files to search, files to skip and directories to skip
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    exclude_dir: Sequence[str] = ()
+    # whether to skip files ignored by `.gitignore`
+    gitignore: bool = True
+    # count of threads which list directories and search files
+    jobs: int = 1
+    # count of processes which search files, threads are not used then
+    processes: Optional[int] = None
+    # whether threads yield files in the order of the sequential search
+    ordered: bool = False
+    # count of occurrences of one file at most, 1 finds the first occurrence of every file
+    max_count: Optional[int] = None
+    # counts of context lines yielded before and after every occurrence
+    before: int = 0
+    after: int = 0
+
+
+def make_matcher(patterns: Union[str, Sequence[str]], regexp: bool = False) -> Matcher:
+    """
+    :param patterns: the substring or strings to search
+    :param regexp: whether the substring is a regular expression
+    :return: the matcher of strings to search
+    :rtype: Matcher
+    :raises re.error: if the regular expression is invalid
+    :raises ValueError: if many strings are regular expressions
+    """
+    if not isinstance(patterns, str):
+        if regexp:
+            raise ValueError('regular expressions cannot be searched together')
+        return PatternsMatcher(patterns)
+    if regexp:
+        return RegexMatcher(patterns)
+    return SubstringMatcher(patterns)
+
+
+def resolve_path(path: Union[str, os.PathLike]) -> pathlib.Path:
+    """
+    :return: the absolute path
+    :rtype: `pathlib.Path`
+    :raises FileNotFoundError: if `path` does not exist
+    """
+    if not isinstance(path, pathlib.Path):
+        path = pathlib.Path(path)
+    path = path.absolute()
+    if not path.exists():
+        raise FileNotFoundError(f'{path}: file does not exists')
+    return path
+
+
+def make_entry_filter(path: pathlib.Path, options: SearchOptions) -> PathFilter:
+    """
+    :param path: the absolute path of the searched file or directory
+    :return: the filter of entries of `path` by globs and `.gitignore` of `options`
+    :rtype: PathFilter
+    """
+    return PathFilter(
+        options.include,
+        options.exclude,
+        options.exclude_dir,
+        gitignore=options.gitignore,
+    ).for_root(str(path))
+
+
+def file_walk(search_path: pathlib.Path, entry_filter: Optional[EntryFilter] = None):
+    """
+    walking through `path` recursively and yielding only files
+    :type search_path: `pathlib.Path`
+    :param entry_filter: the filter of entries of `search_path` if it is a directory
+    """
+    if not search_path.is_dir():
+        if search_path.is_file():
+            yield search_path
+        # if symlink or something similar
+        return
+    for file in iter_files(str(search_path), entry_filter):
+        yield pathlib.Path(file)
+
+
+def _batches(
+    occurrences: Iterator[Occurrence], max_count: Optional[int]
+) -> Iterator[list[Occurrence]]:
+    """
+    yielding occurrences of one file by batches,
+    the file is closed when the limit is reached or the generator is closed
+    """
+    with contextlib.closing(occurrences):
+        limited = islice(occurrences, max_count)
+        while batch := list(islice(limited, BATCH_SIZE)):
+            yield batch
+
+
+def _found(
+    file: pathlib.Path, matcher: Matcher, options: SearchOptions
+) -> tuple[Iterator[Occurrence], Optional[int]]:
+    """
+    :return: the generator of occurrences of the file and the limit of its length,
+    context lines are not counted, so the limit is applied to found lines by the generator
+    """
+    if options.before or options.after:
+        context = Context(options.before, options.after)
+        found = file_context(file, matcher, context, options.text, options.max_count)
+        return found, None
+    return search_file(file, matcher, options.text), options.max_count
+
+
+def _search_files(
+    files: Iterator[pathlib.Path], matcher: Matcher, options: SearchOptions
+) -> Iterator[list[Occurrence]]:
+    for file in files:
+        yield from _batches(*_found(file, matcher, options))
+
+
+def _prepare(
+    path: Union[str, os.PathLike],
+    patterns: Union[str, Sequence[str]],
+    options: SearchOptions,
+) -> tuple[pathlib.Path, Matcher, Callable[[pathlib.Path], bool], PathFilter]:
+    """
+    :return: the absolute path, the matcher, the filter of files by the index
+    and the filter of entries
+    """
+    path = resolve_path(path)
+    matcher = make_matcher(patterns, options.regexp)
+    may_match = make_index_filter(path, matcher.literals())
+    return path, matcher, may_match, make_entry_filter(path, options)
+
+
+def search(
+    path: Union[str, os.PathLike],
+    patterns: Union[str, Sequence[str]],
+    options: SearchOptions = SearchOptions(),
+) -> Iterator[list[Occurrence]]:
+    """
+    searches lines containing the substring or any of strings
+    in the file or in files of the directory
+    :param path: the file or the directory to search
+    :param patterns: the substring or strings to search
+    :type options: SearchOptions
+    :return: the generator of batches of occurrences, every batch belongs to one file,
+    the search stops when the generator is closed
+    :raises FileNotFoundError: if `path` does not exist
+    :raises re.error: if the regular expression is invalid
+    :raises ValueError: if context lines are searched by processes
+    """
+    if options.processes is not None and (options.before or options.after):
+        raise ValueError('context lines are not searched by processes')
+    path, matcher, may_match, entry_filter = _prepare(path, patterns, options)
+    files = filter(may_match, file_walk(path, entry_filter))
+    if options.processes is not None:
+        return search_processes(
+            files, matcher, options.processes, options.text, options.max_count
+        )
+    if options.jobs > 1:
+
+        def search_one(file: pathlib.Path) -> list[Occurrence]:
+            if not may_match(file):
+                return []
+            found, limit = _found(file, matcher, options)
+            with contextlib.closing(found):
+                return list(islice(found, limit))
+
+        return ParallelWalker(options.jobs).map(
+            path, search_one, options.ordered, entry_filter
+        )
+    return _search_files(files, matcher, options)
+
+
+def count(
+    path: Union[str, os.PathLike],
+    patterns: Union[str, Sequence[str]],
+    options: SearchOptions = SearchOptions(),
+) -> Iterator[FileCount]:
+    """
+    counts lines found like `search` in every file, lines are neither decoded
+    nor made into occurrences, files without found lines are not yielded,
+    `options.before` and `options.after` are not used
+    :param path: the file or the directory to search
+    :param patterns: the substring or strings to search
+    :type options: SearchOptions
+    :return: the generator of counts of found lines of files
+    :raises FileNotFoundError: if `path` does not exist
+    :raises re.error: if the regular expression is invalid
+    :raises ValueError: if lines are counted by processes
+    """
+    if options.processes is not None:
+        raise ValueError('lines are not counted by processes')
+    path, matcher, may_match, entry_filter = _prepare(path, patterns, options)
+
+    def count_one(file: pathlib.Path) -> Optional[FileCount]:
+        if not may_match(file):
+            return None
+        found = count_file(file, matcher, options.text, options.max_count)
+        return FileCount(file, found) if found else None
+
+    if options.jobs > 1:
+        counts = ParallelWalker(options.jobs).map(
+            path, count_one, options.ordered, entry_filter
+        )
+    else:
+        counts = map(count_one, file_walk(path, entry_filter))
+    return (file_count for file_count in counts if file_count is not None)
+
+
+async def search_async(
+    path: Union[str, os.PathLike],
+    patterns: Union[str, Sequence[str]],
+    options: SearchOptions = SearchOptions(),
+) -> AsyncIterator[list[Occurrence]]:
+    """
+    the asynchronous version of `search`, files are searched in the thread
+    while the event loop runs other tasks, the next batch is searched when it is awaited,
+    the search stops when the iterator is closed or the awaiting task is cancelled
+    """
+    loop = asyncio.get_running_loop()
+    # the generator is resumed by one thread at a time
+    with ThreadPoolExecutor(1, thread_name_prefix='mygrep-search') as executor:
+        batches = await loop.run_in_executor(executor, search, path, patterns, options)
+        try:
+            while (
+                batch := await loop.run_in_executor(executor, next, batches, None)
+            ) is not None:
+                yield batch
+        finally:
+            # the cancelled step is finished before the generator is closed
+            await loop.run_in_executor(executor, batches.close)
@@ -1,22 +1,16 @@
 #!/usr/bin/env python
 import argparse
-import contextlib
 import pathlib
+import re
+import sqlite3
 import sys
-from typing import NamedTuple, Optional, TextIO
+from typing import Optional
 
-# file buffer size
-CHUNK_SIZE = 1024 * 1024 * 10  # 10 MiB
-
-
-class Occurrence(NamedTuple):
-    """
-    this class represents substring occurrence in text
-    """
-
-    line_num: int
-    text: str
-    file_path: pathlib.Path
+from myapp.api import SearchOptions, count, make_entry_filter, search
+from myapp.arguments import non_negative_int, positive_int, read_patterns
+from myapp.follow import follow
+from myapp.index import TrigramIndex
+from myapp.output import JSON, NULL, TEXT, OccurrenceWriter, get_relative_path_view
 
 
 def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
@@ -37,73 +31,147 @@ def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         'substring',
         type=str,
+        nargs='?',
         help='string to search',
     )
+    parser.add_argument(
+        '-f',
+        '--file',
+        dest='patterns',
+        metavar='PATTERNS_FILE',
+        type=read_patterns,
+        help='file with strings to search, one string per line',
+    )
 
-    return parser.parse_args(args)
-
-
-def file_walk(search_path: pathlib.Path):
-    """
-    walking through `path` recursively and yielding only files
-    :type search_path: `pathlib.Path`
-    """
-    if not search_path.is_dir():
-        if search_path.is_file():
-            yield search_path
-        # if symlink or something similar
-        return
-    for file in search_path.iterdir():
-        yield from file_walk(file)
-
-
-def find_occurrences(file_path: pathlib.Path, file: TextIO, substring: str):
-    """
-    yielding occurrence of `substring` in `file` with external information
-    :param file_path: for external information(path relative to current dir)
-    :type file_path: `pathlib.Path`
-    :param file: file where to search occurrences
-    :type file: TextIO
-    :type substring: str
-    """
-    for num, line in enumerate(file, start=1):
-        if substring in line:
-            line = line.strip()
-            yield Occurrence(num, line, file_path)
-
+    parser.add_argument(
+        '-E',
+        '--regexp',
+        action='store_true',
+        help='interpret substring as a regular expression',
+    )
+    parser.add_argument(
+        '-a',
+        '--text',
+        action='store_true',
+        help='search binary files, they are skipped by default',
+    )
+    for option, help_text in (
+        ('--include', 'search only files whose names match GLOB'),
+        ('--exclude', 'skip files whose names match GLOB'),
+        ('--exclude-dir', 'skip directories whose names match GLOB'),
+    ):
+        parser.add_argument(
+            option, metavar='GLOB', action='append', default=[], help=help_text
+        )
+    parser.add_argument(
+        '-m',
+        '--max-count',
+        metavar='NUM',
+        type=positive_int,
+        help='stop searching a file after NUM found lines',
+    )
+    for short, option, help_text in (
+        ('-A', '--after-context', 'print NUM lines after every found line'),
+        ('-B', '--before-context', 'print NUM lines before every found line'),
+        ('-C', '--context', 'print NUM lines before and after every found line'),
+    ):
+        parser.add_argument(
+            short, option, metavar='NUM', type=non_negative_int, help=help_text
+        )
+    parser.add_argument(
+        '-c',
+        '--count',
+        action='store_true',
+        help='print only the count of found lines of every file',
+    )
+    parser.add_argument(
+        '--no-ignore',
+        action='store_true',
+        help='search files ignored by .gitignore and .git directories',
+    )
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument(
+        '--json',
+        dest='output_format',
+        action='store_const',
+        const=JSON,
+        default=TEXT,
+        help='print every occurrence as a JSON object on its own line',
+    )
+    output_format.add_argument(
+        '--null',
+        dest='output_format',
+        action='store_const',
+        const=NULL,
+        help='print the null byte after the path instead of the space',
+    )
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument(
+        '-j',
+        '--jobs',
+        type=positive_int,
+        default=1,
+        help='count of threads which list directories and search files',
+    )
+    backend.add_argument(
+        '--processes',
+        metavar='N',
+        type=positive_int,
+        help='count of processes which search files and ranges of big files, '
+        'occurrences are printed in the same order as with one job',
+    )
+    parser.add_argument(
+        '--ordered',
+        action='store_true',
+        help='print files in the same order as with one job',
+    )
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='after the search wait for lines appended to files and search them',
+    )
+    parser.add_argument(
+        '--build-index',
+        action='store_true',
+        help='build or update the index of the directory instead of searching, '
+        'the index narrows files to search',
+    )
 
-def get_relative_path_view(file_path: pathlib.Path) -> str:
-    """
-    make relative path from current path to `file_path`
-    :param file_path: absolute file path
-    :type file_path: pathlib.Path
-    :return: string that represents relative path to `file_path`
-    :rtype: str
-    """
-    current_path = pathlib.Path().absolute()
-    relative_path = file_path.relative_to(current_path)
-    return str(relative_path)
+    # options may go between the path and the optional substring
+    parsed_args = parser.parse_intermixed_args(args)
+    _check_args(parser, parsed_args)
+    return parsed_args
 
 
-def format_occurrence(occurrence: Occurrence) -> str:
+def _check_args(parser: argparse.ArgumentParser, parsed_args: argparse.Namespace):
     """
-    :param occurrence: occurrence to format
-    :type occurrence: Occurrence
-    :return: formatted occurrence
-    :rtype: str
+    exits with the usage if options do not fit together,
+    context options are resolved into counts of lines
     """
-    return (
-        f'{get_relative_path_view(occurrence.file_path)} '
-        f'line={occurrence.line_num}: {occurrence.text}'
+    if parsed_args.build_index:
+        if parsed_args.substring is not None or parsed_args.patterns is not None:
+            parser.error('--build-index takes only the path')
+        return
+    if (parsed_args.substring is None) == (parsed_args.patterns is None):
+        parser.error('either substring or PATTERNS_FILE must be given')
+    if parsed_args.follow and (parsed_args.jobs > 1 or parsed_args.processes):
+        parser.error('--follow searches files in one thread')
+    # -A and -B take precedence over -C like in grep
+    for option in ('before_context', 'after_context'):
+        if getattr(parsed_args, option) is None:
+            setattr(parsed_args, option, parsed_args.context or 0)
+    counting_or_context = (
+        parsed_args.count or parsed_args.before_context or parsed_args.after_context
     )
-
-
-def print_occurrence(occurrence: Occurrence):
-    """
-    prints the given occurrence to stdout
-    :type occurrence: Occurrence
-    """
-    print(format_occurrence(occurrence))
+    if counting_or_context and (parsed_args.processes or parsed_args.follow):
+        parser.error('--processes and --follow neither count lines nor print context')
+    if parsed_args.regexp:
+        if parsed_args.patterns is not None:
+            parser.error('regular expressions cannot be read from PATTERNS_FILE')
+        try:
+            re.compile(parsed_args.substring)
+        except re.error as e:
+            parser.error(f'invalid regular expression: {e}')
 
 
 def file_does_not_exists_handler(search_path: pathlib.Path):
@@ -119,14 +187,81 @@ def file_does_not_exists_handler(search_path: pathlib.Path):
 def run(parsed_args: argparse.Namespace):
     if not parsed_args.path.exists():
         file_does_not_exists_handler(parsed_args.path)
-    for file in file_walk(parsed_args.path):
-        with contextlib.suppress(UnicodeDecodeError), file.open('r', CHUNK_SIZE) as f:
-            for occurrence in find_occurrences(file, f, parsed_args.substring):
-                print_occurrence(occurrence)
+    options = SearchOptions(
+        regexp=parsed_args.regexp,
+        text=parsed_args.text,
+        include=parsed_args.include,
+        exclude=parsed_args.exclude,
+        exclude_dir=parsed_args.exclude_dir,
+        gitignore=not parsed_args.no_ignore,
+        jobs=parsed_args.jobs,
+        processes=parsed_args.processes,
+        ordered=parsed_args.ordered,
+        max_count=parsed_args.max_count,
+        before=parsed_args.before_context,
+        after=parsed_args.after_context,
+    )
+    patterns = parsed_args.patterns
+    query = (
+        parsed_args.path,
+        parsed_args.substring if patterns is None else patterns,
+        options,
+    )
+    if parsed_args.count:
+        writer = OccurrenceWriter(sys.stdout.buffer, parsed_args.output_format)
+        try:
+            writer.write_counts(count(*query))
+        finally:
+            writer.flush()
+        return
+    batches = (follow if parsed_args.follow else search)(*query)
+    # followed lines are printed as soon as they are found
+    writer = OccurrenceWriter(
+        sys.stdout.buffer,
+        parsed_args.output_format,
+        parsed_args.follow or None,
+        context=bool(options.before or options.after),
+    )
+    try:
+        for occurrences in batches:
+            writer.write(occurrences)
+    except KeyboardInterrupt:
+        # it is the way to stop following
+        if not parsed_args.follow:
+            raise
+    finally:
+        writer.flush()
+
+
+def run_index(parsed_args: argparse.Namespace):
+    if not parsed_args.path.is_dir():
+        print(f'{get_relative_path_view(parsed_args.path)}: is not a directory')
+        sys.exit(1)
+    # files are indexed only if the search walks them
+    options = SearchOptions(
+        include=parsed_args.include,
+        exclude=parsed_args.exclude,
+        exclude_dir=parsed_args.exclude_dir,
+        gitignore=not parsed_args.no_ignore,
+    )
+    try:
+        with TrigramIndex(parsed_args.path) as index:
+            stats = index.update(make_entry_filter(parsed_args.path, options))
+    except sqlite3.Error as e:
+        print(f'cannot update the index: {e}')
+        sys.exit(1)
+    print(
+        f'files: {stats.added} added, {stats.updated} updated, '
+        f'{stats.removed} removed, {stats.unchanged} unchanged'
+    )
 
 
 def main():
-    run(parse_args(sys.argv[1:]))
+    parsed_args = parse_args()
+    if parsed_args.build_index:
+        run_index(parsed_args)
+    else:
+        run(parsed_args)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,40 @@
+"""
+types of values of command line options
+"""
+
+import argparse
+import pathlib
+
+from myapp.blocks import ENCODING
+
+
+def positive_int(value: str) -> int:
+    """
+    :raises argparse.ArgumentTypeError: if `value` is not a positive integer
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """
+    :raises argparse.ArgumentTypeError: if `value` is not a non-negative integer
+    """
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'{value} is not a non-negative integer')
+    return number
+
+
+def read_patterns(value: str) -> list[str]:
+    """
+    :return: lines of the file
+    :rtype: `list[str]`
+    :raises argparse.ArgumentTypeError: if the file cannot be read
+    """
+    try:
+        return pathlib.Path(value).read_text(encoding=ENCODING).splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        raise argparse.ArgumentTypeError(f'cannot read patterns: {e}') from e
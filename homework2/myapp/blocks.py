@@ -0,0 +1,163 @@
+"""
+files are read by blocks of whole lines
+
+the plain file is mapped into memory and only one block is copied out of it at a time,
+the compressed file is decompressed by chunks which are joined into blocks
+"""
+
+import contextlib
+import mmap
+import pathlib
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Union
+
+from myapp import compressed
+from myapp.filters import SNIFF_SIZE, is_binary
+
+Buffer = Union[bytes, mmap.mmap]
+
+NEWLINE = b'\n'
+# the buffer is searched by blocks of whole lines of about this size,
+# so only one block is copied out of the mapped file at a time
+BLOCK_SIZE = 1024 * 1024  # 1 MiB
+# encoding of patterns and lines, lines which are not valid are decoded with replacements
+ENCODING = 'utf-8'
+
+
+@contextlib.contextmanager
+def map_file(file_path: pathlib.Path) -> Iterator[Buffer]:
+    """
+    maps the file into memory for reading
+    :param file_path: path to the file
+    :type file_path: `pathlib.Path`
+    :return: the context manager of the mapped file
+    """
+    with file_path.open('rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            yield b''
+            return
+        with buffer:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                buffer.madvise(mmap.MADV_SEQUENTIAL)
+            yield buffer
+
+
+def iter_blocks(buffer: Buffer, start: int = 0, stop: int = -1) -> Iterator[bytes]:
+    """
+    yielding blocks of whole lines of about `BLOCK_SIZE` bytes of `buffer[start:stop]`,
+    every block except the last one ends with the newline
+    """
+    stop = len(buffer) if stop == -1 else stop
+    while start < stop:
+        end = buffer.find(NEWLINE, min(stop, start + BLOCK_SIZE) - 1, stop)
+        end = stop if end == -1 else end + 1
+        yield buffer[start:end]
+        start = end
+
+
+def join_blocks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    yielding blocks of whole lines like `iter_blocks`, blocks are made of chunks of the stream
+    """
+    rest = bytearray()
+    for chunk in chunks:
+        rest += chunk
+        # the line longer than the block is joined with next chunks
+        end = rest.rfind(NEWLINE, len(rest) - len(chunk)) + 1
+        if end and len(rest) >= BLOCK_SIZE:
+            yield bytes(rest[:end])
+            del rest[:end]
+    if rest:
+        yield bytes(rest)
+
+
+def find_lines(
+    buffer: bytes, find: Callable[[int], int], line_num: int = 1
+) -> Iterator[tuple[int, int, int]]:
+    """
+    finds lines containing matches, newlines are counted only between found lines
+    :param buffer: lines to search
+    :param find: returns the position of the first match after the given position
+    or -1 like `bytes.find`
+    :param line_num: number of the first line of the buffer
+    :return: iterator of the line number, the start and the end of every found line
+    """
+    # `counted` is the start of the line with the number `line_num`
+    counted = 0
+    position = find(0)
+    # the empty pattern is found at the end of the buffer, but there is no line there
+    while position != -1 and position < len(buffer):
+        start = buffer.rfind(NEWLINE, counted, position) + 1
+        if start:
+            line_num += buffer.count(NEWLINE, counted, start)
+        else:
+            start = counted
+        end = buffer.find(NEWLINE, position)
+        if end == -1:
+            end = len(buffer)
+        yield line_num, start, end
+        line_num, counted = line_num + 1, end + 1
+        # every line is found once
+        position = find(counted)
+
+
+def count_lines(buffer: bytes, find: Callable[[int], int]) -> int:
+    """
+    :param find: returns the position of the first match like in `find_lines`
+    :return: count of lines containing matches, lines are neither split nor decoded
+    """
+    count = 0
+    position = find(0)
+    while position != -1 and position < len(buffer):
+        count += 1
+        end = buffer.find(NEWLINE, position)
+        if end == -1:
+            break
+        position = find(end + 1)
+    return count
+
+
+def split_lines(block: bytes) -> list[bytes]:
+    """
+    :return: lines of the block without newlines
+    :rtype: `list[bytes]`
+    """
+    lines = block.split(NEWLINE)
+    if not lines[-1]:
+        # the block ends with the newline, there is no line after it
+        lines.pop()
+    return lines
+
+
+def decode_line(line: bytes) -> str:
+    return line.decode(ENCODING, 'replace').strip()
+
+
+@contextlib.contextmanager
+def file_blocks(
+    file_path: pathlib.Path, text: bool = False
+) -> Iterator[Iterator[bytes]]:
+    """
+    maps the file into memory, compressed files are decompressed while blocks are taken
+    :type file_path: `pathlib.Path`
+    :param text: whether to search binary files, otherwise they are skipped after first bytes
+    :return: the context manager of blocks of whole lines of the file
+    """
+    # the context manager closes this generator, so the file is unmapped
+    with map_file(file_path) as buffer:  # pylint: disable=W0135
+        compression = compressed.detect(buffer[: compressed.MAGIC_SIZE])
+        if compression is None:
+            binary = not text and is_binary(buffer[:SNIFF_SIZE])
+            yield iter(()) if binary else iter_blocks(buffer)
+            return
+        chunks = compressed.read_ahead(compressed.decompress(buffer, compression))
+        # decompression in the pool is finished before the file is unmapped
+        with contextlib.closing(chunks):
+            blocks = join_blocks(chunks)
+            # archives of binary files like `.tar.gz` are skipped too
+            first = next(blocks, b'')
+            binary = not text and is_binary(first)
+            yield iter(()) if binary else chain((first,), blocks)
@@ -0,0 +1,168 @@
+"""
+compressed files are detected by their magic bytes and decompressed while they are searched
+
+`.zst` files are decompressed only if the `zstandard` package is installed
+(`pip install mygrep[zstd]`), otherwise they are searched as they are
+"""
+
+import bz2
+import lzma
+import mmap
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Union
+
+try:
+    import zstandard  # pylint: disable=E0401
+except ImportError:
+    zstandard = None
+
+Buffer = Union[bytes, mmap.mmap]
+
+# compressed bytes are decompressed by chunks of this size,
+# logs are expanded about ten times, so decompressed chunks are about `BLOCK_SIZE`
+CHUNK_SIZE = 128 * 1024  # 128 KiB
+
+# errors of damaged archives
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    OSError,
+    EOFError,
+    zlib.error,
+    lzma.LZMAError,
+)
+
+
+# decompressed pieces are not longer, so a chunk which expands enormously
+# is yielded by parts rather than at once
+MAX_OUTPUT_SIZE = 1024 * 1024  # 1 MiB
+
+
+class _ZlibDecompressor:
+    """
+    the zlib decompressor with the interface of `lzma.LZMADecompressor`,
+    input left after `max_length` bytes of output is kept inside
+    """
+
+    def __init__(self, wbits: int):
+        self._decompressor = zlib.decompressobj(wbits)
+        self.needs_input = True
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self) -> bytes:
+        return self._decompressor.unused_data
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        tail = self._decompressor.unconsumed_tail
+        output = self._decompressor.decompress(tail + data, max_length)
+        # zlib may keep some output even if all input is taken
+        self.needs_input = (
+            not self._decompressor.unconsumed_tail and len(output) < max_length
+        )
+        return output
+
+
+def _decompress_streams(
+    decompressor_type: Callable[[], Any], buffer: Buffer
+) -> Iterator[bytes]:
+    """
+    :param decompressor_type: creates the decompressor of one stream,
+    it has `decompress(data, max_length)`, `eof`, `unused_data` and `needs_input`
+    """
+    decompressor = decompressor_type()
+    for start in range(0, len(buffer), CHUNK_SIZE):
+        data = buffer[start : start + CHUNK_SIZE]
+        # the decompressor which does not need input has more output
+        while data or not decompressor.needs_input:
+            yield decompressor.decompress(data, MAX_OUTPUT_SIZE)
+            data = b''
+            if decompressor.eof:
+                # the next stream starts right after the end of the previous one
+                data = decompressor.unused_data
+                decompressor = decompressor_type()
+
+
+def _decompress_zstd(buffer: Buffer) -> Iterator[bytes]:
+    # the decompressor object of zstandard cannot limit its output, the reader can
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        buffer, read_size=CHUNK_SIZE, read_across_frames=True
+    )
+    while chunk := reader.read(MAX_OUTPUT_SIZE):
+        yield chunk
+
+
+class Format(NamedTuple):
+    """
+    the compression format
+    """
+
+    name: str
+    magic: bytes
+    # yielding decompressed pieces of the whole buffer of at most `MAX_OUTPUT_SIZE` bytes
+    decompress: Callable[[Buffer], Iterator[bytes]]
+
+
+FORMATS = [
+    # zlib with the gzip header and the trailer
+    Format(
+        'gzip',
+        b'\x1f\x8b',
+        partial(_decompress_streams, lambda: _ZlibDecompressor(16 + zlib.MAX_WBITS)),
+    ),
+    Format('bzip2', b'BZh', partial(_decompress_streams, bz2.BZ2Decompressor)),
+    Format('xz', b'\xfd7zXZ\x00', partial(_decompress_streams, lzma.LZMADecompressor)),
+]
+if zstandard is not None:
+    FORMATS.append(Format('zstd', b'\x28\xb5\x2f\xfd', _decompress_zstd))
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+# count of bytes enough to detect any format
+MAGIC_SIZE = max(len(compression.magic) for compression in FORMATS)
+
+# decompression releases the GIL, so the next chunk of the file is decompressed
+# in this pool while the current one is searched
+_pool = ThreadPoolExecutor(thread_name_prefix='mygrep-decompress')
+
+
+def detect(head: bytes) -> Optional[Format]:
+    """
+    :param head: first bytes of the file, at least `MAGIC_SIZE` bytes if the file is longer
+    :return: the format of the compressed file or None if the file is not compressed
+    :rtype: Format
+    """
+    for compression in FORMATS:
+        if head.startswith(compression.magic):
+            return compression
+    return None
+
+
+def decompress(buffer: Buffer, compression: Format) -> Iterator[bytes]:
+    """
+    yielding decompressed chunks of the buffer,
+    concatenated streams are decompressed one after another like `gzip -d` does
+    """
+    try:
+        yield from compression.decompress(buffer)
+    except DECOMPRESSION_ERRORS:
+        # the damaged archive is searched up to the damage, like the truncated one
+        pass
+
+
+def read_ahead(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    yielding the same chunks, the next chunk is made in the pool
+    while the consumer processes the current one
+    """
+    future: Future = _pool.submit(next, chunks, None)
+    try:
+        while (chunk := future.result()) is not None:
+            future = _pool.submit(next, chunks, None)
+            yield chunk
+    finally:
+        # the consumer stopped early, the buffer of chunks must outlive the last step
+        if not future.cancel():
+            future.exception()
@@ -0,0 +1,155 @@
+"""
+context lines around found lines like `grep -B` and `grep -A`
+
+the file is read once, lines before the found line are taken from its block
+or from the ring of last lines of previous blocks, lines after it are taken
+from the same block and next ones, blocks without found lines and
+without pending context are neither split nor decoded
+"""
+
+import collections
+import pathlib
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from myapp.blocks import NEWLINE, decode_line, file_blocks, split_lines
+from myapp.occurrence import Occurrence
+from myapp.search import Matcher
+
+
+class Context(NamedTuple):
+    """
+    counts of lines printed around every found line
+    """
+
+    before: int = 0
+    after: int = 0
+
+
+def _last_lines(block: bytes, count: int) -> list[bytes]:
+    """
+    :return: at most `count` last lines of the block without newlines,
+    the block is not split
+    :rtype: `list[bytes]`
+    """
+    lines: list[bytes] = []
+    end = len(block) - 1 if block.endswith(NEWLINE) else len(block)
+    while len(lines) < count and end >= 0:
+        start = block.rfind(NEWLINE, 0, end) + 1
+        lines.append(block[start:end])
+        end = start - 1
+    lines.reverse()
+    return lines
+
+
+def _keep_last(
+    ring: collections.deque[tuple[int, bytes]], lines: list[bytes], last: int
+):
+    """
+    puts last lines of the block to the ring
+    :param last: the number of the last line
+    """
+    ring.extend(zip(range(last - len(lines) + 1, last + 1), lines))
+
+
+class _Lines:
+    """
+    lines of the block with matches and the ring of lines before it
+    """
+
+    def __init__(
+        self,
+        file_path: pathlib.Path,
+        lines: list[bytes],
+        line_num: int,
+        ring: Iterable[tuple[int, bytes]],
+    ):
+        self._file_path = file_path
+        self._lines = lines
+        self._line_num = line_num
+        self._ring = dict(ring)
+
+    def context(self, start: int, stop: int) -> Iterator[Occurrence]:
+        """
+        yielding context lines with numbers from `start` up to `stop`
+        """
+        for num in range(start, stop):
+            if num >= self._line_num:
+                line = self._lines[num - self._line_num]
+            else:
+                line = self._ring[num]
+            yield Occurrence(num, decode_line(line), self._file_path, context=True)
+
+
+def search_context(
+    file_path: pathlib.Path,
+    matcher: Matcher,
+    blocks: Iterable[bytes],
+    context: Context,
+    max_count: Optional[int] = None,
+) -> Iterator[Occurrence]:
+    """
+    yielding occurrences found by `matcher` and context lines around them in the order
+    of lines, every line is yielded once, context lines are occurrences with `context` set
+    :param blocks: blocks of whole lines of the file
+    :type context: Context
+    :param max_count: count of found lines at most, lines after the last one are yielded too
+    """
+    # numbers and lines of the end of previous blocks
+    ring: collections.deque[tuple[int, bytes]] = collections.deque(
+        maxlen=context.before
+    )
+    # the number of the last yielded line and of the last line of the context after it
+    printed = after_until = 0
+    remaining = max_count
+    line_num = 1
+    for block in blocks:
+        if remaining == 0 and after_until < line_num:
+            return
+        count = block.count(NEWLINE) + (not block.endswith(NEWLINE))
+        last = line_num + count - 1
+        found = []
+        if remaining != 0:
+            found = list(
+                islice(matcher.search_block(file_path, block, line_num), remaining)
+            )
+        if not found and after_until < line_num:
+            # the block is not split, only its last lines are kept
+            _keep_last(ring, _last_lines(block, context.before), last)
+            line_num += count
+            continue
+        split = split_lines(block)
+        lines = _Lines(file_path, split, line_num, ring)
+        for occurrence in found:
+            num = occurrence.line_num
+            # lines after the previous found line, then lines before this one
+            after_end = min(after_until, num - 1)
+            yield from lines.context(printed + 1, after_end + 1)
+            yield from lines.context(
+                max(printed + 1, after_end + 1, num - context.before), num
+            )
+            yield occurrence
+            printed, after_until = num, num + context.after
+        yield from lines.context(printed + 1, min(after_until, last) + 1)
+        printed = max(printed, min(after_until, last))
+        if remaining is not None:
+            remaining -= len(found)
+        if context.before:
+            _keep_last(ring, split[-context.before :], last)
+        line_num += count
+
+
+def file_context(
+    file_path: pathlib.Path,
+    matcher: Matcher,
+    context: Context,
+    text: bool = False,
+    max_count: Optional[int] = None,
+) -> Iterator[Occurrence]:
+    """
+    yielding occurrences and context lines of the file like `search_context`
+    :param text: whether to search binary files
+    """
+    # the file is unmapped when the generator is exhausted or closed
+    with file_blocks(file_path, text) as blocks:  # pylint: disable=W0135
+        yield from search_context(file_path, matcher, blocks, context, max_count)
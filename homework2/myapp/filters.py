@@ -0,0 +1,260 @@
+"""
+filters which decide what is read before it is searched
+
+files and directories are filtered while directories are listed by globs and `.gitignore`,
+files which may match are narrowed by the index, and binary files are recognized
+by their first bytes
+"""
+
+import copy
+import fnmatch
+import os
+import pathlib
+import re
+import sqlite3
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from myapp.index import TrigramIndex, find_index, is_index_file
+
+GITIGNORE_NAME = '.gitignore'
+# the directory of the repository is never searched if `.gitignore` is used
+GIT_DIR_NAME = '.git'
+# so many first bytes are checked to tell whether the file is binary
+SNIFF_SIZE = 8 * 1024  # 8 KiB
+
+
+def is_binary(head: bytes) -> bool:
+    """
+    :param head: first bytes of the file, `SNIFF_SIZE` bytes are checked
+    :return: whether the file is binary, text files never contain the null byte like `grep` assumes
+    """
+    return b'\x00' in head[:SNIFF_SIZE]
+
+
+class _Rule(NamedTuple):
+    """
+    the pattern of `.gitignore`
+    """
+
+    # matches paths relative to the directory of `.gitignore` with `/` as separator
+    regex: re.Pattern
+    # whether the pattern starts with `!` and includes matched paths again
+    negate: bool
+    # whether the pattern ends with `/` and matches only directories
+    dir_only: bool
+
+
+class _Gitignore(NamedTuple):
+    """
+    rules of `.gitignore` of one directory
+    """
+
+    # the path of the directory with the trailing separator
+    prefix: str
+    rules: list[_Rule]
+
+
+def _translate_segment(segment: str) -> str:
+    """
+    :return: the regular expression of the part of the pattern between slashes
+    """
+    parts = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        i += 1
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '\\' and i < len(segment):
+            parts.append(re.escape(segment[i]))
+            i += 1
+        elif char == '[' and segment.find(']', i + 1) != -1:
+            # `]` right after `[` is a character of the class
+            end = segment.find(']', i + 1)
+            body = segment[i:end].replace('\\', '\\\\')
+            parts.append(f'[^{body[1:]}]' if body.startswith('!') else f'[{body}]')
+            i = end + 1
+        else:
+            parts.append(re.escape(char))
+    return ''.join(parts)
+
+
+def parse_gitignore_line(line: str) -> Optional[_Rule]:
+    """
+    :param line: the line of `.gitignore`
+    :return: the rule or None if the line is empty or is a comment
+    :rtype: _Rule
+    """
+    if not line.endswith('\\ '):
+        line = line.rstrip(' ')
+    if not line or line.startswith('#'):
+        return None
+    negate = line.startswith('!')
+    if negate or line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    # the pattern with a slash at the beginning or in the middle is relative to the directory,
+    # otherwise it matches the name at any level
+    anchored = '/' in line
+    segments = line.lstrip('/').split('/')
+    if not segments[-1]:
+        return None
+    regex = '' if anchored else '(?:.*/)?'
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            # everything inside at the end, any count of directories elsewhere
+            regex += '.*' if last else '(?:.*/)?'
+        else:
+            regex += _translate_segment(segment) + ('' if last else '/')
+    return _Rule(re.compile(regex, re.DOTALL), negate, dir_only)
+
+
+def _read_gitignore(directory: str) -> list[_Rule]:
+    try:
+        with open(
+            os.path.join(directory, GITIGNORE_NAME), encoding='utf-8', errors='replace'
+        ) as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return []
+    return [rule for rule in map(parse_gitignore_line, lines) if rule is not None]
+
+
+def _compile_globs(globs: Sequence[str]) -> Optional[re.Pattern]:
+    if not globs:
+        return None
+    return re.compile('|'.join(fnmatch.translate(glob) for glob in globs))
+
+
+class PathFilter:
+    """
+    excludes files and directories while they are listed,
+    so excluded files are never read and excluded directories are never listed
+
+    the filter of the directory knows `.gitignore` files of the directory and its parents
+    """
+
+    def __init__(
+        self,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        exclude_dir: Sequence[str] = (),
+        gitignore: bool = True,
+    ):
+        """
+        globs are matched with names of files and directories like in `grep`
+        :param include: globs of files to search, all files are searched if it is empty
+        :param exclude: globs of files to skip
+        :param exclude_dir: globs of directories to skip
+        :param gitignore: whether to skip files ignored by `.gitignore` and `.git` directories
+        """
+        self._include = _compile_globs(include)
+        self._exclude = _compile_globs(exclude)
+        self._exclude_dir = _compile_globs(exclude_dir)
+        self._gitignore = gitignore
+        # rules of directories from the farthest to the nearest one
+        self._levels: tuple[_Gitignore, ...] = ()
+
+    def for_directory(self, path: str) -> 'PathFilter':
+        """
+        :param path: the listed directory which is not excluded
+        :return: the filter of entries of the directory
+        :rtype: PathFilter
+        """
+        rules = _read_gitignore(path) if self._gitignore else []
+        if not rules:
+            return self
+        child = copy.copy(self)
+        level = _Gitignore(os.path.join(path, ''), rules)
+        child._levels = (*self._levels, level)  # pylint: disable=W0212
+        return child
+
+    def for_root(self, root: str) -> 'PathFilter':
+        """
+        :param root: the absolute path of the searched directory
+        :return: the filter of entries of the directory,
+        it knows `.gitignore` files of parents up to the root of the repository
+        :rtype: PathFilter
+        """
+        path = pathlib.Path(root)
+        directories = [path]
+        if self._gitignore and not (path / GIT_DIR_NAME).exists():
+            for directory in path.parents:
+                directories.append(directory)
+                if (directory / GIT_DIR_NAME).exists():
+                    break
+            else:
+                # the directory is not in the repository
+                directories = [path]
+        path_filter = self
+        for directory in reversed(directories):
+            path_filter = path_filter.for_directory(str(directory))
+        return path_filter
+
+    def excluded(self, entry: os.DirEntry) -> bool:
+        """
+        :param entry: the entry of the directory of the filter
+        :return: whether to skip the file or the directory
+        """
+        is_dir = entry.is_dir()
+        if is_dir:
+            if self._gitignore and entry.name == GIT_DIR_NAME:
+                return True
+            if self._exclude_dir is not None and self._exclude_dir.match(entry.name):
+                return True
+        else:
+            if self._include is not None and not self._include.match(entry.name):
+                return True
+            if self._exclude is not None and self._exclude.match(entry.name):
+                return True
+        # the nearest `.gitignore` and the last matching rule win
+        for level in reversed(self._levels):
+            relative = entry.path[len(level.prefix) :].replace(os.sep, '/')
+            for rule in reversed(level.rules):
+                if (is_dir or not rule.dir_only) and rule.regex.fullmatch(relative):
+                    return not rule.negate
+        return False
+
+
+def make_index_filter(
+    search_path: pathlib.Path, literals: Sequence[bytes]
+) -> Callable[[pathlib.Path], bool]:
+    """
+    :param literals: byte strings, one of which every found line contains
+    :return: the function which tells whether the file may contain occurrences,
+    files are narrowed by the index of the directory if it exists,
+    new files and files changed since the update of the index are searched
+    """
+    root = find_index(search_path)
+    if root is None:
+        return lambda file_path: True
+    try:
+        with TrigramIndex(root, readonly=True) as index:
+            files, candidates = index.files(), index.candidates(literals)
+    except sqlite3.DatabaseError:
+        # the broken index is not used, all files are searched
+        return lambda file_path: True
+
+    # searched files are in the indexed directory
+    prefix = os.path.join(root, '')
+
+    def may_match(file_path: pathlib.Path) -> bool:
+        name = str(file_path)[len(prefix) :]
+        file = files.get(name)
+        if is_index_file(name):
+            return False
+        if file is None or not file.indexed or candidates is None:
+            return True
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return True
+        if (stat.st_mtime_ns, stat.st_size) != (file.mtime_ns, file.size):
+            return True
+        return file.id in candidates
+
+    return may_match
@@ -0,0 +1,226 @@
+"""
+following of growing files like `tail -f`
+
+after the first search only bytes appended to files are searched, every file keeps
+the offset of its first line which is not searched yet and its number,
+changes are watched with inotify on Linux, otherwise files are polled
+"""
+
+import contextlib
+import os
+import pathlib
+from functools import partial
+from itertools import islice
+from typing import Iterator, Optional, Sequence, Union
+
+from myapp import compressed
+from myapp.api import (
+    SearchOptions,
+    file_walk,
+    make_entry_filter,
+    make_matcher,
+    resolve_path,
+)
+from myapp.blocks import BLOCK_SIZE, NEWLINE, join_blocks
+from myapp.filters import SNIFF_SIZE, is_binary
+from myapp.occurrence import Occurrence
+from myapp.search import Matcher, search_file
+from myapp.walker import EntryFilter
+from myapp.watch import Poller, make_watcher
+
+
+class _FileState:
+    """
+    the followed file
+    """
+
+    __slots__ = ('inode', 'size', 'offset', 'line_num', 'remaining', 'skipped')
+
+    def __init__(self, inode: tuple[int, int], max_count: Optional[int]):
+        # renamed files keep their state
+        self.inode = inode
+        # the size of the file when it was searched last time
+        self.size = -1
+        # the start and the number of the first line which is not searched,
+        # the last line is searched when its newline is written
+        self.offset = 0
+        self.line_num = 1
+        self.remaining = max_count
+        # binary and compressed files are not followed
+        self.skipped = False
+
+
+class _DirectoryRecorder:
+    """
+    the filter of entries, which records directories walked through
+    """
+
+    def __init__(self, entry_filter: Optional[EntryFilter], directories: list[str]):
+        self._filter = entry_filter
+        self.directories = directories
+
+    def for_directory(self, path: str) -> '_DirectoryRecorder':
+        self.directories.append(path)
+        child = self._filter and self._filter.for_directory(path)
+        return _DirectoryRecorder(child, self.directories)
+
+    def excluded(self, entry: os.DirEntry) -> bool:
+        return self._filter is not None and self._filter.excluded(entry)
+
+
+class _Follower:
+    """
+    the state of one following of files
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        matcher: Matcher,
+        entry_filter: EntryFilter,
+        options: SearchOptions,
+    ):
+        self._path = path
+        self._matcher = matcher
+        self._entry_filter = entry_filter
+        self._options = options
+        self._files: dict[str, _FileState] = {}
+        self._watcher = make_watcher()
+
+    def run(self) -> Iterator[list[Occurrence]]:
+        try:
+            changed: Optional[set[str]] = None
+            while True:
+                yield from self._check(changed)
+                try:
+                    changed = self._watcher.wait()
+                except OSError:
+                    changed = None
+                    self._watcher.close()
+                    self._watcher = Poller()
+        finally:
+            self._watcher.close()
+
+    def _check(self, changed: Optional[set[str]]) -> Iterator[list[Occurrence]]:
+        """
+        yielding occurrences in lines appended to changed files
+        :param changed: paths of changed files, the tree is listed again if it is None
+        """
+        if changed is None:
+            self._list_tree()
+        # the tree is searched in the order of the walk
+        for path in list(self._files) if changed is None else sorted(changed):
+            state = self._files.get(path)
+            if state is None:
+                continue
+            try:
+                stat = os.stat(path)
+                inode = (stat.st_dev, stat.st_ino)
+                if inode != state.inode or stat.st_size < state.offset:
+                    # the file is replaced or truncated, it is searched from the start
+                    state = _FileState(inode, self._options.max_count)
+                    self._files[path] = state
+                if stat.st_size == state.size or state.skipped or state.remaining == 0:
+                    continue
+                state.size = stat.st_size
+                occurrences = self._search(path, state)
+            except OSError:
+                # the file is removed, it is forgotten when the tree is listed again
+                continue
+            if occurrences:
+                yield occurrences
+
+    def _list_tree(self):
+        root = self._path if self._path.is_dir() else self._path.parent
+        recorder = _DirectoryRecorder(self._entry_filter, [str(root)])
+        files = {}
+        moved = {state.inode: state for state in self._files.values()}
+        for file in file_walk(self._path, recorder):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            inode = (stat.st_dev, stat.st_ino)
+            files[str(file)] = moved.get(inode) or _FileState(
+                inode, self._options.max_count
+            )
+        try:
+            # directories are watched before their files are searched,
+            # so lines appended after the search are not missed
+            for directory in recorder.directories:
+                self._watcher.watch(directory)
+        except OSError:
+            self._watcher.close()
+            self._watcher = Poller()
+        self._files = files
+
+    def _search(self, path: str, state: _FileState) -> list[Occurrence]:
+        file_path = pathlib.Path(path)
+        with open(path, 'rb') as file:
+            if not state.offset:
+                head = file.read(max(SNIFF_SIZE, compressed.MAGIC_SIZE))
+                if compressed.detect(head) is not None:
+                    # compressed files are not appended, they are searched once
+                    state.skipped = True
+                    with contextlib.closing(
+                        search_file(file_path, self._matcher, self._options.text)
+                    ) as found:
+                        return list(islice(found, state.remaining))
+                if not self._options.text and is_binary(head):
+                    state.skipped = True
+                    return []
+            file.seek(state.offset)
+            line_num = state.line_num
+            blocks = self._whole_lines(
+                join_blocks(iter(partial(file.read, BLOCK_SIZE), b'')), state
+            )
+            with contextlib.closing(
+                self._matcher.search_blocks(file_path, blocks)
+            ) as found:
+                occurrences = [
+                    occurrence._replace(line_num=occurrence.line_num + line_num - 1)
+                    for occurrence in islice(found, state.remaining)
+                ]
+        if state.remaining is not None:
+            state.remaining -= len(occurrences)
+        return occurrences
+
+    @staticmethod
+    def _whole_lines(blocks: Iterator[bytes], state: _FileState) -> Iterator[bytes]:
+        """
+        yielding blocks up to the last newline, the state is moved after yielded blocks
+        """
+        for block in blocks:
+            end = block.rfind(NEWLINE) + 1
+            if not end:
+                # the last line is not written completely
+                return
+            if end < len(block):
+                block = block[:end]
+            state.offset += len(block)
+            state.line_num += block.count(NEWLINE)
+            yield block
+
+
+def follow(
+    path: Union[str, os.PathLike],
+    patterns: Union[str, Sequence[str]],
+    options: SearchOptions = SearchOptions(),
+) -> Iterator[list[Occurrence]]:
+    """
+    searches files like `search`, then waits for lines appended to files,
+    new files are searched from the start, renamed files are followed further
+    and replaced or truncated files are searched again from the start,
+    `options.jobs`, `options.processes` and `options.ordered` are not used,
+    the index is not used too, because lines are counted from the start of every file
+    :param path: the file or the directory to follow
+    :param patterns: the substring or strings to search
+    :type options: SearchOptions
+    :return: the endless generator of batches of occurrences, every batch belongs to one file,
+    it stops when the generator is closed
+    :raises FileNotFoundError: if `path` does not exist
+    :raises re.error: if the regular expression is invalid
+    """
+    path = resolve_path(path)
+    matcher = make_matcher(patterns, options.regexp)
+    return _Follower(path, matcher, make_entry_filter(path, options), options).run()
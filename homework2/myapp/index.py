@@ -0,0 +1,283 @@
+"""
+persistent trigram index of the directory
+
+the index is the sqlite database in the indexed directory:
+    files: path relative to the directory, mtime, size and sorted trigrams of every indexed file
+    postings: sorted ids of files containing every trigram
+trigrams and ids are stored as arrays of unsigned ints in the native byte order
+(see `myapp/trigrams.py`), the index is a cache of the local machine
+
+only files which the search walks are indexed: `.git` directories and files ignored by `.gitignore`
+are skipped like in the search by default
+"""
+
+import contextlib
+import os
+import pathlib
+import sqlite3
+from collections import defaultdict
+from typing import NamedTuple, Optional, Sequence
+
+from myapp import compressed
+from myapp.trigrams import from_blob, to_blob, trigrams
+from myapp.walker import EntryFilter, iter_files
+
+INDEX_NAME = '.mygrep_index'
+# the layout of tables, the index of another version is rebuilt
+VERSION = 1
+# bigger files are not indexed, they are always searched
+MAX_FILE_SIZE = 16 * 1024 * 1024  # 16 MiB
+# files with more distinct trigrams are mostly binary, they would bloat postings,
+# so they are not indexed too; files without trigrams are never filtered out by the index,
+# they are always searched
+MAX_TRIGRAMS = 20000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    trigrams BLOB
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram INTEGER PRIMARY KEY,
+    files BLOB NOT NULL
+);
+'''
+
+
+class IndexedFile(NamedTuple):
+    """
+    the file as it was when it was indexed
+    """
+
+    id: int
+    mtime_ns: int
+    size: int
+    # whether trigrams of the file are known
+    indexed: bool
+
+
+class UpdateStats(NamedTuple):
+    """
+    counts of files changed since the previous update
+    """
+
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+def is_index_file(name: str) -> bool:
+    """
+    :param name: the path relative to the indexed directory
+    :return: whether the file is the index or the temporary file of sqlite
+    """
+    return name == INDEX_NAME or name.startswith(f'{INDEX_NAME}-')
+
+
+def find_index(search_path: pathlib.Path) -> Optional[pathlib.Path]:
+    """
+    :param search_path: the absolute path to search
+    :return: the nearest directory containing `search_path` which has the index or None
+    :rtype: `pathlib.Path`
+    """
+    for directory in (search_path, *search_path.parents):
+        if (directory / INDEX_NAME).is_file():
+            return directory
+    return None
+
+
+class TrigramIndex:
+    """
+    the index of files of the directory by trigrams of their content
+    """
+
+    def __init__(self, root: pathlib.Path, readonly: bool = False):
+        """
+        opens the index of the directory, the writable index is created if it does not exist
+        and is rebuilt if it has another version
+        can raise sqlite3.DatabaseError
+        :param root: the indexed directory
+        :param readonly: whether to open the existing index only for search
+        """
+        self._root = root
+        path = root / INDEX_NAME
+        if readonly:
+            self._connection = sqlite3.connect(f'{path.as_uri()}?mode=ro', uri=True)
+        else:
+            self._connection = sqlite3.connect(path)
+        try:
+            version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+            if not readonly:
+                self._create(version)
+            elif version != VERSION:
+                raise sqlite3.DatabaseError(f'unsupported version: {version}')
+        except sqlite3.DatabaseError:
+            self.close()
+            raise
+
+    def _create(self, version: int):
+        with self._connection:
+            if version != VERSION:
+                self._connection.executescript(
+                    'DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS postings;'
+                )
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f'PRAGMA user_version = {VERSION}')
+
+    def __enter__(self) -> 'TrigramIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def files(self) -> dict[str, IndexedFile]:
+        """
+        :return: indexed files by paths relative to the indexed directory
+        :rtype: `dict[str, IndexedFile]`
+        """
+        return {
+            path: IndexedFile(file_id, mtime_ns, size, bool(indexed))
+            for path, file_id, mtime_ns, size, indexed in self._connection.execute(
+                'SELECT path, id, mtime_ns, size, trigrams IS NOT NULL FROM files'
+            )
+        }
+
+    def update(self, entry_filter: Optional[EntryFilter] = None) -> UpdateStats:
+        """
+        indexes new and changed files of the directory and forgets removed ones,
+        files are compared with the index by their mtime and size
+        :param entry_filter: the filter of entries of the directory like in the search,
+        excluded files are not indexed(and are forgotten), all files are indexed if it is None
+        :return: counts of changed files
+        :rtype: UpdateStats
+        """
+        indexed = self.files()
+        # ids of files to remove from and to add to postings of every trigram
+        removals: defaultdict[int, set[int]] = defaultdict(set)
+        additions: defaultdict[int, set[int]] = defaultdict(set)
+        added = updated = unchanged = 0
+        prefix = os.path.join(self._root, '')
+        with self._connection:
+            for path in iter_files(str(self._root), entry_filter):
+                name = path[len(prefix) :]
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                file = indexed.pop(name, None)
+                if is_index_file(name):
+                    continue
+                if file is None:
+                    added += 1
+                elif (file.mtime_ns, file.size) != (stat.st_mtime_ns, stat.st_size):
+                    self._forget(file.id, removals)
+                    updated += 1
+                else:
+                    unchanged += 1
+                    continue
+                file_id, file_trigrams = self._store(file, name, stat)
+                for trigram in file_trigrams:
+                    additions[trigram].add(file_id)
+            for file in indexed.values():
+                self._forget(file.id, removals)
+                self._connection.execute('DELETE FROM files WHERE id = ?', (file.id,))
+            self._update_postings(removals, additions)
+        return UpdateStats(added, updated, len(indexed), unchanged)
+
+    def _forget(self, file_id: int, removals: defaultdict[int, set[int]]):
+        (blob,) = self._connection.execute(
+            'SELECT trigrams FROM files WHERE id = ?', (file_id,)
+        ).fetchone()
+        for trigram in from_blob(blob or b''):
+            removals[trigram].add(file_id)
+
+    def _store(
+        self, file: Optional[IndexedFile], name: str, stat: os.stat_result
+    ) -> tuple[int, set[int]]:
+        """
+        indexes the new file or the changed one,
+        the file which cannot be read, is too big or is compressed is indexed without trigrams,
+        so it is always searched
+        :return: the id and trigrams of the file
+        :rtype: `tuple[int, set[int]]`
+        """
+        file_trigrams = None
+        if stat.st_size <= MAX_FILE_SIZE:
+            with contextlib.suppress(OSError):
+                data = (self._root / name).read_bytes()
+                if compressed.detect(data[: compressed.MAGIC_SIZE]) is None:
+                    file_trigrams = trigrams(data)
+        if file_trigrams is not None and len(file_trigrams) > MAX_TRIGRAMS:
+            file_trigrams = None
+        blob = None if file_trigrams is None else to_blob(file_trigrams)
+        if file is None:
+            file_id = self._connection.execute(
+                'INSERT INTO files (mtime_ns, size, trigrams, path) VALUES (?, ?, ?, ?)',
+                (stat.st_mtime_ns, stat.st_size, blob, name),
+            ).lastrowid
+        else:
+            file_id = file.id
+            self._connection.execute(
+                'UPDATE files SET mtime_ns = ?, size = ?, trigrams = ? WHERE id = ?',
+                (stat.st_mtime_ns, stat.st_size, blob, file_id),
+            )
+        return file_id, file_trigrams or set()
+
+    def _update_postings(
+        self, removals: dict[int, set[int]], additions: dict[int, set[int]]
+    ):
+        replaced, deleted = [], []
+        for trigram in removals.keys() | additions.keys():
+            file_ids = self._posting(trigram)
+            file_ids -= removals.get(trigram, set())
+            file_ids |= additions.get(trigram, set())
+            if file_ids:
+                replaced.append((trigram, to_blob(file_ids)))
+            else:
+                deleted.append((trigram,))
+        self._connection.executemany(
+            'REPLACE INTO postings (trigram, files) VALUES (?, ?)', replaced
+        )
+        self._connection.executemany('DELETE FROM postings WHERE trigram = ?', deleted)
+
+    def candidates(self, literals: Sequence[bytes]) -> Optional[set[int]]:
+        """
+        :param literals: byte strings, one of which every found line contains
+        :return: ids of indexed files which contain any of literals
+        or None if literals are too short to use the index
+        :rtype: `set[int]`
+        """
+        found: set[int] = set()
+        # many literals share trigrams
+        postings: dict[int, set[int]] = {}
+        for literal in literals:
+            literal_trigrams = trigrams(literal)
+            if not literal_trigrams:
+                return None
+            file_ids: Optional[set[int]] = None
+            for trigram in literal_trigrams:
+                if trigram not in postings:
+                    postings[trigram] = self._posting(trigram)
+                posting = postings[trigram]
+                file_ids = posting if file_ids is None else file_ids & posting
+                if not file_ids:
+                    break
+            found |= file_ids or set()
+        return found
+
+    def _posting(self, trigram: int) -> set[int]:
+        """
+        :return: ids of files containing the trigram
+        :rtype: `set[int]`
+        """
+        row = self._connection.execute(
+            'SELECT files FROM postings WHERE trigram = ?', (trigram,)
+        ).fetchone()
+        return set(from_blob(row[0])) if row is not None else set()
@@ -0,0 +1,111 @@
+"""
+literals required by regular expressions
+
+every line matching the expression contains one of its required literals,
+so lines without them are skipped without running the expression
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+try:
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # python < 3.11
+    import sre_constants  # pylint: disable=W4901
+    import sre_parse  # pylint: disable=W4901
+
+# opcodes are generated when sre_constants is imported
+# pylint: disable=E1101
+
+# flags which change the meaning of literals
+_CASE_FLAGS = re.IGNORECASE
+
+
+class _Literals(NamedTuple):
+    """
+    what is known about strings matched by the part of the expression
+    """
+
+    # the string matched by the part if it matches only one string
+    exact: Optional[str]
+    # strings, one of which every match of the part contains, or None if it is unknown
+    required: Optional[list[str]]
+
+
+def _score(required: list[str]) -> tuple[int, int]:
+    # longer literals are rarer and fewer literals are cheaper to find
+    return min(len(literal) for literal in required), -len(required)
+
+
+def _best(
+    first: Optional[list[str]], second: Optional[list[str]]
+) -> Optional[list[str]]:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return second if _score(second) > _score(first) else first
+
+
+def _subpattern(op, av) -> _Literals:
+    """
+    :return: literals of the item of the sequence which is not a literal character
+    """
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, _, items = av
+        if add_flags & _CASE_FLAGS:
+            return _Literals(None, None)
+        return _sequence(items)
+    if op is sre_constants.BRANCH:
+        alternatives = [_sequence(items).required for items in av[1]]
+        if any(required is None for required in alternatives):
+            return _Literals(None, None)
+        return _Literals(
+            None, [literal for required in alternatives for literal in required]
+        )
+    if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+        return _Literals(None, _sequence(av[2]).required)
+    # classes, anchors, lookarounds, backreferences and so on
+    return _Literals(None, None)
+
+
+def _sequence(items) -> _Literals:
+    """
+    :param items: the parsed sequence of the expression
+    """
+    run: list[str] = []
+    required: Optional[list[str]] = None
+    exact = True
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        literals = _subpattern(op, av)
+        if literals.exact is not None:
+            # the group of literals continues the run
+            run.append(literals.exact)
+            continue
+        exact = False
+        if run:
+            required = _best(required, [''.join(run)])
+            run = []
+        required = _best(required, literals.required)
+    if exact:
+        return _Literals(''.join(run), [''.join(run)] if run else None)
+    if run:
+        required = _best(required, [''.join(run)])
+    return _Literals(None, required)
+
+
+def required_literals(pattern: str) -> Optional[list[str]]:
+    """
+    :param pattern: the regular expression
+    :return: non-empty strings, one of which every match of `pattern` contains,
+    or None if such strings are unknown
+    :rtype: `list[str]`
+    :raises re.error: if `pattern` is not a valid expression
+    """
+    if re.compile(pattern).flags & _CASE_FLAGS:
+        return None
+    return _sequence(sre_parse.parse(pattern)).required
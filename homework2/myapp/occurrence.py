@@ -0,0 +1,25 @@
+import pathlib
+from typing import NamedTuple, Optional
+
+
+class Occurrence(NamedTuple):
+    """
+    this class represents substring occurrence in text
+    """
+
+    line_num: int
+    text: str
+    file_path: pathlib.Path
+    # the pattern found in the line if many patterns are searched
+    pattern: Optional[str] = None
+    # whether the line is printed around the found line and is not found itself
+    context: bool = False
+
+
+class FileCount(NamedTuple):
+    """
+    count of found lines of the file
+    """
+
+    file_path: pathlib.Path
+    count: int
@@ -0,0 +1,199 @@
+import os
+import pathlib
+from json.encoder import encode_basestring  # type: ignore[attr-defined]
+from typing import BinaryIO, Callable, Iterable, Optional
+
+from myapp.blocks import ENCODING
+from myapp.occurrence import FileCount, Occurrence
+
+# formats of printed occurrences
+TEXT = 'text'
+# like `TEXT`, but the path is followed by the null byte like in `grep --null`
+NULL = 'null'
+# one JSON object per line
+JSON = 'json'
+
+# so many formatted lines are encoded and written to the stream at once
+BATCH_SIZE = 4096
+# paths are bytes of the file system, so they are written as they are
+OUTPUT_ERRORS = 'surrogateescape'
+# raw bytes would break JSON, so undecodable bytes of paths are written as `\udcXX` escapes,
+# they are decoded back to the same bytes by `os.fsencode`
+JSON_OUTPUT_ERRORS = 'backslashreplace'
+# the line between groups of lines which are not adjacent like in `grep -C`
+GROUP_SEPARATOR = '--\n'
+
+
+def get_relative_path_view(file_path: pathlib.Path) -> str:
+    """
+    make relative path from current path to `file_path`,
+    the path outside of the current directory stays absolute
+    :param file_path: absolute file path
+    :type file_path: pathlib.Path
+    :return: string that represents relative path to `file_path`
+    :rtype: str
+    """
+    current_path = pathlib.Path().absolute()
+    try:
+        relative_path = file_path.relative_to(current_path)
+    except ValueError:
+        # paths outside of the current directory are shown as they are
+        return str(file_path)
+    return str(relative_path)
+
+
+def format_occurrence(occurrence: Occurrence) -> str:
+    """
+    :param occurrence: occurrence to format
+    :type occurrence: Occurrence
+    :return: formatted occurrence
+    :rtype: str
+    """
+    pattern = '' if occurrence.pattern is None else f' pattern={occurrence.pattern}'
+    return (
+        f'{get_relative_path_view(occurrence.file_path)} '
+        f'line={occurrence.line_num}{pattern}: {occurrence.text}'
+    )
+
+
+def print_occurrence(occurrence: Occurrence):
+    """
+    prints the given occurrence to stdout
+    :type occurrence: Occurrence
+    """
+    print(format_occurrence(occurrence))
+
+
+def _text_line(path: str, separator: str, occurrence: Occurrence) -> str:
+    pattern = '' if occurrence.pattern is None else f' pattern={occurrence.pattern}'
+    if occurrence.context:
+        # context lines are marked like in `grep -C`
+        return (
+            f'{path}{separator}line={occurrence.line_num}{pattern}- {occurrence.text}\n'
+        )
+    return f'{path}{separator}line={occurrence.line_num}{pattern}: {occurrence.text}\n'
+
+
+def _json_line(path: str, occurrence: Occurrence) -> str:
+    """
+    :param path: the JSON string of the path
+    """
+    pattern = (
+        ''
+        if occurrence.pattern is None
+        else f', "pattern": {encode_basestring(occurrence.pattern)}'
+    )
+    context = ', "context": true' if occurrence.context else ''
+    return (
+        f'{{"path": {path}, "line": {occurrence.line_num}, '
+        f'"text": {encode_basestring(occurrence.text)}{pattern}{context}}}\n'
+    )
+
+
+class OccurrenceWriter:
+    """
+    writes occurrences to the binary stream by batches of lines,
+    the relative path is made once for all occurrences of the file
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        output_format: str = TEXT,
+        interactive: Optional[bool] = None,
+        context: bool = False,
+    ):
+        """
+        :param stream: the binary stream like `sys.stdout.buffer`
+        :param output_format: `TEXT`, `NULL` or `JSON`
+        :param interactive: whether to flush the stream after every file,
+        by default the terminal is interactive
+        :param context: whether occurrences come with context lines, then groups
+        of adjacent lines are separated by `GROUP_SEPARATOR` in text formats
+        """
+        self._stream = stream
+        self._interactive = stream.isatty() if interactive is None else interactive
+        self._format: Callable[[str, Occurrence], str] = {
+            TEXT: lambda path, occurrence: _text_line(path, ' ', occurrence),
+            NULL: lambda path, occurrence: _text_line(path, '\0', occurrence),
+            JSON: _json_line,
+        }[output_format]
+        self._output_format = output_format
+        self._separate = context and output_format != JSON
+        # searched files are mostly under the current directory
+        self._prefix = os.path.join(pathlib.Path().absolute(), '')
+        self._file_path: Optional[pathlib.Path] = None
+        self._path = ''
+        self._line_num = 0
+        self._lines: list[str] = []
+
+    def _relative_path(self, file_path: pathlib.Path) -> str:
+        path = str(file_path)
+        if path.startswith(self._prefix):
+            path = path[len(self._prefix) :]
+        else:
+            path = get_relative_path_view(file_path)
+        # the path is formatted once for all occurrences of the file
+        return encode_basestring(path) if self._output_format == JSON else path
+
+    def write(self, occurrences: Iterable[Occurrence]):
+        """
+        writes occurrences, they are written to the stream when the batch is full
+        """
+        lines = self._lines
+        separate = self._separate
+        for occurrence in occurrences:
+            if separate:
+                self._separate_group(occurrence)
+            if occurrence.file_path != self._file_path:
+                self._file_path = occurrence.file_path
+                self._path = self._relative_path(occurrence.file_path)
+            lines.append(self._format(self._path, occurrence))
+            if len(lines) >= BATCH_SIZE:
+                self._write_lines()
+        if self._interactive:
+            self.flush()
+
+    def _separate_group(self, occurrence: Occurrence):
+        """
+        appends the separator if the occurrence does not follow the previous line
+        """
+        if self._file_path is not None and (
+            occurrence.file_path != self._file_path
+            or occurrence.line_num != self._line_num + 1
+        ):
+            self._lines.append(GROUP_SEPARATOR)
+        self._line_num = occurrence.line_num
+
+    def write_counts(self, counts: Iterable[FileCount]):
+        """
+        writes counts of found lines of files like `grep -c`
+        """
+        lines = self._lines
+        separator = '\0' if self._output_format == NULL else ' '
+        for file_count in counts:
+            path = self._relative_path(file_count.file_path)
+            if self._output_format == JSON:
+                lines.append(f'{{"path": {path}, "count": {file_count.count}}}\n')
+            else:
+                lines.append(f'{path}{separator}count={file_count.count}\n')
+            # the terminal gets the count of every file as soon as it is counted
+            if self._interactive:
+                self.flush()
+            elif len(lines) >= BATCH_SIZE:
+                self._write_lines()
+
+    def _write_lines(self):
+        if self._lines:
+            errors = (
+                JSON_OUTPUT_ERRORS if self._output_format == JSON else OUTPUT_ERRORS
+            )
+            self._stream.write(''.join(self._lines).encode(ENCODING, errors))
+            self._lines.clear()
+
+    def flush(self):
+        """
+        writes all occurrences to the stream
+        """
+        self._write_lines()
+        self._stream.flush()
@@ -0,0 +1,217 @@
+"""
+search in the pool of processes, which is not limited by the GIL
+
+files are split into tasks: small files are searched as a whole, big ones by ranges of bytes
+aligned on lines, results are merged in the order of tasks, so occurrences go
+in the same order as in the sequential search
+"""
+
+import contextlib
+import multiprocessing
+import pathlib
+import sys
+import threading
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from myapp import compressed
+from myapp.blocks import NEWLINE, Buffer, iter_blocks, map_file
+from myapp.filters import SNIFF_SIZE, is_binary
+from myapp.occurrence import Occurrence
+from myapp.search import Matcher, search_file
+
+# bigger files are split into ranges of this size, which are searched in parallel
+SHARD_SIZE = 64 * 1024 * 1024  # 64 MiB
+# so many tasks are sent to the worker and their results are sent back at once
+TASKS_PER_BATCH = 16
+# so many batches per process are sent ahead of the caller, then new tasks wait for it
+PENDING_BATCHES = 2
+# the type of arrays of line numbers
+LINE_NUM_TYPE = 'Q'
+# the end of the last range, lines appended after the file was split are searched too
+FILE_END = sys.maxsize
+
+
+class Task(NamedTuple):
+    """
+    the file or the range of bytes of the file to search
+    """
+
+    path: str
+    # the range is extended to whole lines, so every line is searched by one task
+    start: int = 0
+    # None if the file is searched as a whole
+    end: Optional[int] = None
+
+
+class TaskResult(NamedTuple):
+    """
+    found lines of the task in the compact form, which is cheap to send between processes
+    """
+
+    path: str
+    start: int
+    # count of lines in the range, it is the offset of line numbers of the next range
+    newlines: int
+    # numbers of found lines relative to the range as the array of unsigned ints
+    line_nums: bytes
+    # found lines joined by newlines, found lines never contain newlines
+    texts: str
+    # patterns of found lines if many patterns are searched
+    patterns: Optional[list[str]]
+
+    def occurrences(self, offset: int) -> list[Occurrence]:
+        """
+        :param offset: count of lines of the file before the range
+        :rtype: `list[Occurrence]`
+        """
+        line_nums = array(LINE_NUM_TYPE, self.line_nums)
+        if not line_nums:
+            return []
+        file_path = pathlib.Path(self.path)
+        patterns = self.patterns or [None] * len(line_nums)
+        return [
+            Occurrence(offset + line_num, text, file_path, pattern)
+            for line_num, text, pattern in zip(
+                line_nums, self.texts.split('\n'), patterns
+            )
+        ]
+
+
+# the state of the worker process, it is sent once when the process is started
+_matcher: Optional[Matcher] = None
+_text = False
+_max_count: Optional[int] = None
+
+
+def _init_worker(matcher: Matcher, text: bool, max_count: Optional[int]):
+    global _matcher, _text, _max_count  # pylint: disable=W0603
+    _matcher, _text, _max_count = matcher, text, max_count
+
+
+def _align(buffer: Buffer, position: int) -> int:
+    """
+    :return: the start of the first line which starts at `position` or after it
+    """
+    if position <= 0:
+        return 0
+    newline = buffer.find(NEWLINE, position - 1)
+    return len(buffer) if newline == -1 else newline + 1
+
+
+def _count_lines(blocks: Iterable[bytes], counts: list[int]) -> Iterator[bytes]:
+    """
+    yielding the same blocks, counts of their newlines are appended to `counts`
+    """
+    for block in blocks:
+        counts.append(block.count(NEWLINE))
+        yield block
+
+
+def search_task(task: Task) -> TaskResult:
+    """
+    searches the task in the worker process,
+    the range is not searched to the end if `_max_count` lines are found
+    :rtype: TaskResult
+    """
+    path = pathlib.Path(task.path)
+    if task.end is None:
+        with contextlib.closing(search_file(path, _matcher, _text)) as found:
+            occurrences = list(islice(found, _max_count))
+        newlines = 0
+    else:
+        counts: list[int] = []
+        with map_file(path) as buffer:
+            start, end = _align(buffer, task.start), _align(buffer, task.end)
+            blocks = _count_lines(iter_blocks(buffer, start, end), counts)
+            with contextlib.closing(_matcher.search_blocks(path, blocks)) as found:
+                occurrences = list(islice(found, _max_count))
+        newlines = sum(counts)
+    line_nums = array(
+        LINE_NUM_TYPE, [occurrence.line_num for occurrence in occurrences]
+    )
+    texts = '\n'.join(occurrence.text for occurrence in occurrences)
+    patterns = None
+    if occurrences and occurrences[0].pattern is not None:
+        patterns = [occurrence.pattern for occurrence in occurrences]
+    return TaskResult(
+        task.path, task.start, newlines, line_nums.tobytes(), texts, patterns
+    )
+
+
+def make_tasks(files: Iterable[pathlib.Path], text: bool = False) -> Iterator[Task]:
+    """
+    yielding tasks of files, big files are split into ranges of `SHARD_SIZE` bytes,
+    big binary files are skipped here unless they are searched as text
+    :param text: whether binary files are searched
+    """
+    for file in files:
+        head = b''
+        try:
+            size = file.stat().st_size
+            if size > SHARD_SIZE:
+                with file.open('rb') as stream:
+                    head = stream.read(max(SNIFF_SIZE, compressed.MAGIC_SIZE))
+        except OSError:
+            # the worker fails like the sequential search does
+            size = 0
+        if size <= SHARD_SIZE or compressed.detect(head) is not None:
+            # compressed files are decompressed from the start
+            yield Task(str(file))
+        elif text or not is_binary(head):
+            for start in range(0, size, SHARD_SIZE):
+                end = start + SHARD_SIZE if start + SHARD_SIZE < size else FILE_END
+                yield Task(str(file), start, end)
+
+
+def _throttle(
+    tasks: Iterator[Task], slots: threading.Semaphore, closed: threading.Event
+) -> Iterator[Task]:
+    """
+    yielding tasks while there are free slots, it is run by the thread of the pool
+    which sends tasks to workers
+    """
+    for task in tasks:
+        slots.acquire()  # pylint: disable=R1732
+        if closed.is_set():
+            return
+        yield task
+
+
+def search_processes(
+    files: Iterable[pathlib.Path],
+    matcher: Matcher,
+    processes: int,
+    text: bool = False,
+    max_count: Optional[int] = None,
+) -> Iterator[list[Occurrence]]:
+    """
+    yielding occurrences of every task, tasks of files go in the order of `files`,
+    the search stops when the generator is closed
+    :param processes: count of worker processes
+    :param text: whether to search binary files
+    :param max_count: count of occurrences of one file at most, all by default
+    """
+    slots = threading.Semaphore(processes * TASKS_PER_BATCH * PENDING_BATCHES)
+    closed = threading.Event()
+    tasks = _throttle(make_tasks(files, text), slots, closed)
+    with multiprocessing.Pool(
+        processes, _init_worker, (matcher, text, max_count)
+    ) as pool:
+        try:
+            # line numbers of the range are shifted by lines of previous ranges of the file
+            offset, remaining = 0, max_count
+            for result in pool.imap(search_task, tasks, TASKS_PER_BATCH):
+                slots.release()
+                if not result.start:
+                    offset, remaining = 0, max_count
+                occurrences = result.occurrences(offset)[:remaining]
+                if remaining is not None:
+                    remaining -= len(occurrences)
+                yield occurrences
+                offset += result.newlines
+        finally:
+            # the thread sending tasks may wait for the slot
+            closed.set()
+            slots.release()
@@ -0,0 +1,256 @@
+import abc
+import pathlib
+import re
+from functools import partial
+from typing import Iterable, Iterator, Optional, Sequence
+
+from myapp.aho_corasick import AhoCorasick
+from myapp.blocks import (
+    ENCODING,
+    NEWLINE,
+    Buffer,
+    count_lines,
+    decode_line,
+    file_blocks,
+    find_lines,
+    iter_blocks,
+    split_lines,
+)
+from myapp.literals import required_literals
+from myapp.occurrence import Occurrence
+
+# blocks where at least every such line matches are split into lines,
+# it is cheaper than looking for every match separately
+DENSE_RATIO = 16
+
+
+class Matcher(abc.ABC):
+    """
+    finds lines of files which match the query
+    """
+
+    def search(self, file_path: pathlib.Path, buffer: Buffer) -> Iterator[Occurrence]:
+        """
+        yielding occurrences in `buffer`, only found lines are decoded
+        :param file_path: for external information(path relative to current dir)
+        :type file_path: `pathlib.Path`
+        :param buffer: the content of the file
+        """
+        return self.search_blocks(file_path, iter_blocks(buffer))
+
+    def search_blocks(
+        self, file_path: pathlib.Path, blocks: Iterable[bytes]
+    ) -> Iterator[Occurrence]:
+        """
+        yielding occurrences in the content of the file split into blocks,
+        every block except the last one ends with the newline
+        """
+        line_num = 1
+        for block in blocks:
+            yield from self.search_block(file_path, block, line_num)
+            line_num += block.count(NEWLINE)
+
+    @abc.abstractmethod
+    def search_block(
+        self, file_path: pathlib.Path, block: bytes, line_num: int
+    ) -> Iterator[Occurrence]:
+        """
+        yielding occurrences in the block of whole lines
+        :param line_num: number of the first line of the block
+        """
+
+    @abc.abstractmethod
+    def count_block(self, block: bytes) -> int:
+        """
+        :return: count of found lines of the block of whole lines,
+        occurrences are not made
+        """
+
+    @abc.abstractmethod
+    def literals(self) -> list[bytes]:
+        """
+        :return: byte strings, one of which every found line contains
+        :rtype: `list[bytes]`
+        """
+
+
+class SubstringMatcher(Matcher):
+    """
+    finds lines containing the substring
+    """
+
+    def __init__(self, substring: str):
+        self._pattern = substring.encode(ENCODING)
+
+    def literals(self) -> list[bytes]:
+        return [self._pattern]
+
+    def search_blocks(
+        self, file_path: pathlib.Path, blocks: Iterable[bytes]
+    ) -> Iterator[Occurrence]:
+        """
+        blocks without the substring are skipped by counting their newlines
+        """
+        line_num = 1
+        for block in blocks:
+            lines = block.count(NEWLINE)
+            yield from self._search_block(file_path, block, line_num, lines)
+            line_num += lines
+
+    def search_block(
+        self, file_path: pathlib.Path, block: bytes, line_num: int
+    ) -> Iterator[Occurrence]:
+        return self._search_block(file_path, block, line_num)
+
+    def _search_block(
+        self,
+        file_path: pathlib.Path,
+        block: bytes,
+        line_num: int,
+        lines: Optional[int] = None,
+    ) -> Iterator[Occurrence]:
+        """
+        :param lines: count of newlines of the block if it is counted already
+        """
+        pattern = self._pattern
+        first = block.find(pattern)
+        if first == -1:
+            return iter(())
+        if lines is None:
+            lines = block.count(NEWLINE)
+        if block.count(pattern, first) * DENSE_RATIO >= lines:
+            return (
+                Occurrence(num, decode_line(line), file_path)
+                for num, line in enumerate(split_lines(block), start=line_num)
+                if pattern in line
+            )
+        return (
+            Occurrence(num, decode_line(block[start:end]), file_path)
+            for num, start, end in find_lines(
+                block, partial(block.find, pattern), line_num
+            )
+        )
+
+    def count_block(self, block: bytes) -> int:
+        return count_lines(block, partial(block.find, self._pattern))
+
+
+class PatternsMatcher(Matcher):
+    """
+    finds lines containing any of patterns in one pass with the Aho-Corasick automaton,
+    every occurrence has the pattern which ends first in the line
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._patterns = list(patterns)
+        self._literals = [pattern.encode(ENCODING) for pattern in self._patterns]
+        self._automaton = AhoCorasick(self._literals)
+
+    def literals(self) -> list[bytes]:
+        return self._literals
+
+    def search_block(
+        self, file_path: pathlib.Path, block: bytes, line_num: int
+    ) -> Iterator[Occurrence]:
+        automaton = self._automaton
+        for num, start, end in find_lines(
+            block, partial(automaton.find, block), line_num
+        ):
+            _, index = automaton.first_match(block, start, end)
+            text = decode_line(block[start:end])
+            yield Occurrence(num, text, file_path, self._patterns[index])
+
+    def count_block(self, block: bytes) -> int:
+        return count_lines(block, partial(self._automaton.find, block))
+
+
+class RegexMatcher(Matcher):
+    """
+    finds lines matching the regular expression,
+    only lines containing required literals of the expression are decoded and matched
+    """
+
+    def __init__(self, pattern: str):
+        """
+        :raises re.error: if `pattern` is not a valid expression
+        """
+        self._regex = re.compile(pattern)
+        literals = required_literals(pattern)
+        self._literals = None
+        if literals is not None:
+            # lines decoded with replacements never contain lone surrogates
+            self._literals = [
+                literal.encode(ENCODING, 'surrogatepass') for literal in literals
+            ]
+            self._automaton = AhoCorasick(self._literals)
+
+    def literals(self) -> list[bytes]:
+        # every line contains the empty string
+        return self._literals or [b'']
+
+    def _candidates(self, block: bytes, line_num: int) -> Iterator[tuple[int, bytes]]:
+        """
+        :return: iterator of numbers and lines which may match
+        """
+        if self._literals is None:
+            return enumerate(split_lines(block), start=line_num)
+        if len(self._literals) == 1:
+            find = partial(block.find, self._literals[0])
+        else:
+            find = partial(self._automaton.find, block)
+        return (
+            (num, block[start:end])
+            for num, start, end in find_lines(block, find, line_num)
+        )
+
+    def search_block(
+        self, file_path: pathlib.Path, block: bytes, line_num: int
+    ) -> Iterator[Occurrence]:
+        search = self._regex.search
+        for num, line in self._candidates(block, line_num):
+            text = line.decode(ENCODING, 'replace')
+            if search(text):
+                yield Occurrence(num, text.strip(), file_path)
+
+    def count_block(self, block: bytes) -> int:
+        # only candidates are decoded, the expression is matched with text
+        search = self._regex.search
+        return sum(
+            1
+            for _, line in self._candidates(block, 1)
+            if search(line.decode(ENCODING, 'replace'))
+        )
+
+
+def search_file(
+    file_path: pathlib.Path, matcher: Matcher, text: bool = False
+) -> Iterator[Occurrence]:
+    """
+    yielding occurrences found by `matcher` in the file,
+    lines which are not valid UTF-8 are decoded with replacements
+    :type file_path: `pathlib.Path`
+    :type matcher: Matcher
+    :param text: whether to search binary files
+    """
+    # the file is unmapped when the generator is exhausted or closed
+    with file_blocks(file_path, text) as blocks:  # pylint: disable=W0135
+        yield from matcher.search_blocks(file_path, blocks)
+
+
+def count_file(
+    file_path: pathlib.Path,
+    matcher: Matcher,
+    text: bool = False,
+    max_count: Optional[int] = None,
+) -> int:
+    """
+    :param max_count: the count is not greater, the file is read up to it
+    :return: count of lines found by `matcher` in the file, lines are not decoded
+    """
+    count = 0
+    with file_blocks(file_path, text) as blocks:
+        for block in blocks:
+            count += matcher.count_block(block)
+            if max_count is not None and count >= max_count:
+                return max_count
+    return count
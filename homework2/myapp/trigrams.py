@@ -0,0 +1,29 @@
+"""
+trigrams of the content of files and their storage in the index
+
+trigrams and ids of files are stored as arrays of unsigned ints in the native byte order
+"""
+
+from array import array
+from typing import Iterable
+
+
+def trigrams(data: bytes) -> set[int]:
+    """
+    :return: all sequences of three bytes of `data` as integers
+    :rtype: `set[int]`
+    """
+    return {
+        first << 16 | second << 8 | third
+        for first, second, third in set(zip(data, data[1:], data[2:]))
+    }
+
+
+def to_blob(numbers: Iterable[int]) -> bytes:
+    return array('I', sorted(numbers)).tobytes()
+
+
+def from_blob(blob: bytes) -> array:
+    numbers = array('I')
+    numbers.frombytes(blob)
+    return numbers
@@ -0,0 +1,299 @@
+import os
+import pathlib
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Iterator, Optional, Protocol
+
+# so many results of files wait for the caller per worker, then workers wait for the caller
+PENDING_PER_JOB = 4
+
+
+class EntryFilter(Protocol):
+    """
+    excludes entries of the directory while it is listed
+    """
+
+    def for_directory(self, path: str) -> 'EntryFilter':
+        """
+        :return: the filter of entries of the subdirectory
+        """
+
+    def excluded(self, entry: os.DirEntry) -> bool:
+        """
+        :return: whether to skip the file or the directory and all its content
+        """
+
+
+def _list_dir(path: str) -> list[os.DirEntry]:
+    """
+    :return: entries of the directory or an empty list if it cannot be listed
+    :rtype: `list[os.DirEntry]`
+    """
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        # the directory was removed or is not readable, like `grep -r` just skip it
+        return []
+
+
+def iter_files(root: str, entry_filter: Optional[EntryFilter] = None) -> Iterator[str]:
+    """
+    walking through `root` directory depth-first with `os.scandir` and yielding paths of files
+    entries of every directory are yielded in the order of `os.scandir`
+    :type root: str
+    :param entry_filter: the filter of entries of `root`, all entries are walked if it is None
+    """
+    stack = [(iter(_list_dir(root)), entry_filter)]
+    while stack:
+        entries, directory_filter = stack[-1]
+        for entry in entries:
+            if directory_filter is not None and directory_filter.excluded(entry):
+                continue
+            if entry.is_dir():
+                child_filter = directory_filter and directory_filter.for_directory(
+                    entry.path
+                )
+                stack.append((iter(_list_dir(entry.path)), child_filter))
+                break
+            if entry.is_file():
+                yield entry.path
+        else:
+            stack.pop()
+
+
+class WorkStealingPool:
+    """
+    thread pool where every worker has its own deque of tasks
+    the worker takes the newest task from its own deque
+    and steals the oldest task from other deques when its own deque is empty
+    """
+
+    def __init__(self, jobs: int, on_idle: Optional[Callable[[], None]] = None):
+        """
+        :param jobs: count of worker threads
+        :param on_idle: called by the worker which finished the last pending task
+        """
+        self._deques: list[deque] = [deque() for _ in range(jobs)]
+        self._on_idle = on_idle
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        # count of submitted tasks which are not finished yet
+        self._pending = 0
+        self._closed = False
+        self._local = threading.local()
+        self._threads = [
+            threading.Thread(target=self._work, args=(index,), daemon=True)
+            for index in range(jobs)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, task: Callable[[], None]):
+        """
+        tasks submitted by workers go to their own deques, other tasks go to the first deque
+        """
+        with self._lock:
+            self._pending += 1
+            self._deques[getattr(self._local, 'index', 0)].append(task)
+            self._has_work.notify()
+
+    def shutdown(self):
+        """
+        drops tasks which were not started and stops workers after their current tasks
+        """
+        with self._lock:
+            self._closed = True
+            for tasks in self._deques:
+                tasks.clear()
+            self._has_work.notify_all()
+
+    def _take(self, index: int) -> Optional[Callable[[], None]]:
+        try:
+            return self._deques[index].pop()
+        except IndexError:
+            pass
+        for offset in range(1, len(self._deques)):
+            try:
+                return self._deques[(index + offset) % len(self._deques)].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _work(self, index: int):
+        self._local.index = index
+        while True:
+            task = self._take(index)
+            if task is None:
+                with self._lock:
+                    # the check under the lock does not miss the notification of `submit`
+                    while not self._closed and not any(self._deques):
+                        self._has_work.wait()
+                    if self._closed:
+                        return
+                continue
+            task()
+            with self._lock:
+                self._pending -= 1
+                idle = not self._pending
+            if idle and self._on_idle is not None:
+                self._on_idle()
+
+
+class _Node:
+    """
+    the directory or the file found by the walker
+    """
+
+    __slots__ = ('path', 'children', 'result', 'error', 'done')
+
+    def __init__(self, path: str):
+        self.path = path
+        # entries of the directory, None for files
+        self.children: Optional[list['_Node']] = None
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+_FINISHED = object()
+
+
+class _Walk:
+    """
+    the state of one walk of `ParallelWalker`
+    """
+
+    def __init__(self, jobs: int, func: Callable[[pathlib.Path], Any], ordered: bool):
+        self._func = func
+        self._ordered = ordered
+        # completed nodes in the order of completion, it is used only if not ordered
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        # notifies about completed nodes, it is used only if ordered
+        self._completed = threading.Condition()
+        # results which are not taken by the caller, it is used only if not ordered
+        self._slots = threading.Semaphore(jobs * PENDING_PER_JOB)
+        self._jobs = jobs
+        self._closed = False
+        self._pool = WorkStealingPool(
+            jobs, on_idle=lambda: self._results.put(_FINISHED)
+        )
+
+    def run(
+        self, root: pathlib.Path, entry_filter: Optional[EntryFilter]
+    ) -> Iterator[Any]:
+        root_node = _Node(str(root))
+        self._pool.submit(lambda: self._list_dir(root_node, entry_filter))
+        try:
+            if self._ordered:
+                yield from self._in_order(root_node)
+            else:
+                yield from self._as_completed()
+        finally:
+            self._closed = True
+            self._pool.shutdown()
+            # workers waiting for the caller are stopped
+            self._slots.release(self._jobs)
+
+    def _complete(self, node: _Node):
+        if self._ordered:
+            with self._completed:
+                node.done = True
+                self._completed.notify()
+        else:
+            self._results.put(node)
+
+    def _process(self, node: _Node):
+        if not self._ordered:
+            self._slots.acquire()  # pylint: disable=R1732
+            if self._closed:
+                return
+        try:
+            node.result = self._func(pathlib.Path(node.path))
+        except Exception as e:  # pylint: disable=W0703
+            node.error = e
+        self._complete(node)
+
+    def _list_dir(self, node: _Node, entry_filter: Optional[EntryFilter]):
+        children = []
+        for entry in _list_dir(node.path):
+            if entry_filter is not None and entry_filter.excluded(entry):
+                continue
+            if entry.is_dir():
+                child = _Node(entry.path)
+                children.append(child)
+                child_filter = entry_filter and entry_filter.for_directory(entry.path)
+                self._pool.submit(
+                    lambda child=child, child_filter=child_filter: self._list_dir(
+                        child, child_filter
+                    )
+                )
+            elif entry.is_file():
+                child = _Node(entry.path)
+                children.append(child)
+                self._pool.submit(lambda child=child: self._process(child))
+        node.children = children
+        self._complete(node)
+
+    def _as_completed(self) -> Iterator[Any]:
+        while (node := self._results.get()) is not _FINISHED:
+            if node.children is not None:
+                # directories have children, files do not
+                continue
+            self._slots.release()
+            if node.error is not None:
+                raise node.error
+            yield node.result
+
+    def _in_order(self, root: _Node) -> Iterator[Any]:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            with self._completed:
+                while not node.done:
+                    self._completed.wait()
+            if node.children is not None:
+                stack.extend(reversed(node.children))
+                continue
+            if node.error is not None:
+                raise node.error
+            yield node.result
+
+
+class ParallelWalker:
+    """
+    lists directories and calls the function on files in the work stealing thread pool,
+    so listing of directories overlaps with processing of files
+    """
+
+    def __init__(self, jobs: int):
+        """
+        :param jobs: count of worker threads
+        """
+        self._jobs = jobs
+
+    def map(
+        self,
+        root: pathlib.Path,
+        func: Callable[[pathlib.Path], Any],
+        ordered: bool = False,
+        entry_filter: Optional[EntryFilter] = None,
+    ) -> Iterator[Any]:
+        """
+        calls `func` for every file under `root` and yields results
+        exceptions raised by `func` are raised by this generator,
+        files are not processed until the caller takes results of previous ones
+        if `PENDING_PER_JOB` results per worker are waiting, results which wait
+        for previous files in the ordered mode are not limited
+        :param root: the directory or the file to walk through
+        :param func: the function called in worker threads
+        :param ordered: whether to yield results in the order of `iter_files`
+        or as soon as they are ready
+        :param entry_filter: the filter of entries of `root`
+        """
+        if not root.is_dir():
+            if root.is_file():
+                yield func(root)
+            return
+        yield from _Walk(self._jobs, func, ordered).run(root, entry_filter)
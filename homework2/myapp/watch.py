@@ -0,0 +1,130 @@
+"""
+watchers of changes of files in directories
+
+inotify is used through libc on Linux, otherwise files are polled,
+`wait` of every watcher returns paths of changed files or None if any file may be changed
+"""
+
+import contextlib
+import ctypes
+import errno
+import os
+import select
+import struct
+import time
+from typing import Optional, Union
+
+# files are polled with this interval in seconds if inotify is not available
+POLL_INTERVAL = 1.0
+
+# events of inotify, see `man 7 inotify`
+IN_MODIFY = 0x2
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# files and directories appear or disappear, the tree is listed again
+TREE_EVENTS = (
+    IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_Q_OVERFLOW
+    | IN_IGNORED
+    | IN_ISDIR
+)
+# `struct inotify_event` without the name
+EVENT = struct.Struct('iIII')
+EVENTS_SIZE = 64 * 1024  # 64 KiB
+
+
+class Poller:
+    """
+    checks all files after every interval
+    """
+
+    def watch(self, directory: str):
+        pass
+
+    def wait(self) -> Optional[set[str]]:
+        time.sleep(POLL_INTERVAL)
+
+    def close(self):
+        pass
+
+
+class Inotify:
+    """
+    waits for changes of files of watched directories with inotify through libc
+    """
+
+    def __init__(self, libc: ctypes.CDLL):
+        """
+        :raises OSError: if inotify cannot be used
+        """
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'cannot use inotify')
+        self._directories: dict[int, str] = {}
+
+    def watch(self, directory: str):
+        """
+        :raises OSError: if the directory cannot be watched, e.g. there are too many watches
+        """
+        descriptor = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOENT:
+                # the directory is removed, the tree is listed again after the event
+                return
+            raise OSError(error, os.strerror(error), directory)
+        self._directories[descriptor] = directory
+
+    def wait(self) -> Optional[set[str]]:
+        """
+        :return: paths of changed files or None if files or directories appeared
+        or disappeared
+        """
+        select.select([self._fd], [], [])
+        changed: Optional[set[str]] = set()
+        with contextlib.suppress(BlockingIOError):
+            while data := os.read(self._fd, EVENTS_SIZE):
+                changed = self._parse(data, changed)
+        return changed
+
+    def _parse(self, data: bytes, changed: Optional[set[str]]) -> Optional[set[str]]:
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size : offset + EVENT.size + length]
+            offset += EVENT.size + length
+            if mask & TREE_EVENTS:
+                changed = None
+            elif changed is not None and descriptor in self._directories:
+                directory = self._directories[descriptor]
+                changed.add(os.path.join(directory, os.fsdecode(name.rstrip(b'\0'))))
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def make_watcher() -> Union['Inotify', Poller]:
+    """
+    :return: inotify if it is available, otherwise the poller
+    """
+    try:
+        return Inotify(ctypes.CDLL(None, use_errno=True))
+    except (OSError, AttributeError):
+        return Poller()
@@ -11,4 +11,6 @@ setup(
     packages=find_packages(),
     long_description=open(join(dirname(__file__), 'README.md')).read(),
     entry_points={'console_scripts': ['mygrep = myapp.app:main']},
+    # `.zst` files are searched as they are without it
+    extras_require={'zstd': ['zstandard']},
 )
@@ -6,7 +6,7 @@ from unittest import mock
 
 import pytest
 
-import myapp.app
+import myapp.occurrence
 
 
 class PathFactory:
@@ -69,5 +69,17 @@ def dir_factory_fixture(path_factory_fixture):
 @pytest.fixture()
 def occurrence_fixture(file_factory_fixture):
     relative_path = file_factory_fixture.get(path='venv/path/file')
-    occurrence = myapp.app.Occurrence(1, 'string', relative_path)
+    occurrence = myapp.occurrence.Occurrence(1, 'string', relative_path)
     return occurrence
+
+
+@pytest.fixture()
+def tree_fixture(tmp_path):
+    """
+    the directory with files and nested directories
+    """
+    for name in ('dir1/dir2', 'dir3', 'empty'):
+        (tmp_path / name).mkdir(parents=True)
+    for name in ('file1', 'file2', 'dir1/file3', 'dir1/dir2/file4', 'dir3/file5'):
+        (tmp_path / name).write_text(f'first line of {name}\nsecond line\n')
+    return tmp_path
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from myapp.aho_corasick import AhoCorasick
+
+
+def first_match(patterns: list[bytes], buffer: bytes) -> tuple[int, int]:
+    """
+    the pattern which ends first, the longest and the first one of equal patterns
+    """
+    for end in range(1, len(buffer) + 1):
+        found = [
+            (-len(pattern), index)
+            for index, pattern in enumerate(patterns)
+            if buffer[:end].endswith(pattern)
+        ]
+        if found:
+            length, index = min(found)
+            return end + length, index
+    return -1, -1
+
+
+@pytest.mark.parametrize(
+    'patterns, buffer, expected',
+    [
+        ([b'he', b'she', b'his', b'hers'], b'ushers', (1, 1)),
+        ([b'hers', b'he'], b'ushers', (2, 1)),
+        ([b'a.c', b'[b]'], b'abc a.c [b]', (4, 0)),
+        ([b'abc', b'abc'], b'xabc', (1, 0)),
+        ([b'abc'], b'ab', (-1, -1)),
+        ([b'x', b''], b'abc', (0, 1)),
+        ([], b'abc', (-1, -1)),
+    ],
+)
+def test_first_match(patterns: list[bytes], buffer: bytes, expected: tuple[int, int]):
+    assert AhoCorasick(patterns).first_match(buffer) == expected
+
+
+def test_random_patterns():
+    generator = random.Random(0)
+
+    def random_bytes(max_length: int) -> bytes:
+        return bytes(
+            generator.choice(b'abc') for _ in range(generator.randint(1, max_length))
+        )
+
+    for _ in range(500):
+        patterns = [random_bytes(4) for _ in range(generator.randint(1, 5))]
+        buffer = random_bytes(30)
+
+        assert AhoCorasick(patterns).first_match(buffer) == first_match(
+            patterns, buffer
+        )
+
+
+def test_bounds():
+    automaton = AhoCorasick([b'needle', b'pin'])
+
+    assert automaton.find(b'needle pin needle', 1) == 7
+    assert automaton.first_match(b'needle pin', 1, 9) == (-1, -1)
+    assert automaton.first_match(b'needle pin', 1, 10) == (7, 1)
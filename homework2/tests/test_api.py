@@ -0,0 +1,147 @@
+import asyncio
+import re
+
+import pytest
+
+import myapp.api
+from myapp.api import SearchOptions
+from myapp.occurrence import Occurrence
+
+
+def test_walk(tree_fixture):
+    files = list(myapp.api.file_walk(tree_fixture))
+
+    assert sorted(files) == sorted(
+        tree_fixture / name
+        for name in ('file1', 'file2', 'dir1/file3', 'dir1/dir2/file4', 'dir3/file5')
+    )
+    # files of a directory go in a row
+    dir1_files = [i for i, file in enumerate(files) if 'dir1' in file.parts]
+    assert dir1_files == list(range(dir1_files[0], dir1_files[0] + 2))
+    # skip if path is symlink or similar
+    assert list(myapp.api.file_walk(tree_fixture / 'not_existing')) == []
+    # iterate over just one file
+    assert list(myapp.api.file_walk(tree_fixture / 'file1')) == [tree_fixture / 'file1']
+
+
+def test_make_matcher():
+    assert isinstance(myapp.api.make_matcher('a.c', True), myapp.api.RegexMatcher)
+    assert isinstance(myapp.api.make_matcher(['a', 'b']), myapp.api.PatternsMatcher)
+    with pytest.raises(ValueError):
+        myapp.api.make_matcher(['a', 'b'], True)
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        SearchOptions(),
+        SearchOptions(jobs=3),
+        SearchOptions(jobs=3, ordered=True),
+        SearchOptions(processes=2),
+    ],
+)
+def test_search(tree_fixture, options):
+    found = [
+        occurrence
+        for batch in myapp.api.search(str(tree_fixture), 'line', options)
+        for occurrence in batch
+    ]
+    first_found = [
+        occurrence
+        for batch in myapp.api.search(
+            tree_fixture, 'line', options._replace(max_count=1)
+        )
+        for occurrence in batch
+    ]
+
+    assert len(found) == 10
+    # only the first occurrence of every file is found
+    assert sorted(first_found) == sorted(
+        occurrence for occurrence in found if occurrence.line_num == 1
+    )
+
+
+def test_search_batches(monkeypatch, tmp_path):
+    monkeypatch.setattr(myapp.api, 'BATCH_SIZE', 2)
+    path = tmp_path / 'file'
+    path.write_text('line\n' * 5)
+
+    batches = list(myapp.api.search(path, 'line'))
+    limited = list(myapp.api.search(path, 'line', SearchOptions(max_count=3)))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [len(batch) for batch in limited] == [2, 1]
+
+
+def test_search_errors(tree_fixture):
+    # errors are raised before the search starts
+    with pytest.raises(FileNotFoundError):
+        myapp.api.search(tree_fixture / 'not_existing', 'line')
+    with pytest.raises(re.error):
+        myapp.api.search(tree_fixture, '(', SearchOptions(regexp=True))
+    with pytest.raises(ValueError):
+        myapp.api.search(tree_fixture, 'line', SearchOptions(processes=2, after=1))
+    with pytest.raises(ValueError):
+        myapp.api.count(tree_fixture, 'line', SearchOptions(processes=2))
+
+
+@pytest.mark.parametrize(
+    'options', [SearchOptions(), SearchOptions(jobs=3, ordered=True)]
+)
+def test_search_context(tree_fixture, options):
+    found = [
+        (occurrence.file_path, occurrence.line_num, occurrence.context)
+        for batch in myapp.api.search(
+            tree_fixture, 'second', options._replace(before=1, max_count=1)
+        )
+        for occurrence in batch
+    ]
+
+    # every file has the found second line after the first line
+    assert found == [
+        (path, num, num == 1)
+        for path in myapp.api.file_walk(tree_fixture)
+        for num in (1, 2)
+    ]
+
+
+@pytest.mark.parametrize('options', [SearchOptions(), SearchOptions(jobs=3)])
+def test_count(tree_fixture, options):
+    (tree_fixture / 'file2').write_text('line\n' * 5)
+
+    counts = list(myapp.api.count(tree_fixture, 'line', options))
+    limited = list(myapp.api.count(tree_fixture, 'line', options._replace(max_count=3)))
+
+    assert sorted(counts) == sorted(
+        (path, 5 if path.name == 'file2' else 2)
+        for path in myapp.api.file_walk(tree_fixture)
+    )
+    assert sorted(file_count.count for file_count in limited) == [2, 2, 2, 2, 3]
+    # files without found lines are not counted
+    assert not list(myapp.api.count(tree_fixture, 'missing', options))
+
+
+def test_search_async(tree_fixture):
+    async def collect():
+        return [batch async for batch in myapp.api.search_async(tree_fixture, 'line')]
+
+    async def take_first():
+        batches = myapp.api.search_async(tree_fixture, ['second', 'first'])
+        batch = await batches.__anext__()
+        await batches.aclose()
+        return batch
+
+    async def cancel():
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert asyncio.run(collect()) == list(myapp.api.search(tree_fixture, 'line'))
+    path = next(myapp.api.file_walk(tree_fixture))
+    assert asyncio.run(take_first()) == [
+        Occurrence(1, f'first line of {path.name}', path, 'first'),
+        Occurrence(2, 'second line', path, 'second'),
+    ]
+    asyncio.run(cancel())
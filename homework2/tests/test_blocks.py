@@ -0,0 +1,71 @@
+from functools import partial
+
+import pytest
+
+import myapp.blocks
+
+
+@pytest.mark.parametrize(
+    'buffer, pattern, expected',
+    [
+        (b'string\nsubstring\n\nsub', b'sub', [(2, 7, 16), (4, 18, 21)]),
+        (b'sub sub\nsub', b'sub', [(1, 0, 7), (2, 8, 11)]),
+        (b'first\nsecond\n', b'', [(1, 0, 5), (2, 6, 12)]),
+        (b'first\nsecond', b'\n', [(1, 0, 5)]),
+        (b'first\r\nsecond\r\n', b'second', [(2, 7, 14)]),
+        (b'first\nsecond\n', b'third', []),
+        (b'', b'', []),
+    ],
+)
+def test_find_lines(buffer: bytes, pattern: bytes, expected: list):
+    assert (
+        list(myapp.blocks.find_lines(buffer, partial(buffer.find, pattern))) == expected
+    )
+
+
+@pytest.mark.parametrize(
+    'buffer, pattern, expected',
+    [
+        (b'string\nsubstring\n\nsub', b'sub', 2),
+        (b'sub sub\nsub\n', b'sub', 2),
+        (b'first\nsecond\n', b'', 2),
+        (b'first\nsecond', b'third', 0),
+        (b'', b'', 0),
+    ],
+)
+def test_count_lines(buffer: bytes, pattern: bytes, expected: int):
+    assert myapp.blocks.count_lines(buffer, partial(buffer.find, pattern)) == expected
+
+
+def test_find_lines_first_number():
+    buffer = b'a\nb\n'
+
+    assert list(myapp.blocks.find_lines(buffer, partial(buffer.find, b'b'), 10)) == [
+        (11, 2, 3)
+    ]
+
+
+def test_iter_blocks(monkeypatch):
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', 4)
+
+    assert list(myapp.blocks.iter_blocks(b'ab\ncdefgh\nij\nk')) == [
+        b'ab\ncdefgh\n',
+        b'ij\nk',
+    ]
+    assert list(myapp.blocks.iter_blocks(b'abcd\n')) == [b'abcd\n']
+    assert not list(myapp.blocks.iter_blocks(b''))
+
+
+def test_join_blocks(monkeypatch):
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', 4)
+
+    assert list(myapp.blocks.join_blocks([b'ab\ncd', b'ef', b'gh\nij\nk'])) == [
+        b'ab\n',
+        b'cdefgh\nij\n',
+        b'k',
+    ]
+    assert list(myapp.blocks.join_blocks([b'abcd\n', b'', b'ef\n'])) == [
+        b'abcd\n',
+        b'ef\n',
+    ]
+    assert not list(myapp.blocks.join_blocks([b'']))
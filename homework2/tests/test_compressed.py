@@ -0,0 +1,62 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+import myapp.compressed
+
+
+@pytest.mark.parametrize(
+    'data, name',
+    [
+        (gzip.compress(b'line\n'), 'gzip'),
+        (bz2.compress(b'line\n'), 'bzip2'),
+        (lzma.compress(b'line\n'), 'xz'),
+        (b'line\n', None),
+        (b'', None),
+    ],
+)
+def test_detect(data: bytes, name: str):
+    compression = myapp.compressed.detect(data[: myapp.compressed.MAGIC_SIZE])
+
+    assert (compression and compression.name) == name
+
+
+def test_decompress(monkeypatch):
+    monkeypatch.setattr(myapp.compressed, 'CHUNK_SIZE', 8)
+    data = b''.join(f'{i} line\n'.encode() for i in range(100))
+    compressed = gzip.compress(data[:300]) + gzip.compress(data[300:])
+    compression = myapp.compressed.detect(compressed)
+
+    assert b''.join(myapp.compressed.decompress(compressed, compression)) == data
+    # the damaged archive is decompressed up to the damage
+    damaged = gzip.compress(data[:300]) + b'\x1f\x8bdamaged'
+    assert b''.join(myapp.compressed.decompress(damaged, compression)) == data[:300]
+
+
+@pytest.mark.parametrize('compress', [gzip.compress, bz2.compress, lzma.compress])
+def test_decompress_bounded(monkeypatch, compress):
+    monkeypatch.setattr(myapp.compressed, 'MAX_OUTPUT_SIZE', 1000)
+    # the whole stream fits into one chunk and expands a thousand times
+    data = bytes(100_000) + b'end\n'
+    compressed = compress(data) + compress(b'next stream\n')
+    compression = myapp.compressed.detect(compressed)
+
+    chunks = list(myapp.compressed.decompress(compressed, compression))
+
+    assert len(compressed) < myapp.compressed.CHUNK_SIZE
+    assert max(map(len, chunks)) <= 1000
+    assert b''.join(chunks) == data + b'next stream\n'
+
+
+def test_read_ahead():
+    assert list(myapp.compressed.read_ahead(iter([b'a', b'', b'b']))) == [
+        b'a',
+        b'',
+        b'b',
+    ]
+
+    chunks = myapp.compressed.read_ahead(iter([b'a', b'b']))
+    assert next(chunks) == b'a'
+    chunks.close()
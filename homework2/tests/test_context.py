@@ -0,0 +1,92 @@
+import gzip
+import pathlib
+
+import pytest
+
+import myapp.blocks
+import myapp.context
+import myapp.search
+from myapp.context import Context
+from myapp.occurrence import Occurrence
+
+
+def expected_context(
+    lines: list[str], pattern: str, context: Context, max_count=None
+) -> list[tuple[int, bool]]:
+    """
+    numbers of found lines and context lines like `grep -n -B -A`
+    """
+    found = [num for num, line in enumerate(lines, start=1) if pattern in line]
+    found = found[:max_count]
+    printed = set()
+    for num in found:
+        printed.update(range(num - context.before, num + context.after + 1))
+    return [
+        (num, num not in found) for num in range(1, len(lines) + 1) if num in printed
+    ]
+
+
+@pytest.mark.parametrize('block_size', [1, 8, 1024])
+@pytest.mark.parametrize(
+    'context', [Context(2, 1), Context(0, 3), Context(4, 0), Context(0, 0)]
+)
+@pytest.mark.parametrize('max_count', [None, 2])
+def test_search_context(monkeypatch, block_size, context, max_count):
+    # small blocks keep context lines in the ring and after the block
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', block_size)
+    path = pathlib.Path('file')
+    lines = [f'{i} x' if i in (3, 4, 9, 20, 30) else f'{i} .' for i in range(1, 32)]
+    lines[5] = ''
+    buffer = '\n'.join(lines).encode()
+
+    found = list(
+        myapp.context.search_context(
+            path,
+            myapp.search.SubstringMatcher('x'),
+            myapp.blocks.iter_blocks(buffer),
+            context,
+            max_count,
+        )
+    )
+
+    assert [(occurrence.line_num, occurrence.context) for occurrence in found] == (
+        expected_context(lines, 'x', context, max_count)
+    )
+    assert all(
+        occurrence.text == lines[occurrence.line_num - 1] for occurrence in found
+    )
+
+
+def test_search_context_last_lines():
+    path = pathlib.Path('file')
+    blocks = [b'a\n\n', b'b\n', b'c\n', b'match\n', b'd']
+
+    found = list(
+        myapp.context.search_context(
+            path, myapp.search.RegexMatcher('^m'), blocks, Context(4, 2)
+        )
+    )
+
+    assert found == [
+        Occurrence(1, 'a', path, context=True),
+        Occurrence(2, '', path, context=True),
+        Occurrence(3, 'b', path, context=True),
+        Occurrence(4, 'c', path, context=True),
+        Occurrence(5, 'match', path),
+        Occurrence(6, 'd', path, context=True),
+    ]
+
+
+def test_file_context(tmp_path):
+    path = tmp_path / 'log.gz'
+    path.write_bytes(gzip.compress(b'first\nsecond\nthird\n'))
+    binary = tmp_path / 'binary'
+    binary.write_bytes(b'\x00first\nsecond\n')
+    matcher = myapp.search.SubstringMatcher('second')
+
+    assert list(myapp.context.file_context(path, matcher, Context(after=1))) == [
+        Occurrence(2, 'second', path),
+        Occurrence(3, 'third', path, context=True),
+    ]
+    assert not list(myapp.context.file_context(binary, matcher, Context(1, 1)))
+    assert len(list(myapp.context.file_context(binary, matcher, Context(1), True))) == 2
@@ -0,0 +1,109 @@
+import pathlib
+
+import pytest
+
+import myapp.filters
+import myapp.index
+from myapp.walker import iter_files
+
+
+def walk(root: pathlib.Path, path_filter: myapp.filters.PathFilter) -> list[str]:
+    return sorted(
+        pathlib.Path(path).relative_to(root).as_posix()
+        for path in iter_files(str(root), path_filter.for_root(str(root)))
+    )
+
+
+def test_is_binary(monkeypatch):
+    assert myapp.filters.is_binary(b'text\x00')
+    assert not myapp.filters.is_binary('текст\n'.encode())
+    assert not myapp.filters.is_binary(b'')
+
+    monkeypatch.setattr(myapp.filters, 'SNIFF_SIZE', 4)
+    assert not myapp.filters.is_binary(b'text\x00')
+
+
+@pytest.mark.parametrize(
+    'line, path, matched',
+    [
+        ('*.log', 'app.log', True),
+        ('*.log', 'logs/app.log', True),
+        ('*.log', 'app.log.1', False),
+        ('/build', 'build', True),
+        ('/build', 'src/build', False),
+        ('src/*.o', 'src/main.o', True),
+        ('src/*.o', 'src/lib/main.o', False),
+        ('**/cache', 'a/b/cache', True),
+        ('docs/**/*.md', 'docs/a/b/readme.md', True),
+        ('docs/**/*.md', 'docs/readme.md', True),
+        ('docs/**', 'docs/a/readme.md', True),
+        ('docs/**', 'docs', False),
+        ('file[0-9]', 'file1', True),
+        ('file[!0-9]', 'file1', False),
+        ('file?', 'file12', False),
+        ('\\#notes', '#notes', True),
+        ('trailing   ', 'trailing', True),
+    ],
+)
+def test_parse_gitignore_line(line: str, path: str, matched: bool):
+    rule = myapp.filters.parse_gitignore_line(line)
+
+    assert bool(rule.regex.fullmatch(path)) == matched
+
+
+@pytest.mark.parametrize('line', ['', '# comment', '   ', '/'])
+def test_parse_gitignore_empty_line(line: str):
+    assert myapp.filters.parse_gitignore_line(line) is None
+
+
+def test_gitignore(tree_fixture):
+    (tree_fixture / '.gitignore').write_text('file*\n!file2\ndir2/\n')
+    (tree_fixture / 'dir3' / '.gitignore').write_text('!file5\n')
+    (tree_fixture / '.git').mkdir()
+    (tree_fixture / '.git' / 'HEAD').write_text('ref: refs/heads/master\n')
+
+    assert walk(tree_fixture, myapp.filters.PathFilter()) == [
+        '.gitignore',
+        'dir3/.gitignore',
+        'dir3/file5',
+        'file2',
+    ]
+    # `.gitignore` files of parents are used when the subdirectory is searched
+    assert walk(tree_fixture / 'dir1', myapp.filters.PathFilter()) == []
+    assert len(walk(tree_fixture, myapp.filters.PathFilter(gitignore=False))) == 8
+
+
+def test_globs(tree_fixture):
+    (tree_fixture / 'dir3' / 'file5.log').write_text('log\n')
+
+    assert walk(
+        tree_fixture,
+        myapp.filters.PathFilter(include=['file[1-3]', '*.log'], exclude=['file1']),
+    ) == ['dir1/file3', 'dir3/file5.log', 'file2']
+    assert walk(tree_fixture, myapp.filters.PathFilter(exclude_dir=['dir[13]'])) == [
+        'file1',
+        'file2',
+    ]
+
+
+def test_make_index_filter(tree_fixture):
+    with myapp.index.TrigramIndex(tree_fixture) as index:
+        index.update()
+    (tree_fixture / 'new').write_text('new file\n')
+    changed = tree_fixture / 'file2'
+    changed.write_text('another content\n')
+    removed = tree_fixture / 'dir3' / 'file5'
+    removed.unlink()
+
+    may_match = myapp.filters.make_index_filter(tree_fixture, [b'file1'])
+
+    assert may_match(tree_fixture / 'file1')
+    assert not may_match(tree_fixture / 'dir1' / 'file3')
+    assert may_match(tree_fixture / 'new')
+    assert may_match(changed)
+    assert may_match(removed)
+    assert not may_match(tree_fixture / myapp.index.INDEX_NAME)
+    # the short literal does not narrow files
+    assert myapp.filters.make_index_filter(tree_fixture, [b'f'])(
+        tree_fixture / 'dir1' / 'file3'
+    )
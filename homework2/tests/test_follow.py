@@ -0,0 +1,115 @@
+# pylint: disable=W0621, W0212
+import gzip
+import pathlib
+
+import pytest
+
+import myapp.follow
+import myapp.watch
+from myapp.api import SearchOptions
+from myapp.occurrence import Occurrence
+
+
+@pytest.fixture()
+def poll(monkeypatch):
+    # changes are checked right away, the test makes a change before every step
+    monkeypatch.setattr(myapp.follow, 'make_watcher', myapp.watch.Poller)
+    monkeypatch.setattr(myapp.watch, 'POLL_INTERVAL', 0)
+
+
+def lines(batch: list[Occurrence]) -> list[tuple[str, int, str]]:
+    return [
+        (occurrence.file_path.name, occurrence.line_num, occurrence.text)
+        for occurrence in batch
+    ]
+
+
+@pytest.mark.usefixtures('poll')
+def test_follow(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_text('error one\nok\nerror two\n')
+    partial = tmp_path / 'partial.log'
+    partial.write_text('error partial')
+
+    followed = myapp.follow.follow(tmp_path, 'error')
+
+    assert lines(next(followed)) == [
+        ('app.log', 1, 'error one'),
+        ('app.log', 3, 'error two'),
+    ]
+    with log.open('a') as file:
+        file.write('ok\nerror three\n')
+    assert lines(next(followed)) == [('app.log', 5, 'error three')]
+    # the last line is searched when it is written completely
+    with partial.open('a') as file:
+        file.write(' done\nerror\n')
+    assert lines(next(followed)) == [
+        ('partial.log', 1, 'error partial done'),
+        ('partial.log', 2, 'error'),
+    ]
+    followed.close()
+
+
+@pytest.mark.usefixtures('poll')
+def test_follow_rotation(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_text('error one\n')
+    followed = myapp.follow.follow(tmp_path, 'error')
+    next(followed)
+
+    # the renamed file is not searched again, the new file is searched from the start
+    log.rename(tmp_path / 'app.log.1')
+    log.write_text('error new\n')
+    assert lines(next(followed)) == [('app.log', 1, 'error new')]
+    # the truncated file is searched from the start
+    log.write_text('error\n')
+    assert lines(next(followed)) == [('app.log', 1, 'error')]
+    (tmp_path / 'dir').mkdir()
+    (tmp_path / 'dir' / 'new.log').write_text('ok\nerror in dir\n')
+    assert lines(next(followed)) == [('new.log', 2, 'error in dir')]
+    followed.close()
+
+
+@pytest.mark.usefixtures('poll')
+def test_follow_options(tmp_path):
+    log = tmp_path / 'app.log'
+    log.write_text('error one\nerror two\n')
+    (tmp_path / 'binary').write_bytes(b'error\x00\n')
+    with gzip.open(tmp_path / 'old.log.gz', 'wt') as file:
+        file.write('error old\n')
+
+    followed = myapp.follow.follow(log.parent, 'error', SearchOptions(max_count=3))
+
+    assert sorted(lines(next(followed)) + lines(next(followed))) == [
+        ('app.log', 1, 'error one'),
+        ('app.log', 2, 'error two'),
+        ('old.log.gz', 1, 'error old'),
+    ]
+    with log.open('a') as file:
+        file.write('error three\nerror four\n')
+    assert lines(next(followed)) == [('app.log', 3, 'error three')]
+    followed.close()
+
+    single = myapp.follow.follow(log, ['four', 'three'])
+    assert [occurrence.pattern for occurrence in next(single)] == ['three', 'four']
+    single.close()
+
+
+def test_follow_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        myapp.follow.follow(tmp_path / 'not_existing', 'error')
+
+
+def test_directory_recorder(tree_fixture):
+    directories: list[str] = []
+    recorder = myapp.follow._DirectoryRecorder(None, directories)
+
+    files = list(myapp.follow.file_walk(tree_fixture, recorder))
+
+    assert len(files) == 5
+    assert sorted(pathlib.Path(path).name for path in directories) == [
+        'dir1',
+        'dir2',
+        'dir3',
+        'empty',
+    ]
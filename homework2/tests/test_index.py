@@ -0,0 +1,249 @@
+# pylint: disable=W0621
+import gzip
+import os
+import pathlib
+import sqlite3
+import string
+
+import pytest
+
+import myapp.app
+import myapp.index
+
+
+@pytest.fixture()
+def index_fixture(tree_fixture):
+    with myapp.index.TrigramIndex(tree_fixture) as index:
+        yield index
+
+
+def candidate_names(index: myapp.index.TrigramIndex, literals: list[bytes]):
+    candidates = index.candidates(literals)
+    if candidates is None:
+        return None
+    return sorted(name for name, file in index.files().items() if file.id in candidates)
+
+
+def test_trigrams():
+    assert myapp.index.trigrams(b'abcab') == {
+        int.from_bytes(trigram, 'big') for trigram in (b'abc', b'bca', b'cab')
+    }
+    assert not myapp.index.trigrams(b'ab')
+
+
+def test_find_index(tree_fixture):
+    assert myapp.index.find_index(tree_fixture / 'dir1') is None
+
+    (tree_fixture / myapp.index.INDEX_NAME).touch()
+
+    assert myapp.index.find_index(tree_fixture / 'dir1' / 'dir2') == tree_fixture
+    assert myapp.index.find_index(tree_fixture) == tree_fixture
+
+
+def test_update(tree_fixture, index_fixture):
+    assert index_fixture.update() == myapp.index.UpdateStats(5, 0, 0, 0)
+    assert index_fixture.update() == myapp.index.UpdateStats(0, 0, 0, 5)
+    assert candidate_names(index_fixture, [b'of dir']) == [
+        'dir1/dir2/file4',
+        'dir1/file3',
+        'dir3/file5',
+    ]
+
+    (tree_fixture / 'dir1' / 'file3').write_text('changed\n')
+    (tree_fixture / 'dir3' / 'file5').unlink()
+    (tree_fixture / 'file6').write_text('first line of dir6\n')
+
+    assert index_fixture.update() == myapp.index.UpdateStats(1, 1, 1, 3)
+    assert candidate_names(index_fixture, [b'of dir']) == [
+        'dir1/dir2/file4',
+        'file6',
+    ]
+    assert candidate_names(index_fixture, [b'changed', b'file1']) == [
+        'dir1/file3',
+        'file1',
+    ]
+    assert candidate_names(index_fixture, [b'missing']) == []
+    assert candidate_names(index_fixture, [b'changed', b'ch']) is None
+
+
+def test_big_files(monkeypatch, tree_fixture, index_fixture):
+    monkeypatch.setattr(myapp.index, 'MAX_FILE_SIZE', 32)
+    (tree_fixture / 'big').write_text('the file which is bigger than the limit\n')
+
+    index_fixture.update()
+
+    assert not index_fixture.files()['big'].indexed
+    assert index_fixture.files()['file1'].indexed
+
+
+def test_binary_files(monkeypatch, tree_fixture, index_fixture):
+    monkeypatch.setattr(myapp.index, 'MAX_TRIGRAMS', 30)
+    (tree_fixture / 'binary').write_bytes(bytes(range(256)))
+
+    index_fixture.update()
+
+    assert not index_fixture.files()['binary'].indexed
+    assert index_fixture.files()['file1'].indexed
+    assert index_fixture.candidates([b'\x01\x02\x03']) == set()
+
+
+def test_compressed_files(tree_fixture, index_fixture):
+    (tree_fixture / 'log.gz').write_bytes(gzip.compress(b'compressed line\n'))
+
+    index_fixture.update()
+
+    # trigrams of compressed bytes are not trigrams of lines
+    assert not index_fixture.files()['log.gz'].indexed
+
+
+def test_unreadable_file(monkeypatch, index_fixture):
+    def read_bytes(path: pathlib.Path) -> bytes:
+        if path.name == 'file1':
+            raise PermissionError(path)
+        return original(path)
+
+    original = pathlib.Path.read_bytes
+    monkeypatch.setattr(pathlib.Path, 'read_bytes', read_bytes)
+
+    assert index_fixture.update() == myapp.index.UpdateStats(5, 0, 0, 0)
+    # the file is always searched
+    assert not index_fixture.files()['file1'].indexed
+    assert index_fixture.files()['file2'].indexed
+
+
+def test_versions(tree_fixture, index_fixture):
+    index_fixture.update()
+    index_fixture.close()
+    connection = sqlite3.connect(tree_fixture / myapp.index.INDEX_NAME)
+    connection.execute('PRAGMA user_version = 0')
+    connection.close()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        myapp.index.TrigramIndex(tree_fixture, readonly=True)
+    # the writable index of another version is rebuilt
+    with myapp.index.TrigramIndex(tree_fixture) as index:
+        assert not index.files()
+        assert index.update() == myapp.index.UpdateStats(5, 0, 0, 0)
+
+
+def test_readonly(tree_fixture):
+    with pytest.raises(sqlite3.DatabaseError):
+        myapp.index.TrigramIndex(tree_fixture, readonly=True)
+    assert not os.listdir(tree_fixture / 'empty')
+    assert not (tree_fixture / myapp.index.INDEX_NAME).exists()
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_run_with_index(capsys, monkeypatch, tree_fixture, jobs):
+    monkeypatch.chdir(tree_fixture)
+    monkeypatch.setattr('sys.argv', ['mygrep', '--build-index', '.'])
+    myapp.app.main()
+    assert capsys.readouterr().out == (
+        'files: 5 added, 0 updated, 0 removed, 0 unchanged\n'
+    )
+    # changed files are searched even if the index is not updated
+    (tree_fixture / 'file2').write_text('file1\n')
+
+    monkeypatch.setattr('sys.argv', ['mygrep', 'dir1', 'file', '-j', jobs])
+    myapp.app.main()
+    monkeypatch.setattr('sys.argv', ['mygrep', '.', 'file1', '-j', jobs])
+    myapp.app.main()
+
+    assert sorted(capsys.readouterr().out.splitlines()) == [
+        'dir1/dir2/file4 line=1: first line of dir1/dir2/file4',
+        'dir1/file3 line=1: first line of dir1/file3',
+        'file1 line=1: first line of file1',
+        'file2 line=1: file1',
+    ]
+
+
+def test_run_with_broken_index(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / myapp.index.INDEX_NAME).write_bytes(b'not a database')
+
+    myapp.app.run(myapp.app.parse_args(['dir3', 'line']))
+
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+@pytest.mark.parametrize('path', ['file1', 'not_existing'])
+def test_index_not_directory(monkeypatch, tree_fixture, path):
+    monkeypatch.chdir(tree_fixture)
+
+    with pytest.raises(SystemExit):
+        myapp.app.run_index(myapp.app.parse_args([path, '--build-index']))
+
+
+def test_build_index_filters(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / '.git').mkdir()
+    (tree_fixture / '.git' / 'HEAD').write_text('ref: refs/heads/master\n')
+    (tree_fixture / '.gitignore').write_text('ignored\n')
+    (tree_fixture / 'ignored').write_text('first line of ignored\n')
+
+    monkeypatch.setattr('sys.argv', ['mygrep', '--build-index', '.'])
+    myapp.app.main()
+
+    # files which the search skips are not indexed
+    assert capsys.readouterr().out.startswith('files: 6 added')
+    with myapp.index.TrigramIndex(tree_fixture, readonly=True) as index:
+        assert not {'.git/HEAD', 'ignored'} & index.files().keys()
+    monkeypatch.setattr('sys.argv', ['mygrep', '--build-index', '.', '--no-ignore'])
+    myapp.app.main()
+    assert capsys.readouterr().out.startswith('files: 2 added')
+
+
+def test_build_index_args(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / 'index').write_text('the index is searched as a word\n')
+
+    with pytest.raises(SystemExit):
+        myapp.app.parse_args(['--build-index', '.', 'line'])
+    # the word `index` is a substring like any other
+    monkeypatch.setattr('sys.argv', ['mygrep', '.', 'index'])
+    myapp.app.main()
+
+    assert capsys.readouterr().out.endswith(
+        'index line=1: the index is searched as a word\n'
+    )
+    assert not (tree_fixture / myapp.index.INDEX_NAME).exists()
+
+
+def test_run_with_unindexed_file(capsys, monkeypatch, tree_fixture):
+    monkeypatch.setattr(myapp.index, 'MAX_TRIGRAMS', 30)
+    monkeypatch.chdir(tree_fixture)
+    # the file has too many trigrams to be indexed
+    (tree_fixture / 'many').write_text('needle ' + ''.join(map(chr, range(65, 123))))
+    myapp.app.run_index(myapp.app.parse_args(['.', '--build-index']))
+    capsys.readouterr()
+    with myapp.index.TrigramIndex(tree_fixture, readonly=True) as index:
+        assert not index.files()['many'].indexed
+
+    myapp.app.run(myapp.app.parse_args(['.', 'needle']))
+
+    assert capsys.readouterr().out.startswith('many line=1: needle ')
+
+
+def test_run_over_max_trigrams(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    letters = string.ascii_lowercase + string.digits
+    # every triple of letters is a distinct trigram
+    words = (
+        first + second + third
+        for first in letters
+        for second in letters
+        for third in letters
+    )
+    (tree_fixture / 'many').write_text(' '.join(words) + '\nneedle\n')
+    myapp.app.run_index(myapp.app.parse_args(['.', '--build-index']))
+    capsys.readouterr()
+    with myapp.index.TrigramIndex(tree_fixture, readonly=True) as index:
+        assert (
+            len(myapp.index.trigrams((tree_fixture / 'many').read_bytes()))
+            > myapp.index.MAX_TRIGRAMS
+        )
+        assert not index.files()['many'].indexed
+
+    myapp.app.run(myapp.app.parse_args(['.', 'needle']))
+
+    assert capsys.readouterr().out == 'many line=2: needle\n'
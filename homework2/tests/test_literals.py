@@ -0,0 +1,36 @@
+import re
+from typing import Optional
+
+import pytest
+
+from myapp.literals import required_literals
+
+
+@pytest.mark.parametrize(
+    'pattern, expected',
+    [
+        (r'handled in 9\d ms', ['handled in 9']),
+        (r'\d+ ms', [' ms']),
+        (r'ERROR|WARN', ['ERROR', 'WARN']),
+        (r'(ERROR|WARN): \d', ['ERROR', 'WARN']),
+        (r'(ERROR|WARNING) in module', [' in module']),
+        (r'(abc)def', ['abcdef']),
+        (r'(?:abc)+d', ['abc']),
+        (r'a.*bc', ['bc']),
+        (r'привет.*мир', ['привет']),
+        (r'ab(?i:cd)ef', ['ab']),
+        (r'(?i)abc', None),
+        (r'x?', None),
+        (r'(ERROR|)', None),
+        (r'(ERROR|\d)', None),
+        (r'[abc]\d', None),
+        ('', None),
+    ],
+)
+def test_required_literals(pattern: str, expected: Optional[list[str]]):
+    assert required_literals(pattern) == expected
+
+
+def test_invalid_pattern():
+    with pytest.raises(re.error):
+        required_literals('(unclosed')
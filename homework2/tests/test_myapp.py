@@ -1,13 +1,16 @@
 # pylint: disable=W0621, E0239, R0913
 import argparse
 import pathlib
-from io import StringIO
 from typing import Union
 from unittest import mock
 
 import pytest
 
+import myapp.api
 import myapp.app
+import myapp.occurrence
+import myapp.output
+import myapp.search
 
 
 @pytest.mark.parametrize(
@@ -46,6 +49,7 @@ def test_valid_argument_parsing(
         (['12'],),
         (['--help'],),
         (['.', 'world', 'world'],),
+        (['.', 'world', '--follow', '-j', '2'],),
     ],
 )
 def test_invalid_argument_parsing(args: list[str]):
@@ -54,77 +58,20 @@ def test_invalid_argument_parsing(args: list[str]):
         myapp.app.parse_args(args)
 
 
-def test_walk(path_factory_fixture, dir_factory_fixture, file_factory_fixture):
-    path = path_factory_fixture.get()
-    path.is_file.return_value = False
-    path.is_dir.return_value = False
+def test_search_file(tmp_path):
+    path = tmp_path / 'file'
+    path.write_text('string\n')
 
-    dir1 = dir_factory_fixture.get()
-    dir2 = dir_factory_fixture.get()
-    dir3 = dir_factory_fixture.get()
-
-    file1 = file_factory_fixture.get()
-    file2 = file_factory_fixture.get()
-    file3 = file_factory_fixture.get()
-    file4 = file_factory_fixture.get()
-    file5 = file_factory_fixture.get()
-    file6 = file_factory_fixture.get()
-
-    # directories content
-    dir3.iterdir.return_value = [file6]
-    dir2.iterdir.return_value = [file4, dir3]
-    dir1.iterdir.return_value = [file1, file2, file3, dir2, file5, path]
-
-    assert list(myapp.app.file_walk(dir1)) == [
-        file1,
-        file2,
-        file3,
-        file4,
-        file6,
-        file5,
-    ]  # normal use
-    assert list(myapp.app.file_walk(path)) == []  # skip if path is symlink or similar
-    assert list(myapp.app.file_walk(file1)) == [file1]  # iterate over just one file
-
-
-def test_find_occurrences(file_factory_fixture):
-    buffer = StringIO('string\n')
-
-    path = file_factory_fixture.get(path='/file')
-
-    assert list(myapp.app.find_occurrences(path, buffer, 'str')) == [
-        myapp.app.Occurrence(1, 'string', path),
+    assert list(
+        myapp.search.search_file(path, myapp.search.SubstringMatcher('str'))
+    ) == [
+        myapp.occurrence.Occurrence(1, 'string', path),
     ]
-    buffer.seek(0)
-    assert list(myapp.app.find_occurrences(path, buffer, 'car')) == []
-
-
-@mock.patch('pathlib.Path', spec=pathlib.Path)
-def test_get_relative_path_view(pathlib_mock, file_factory_fixture):
-    relative_path = file_factory_fixture.get(path='dir/file')
-    pathlib_mock.return_value = pathlib_mock
-
-    output = myapp.app.get_relative_path_view(relative_path)
-
-    relative_path.relative_to.assert_called_once()
-    pathlib_mock.assert_called_once()
-    pathlib_mock.absolute.assert_called_once()
-    assert output == 'dir/file'
-
-
-def test_format_occurrence(occurrence_fixture):
-    assert (
-        myapp.app.format_occurrence(occurrence_fixture)
-        == 'venv/path/file line=1: string'
+    assert not list(
+        myapp.search.search_file(path, myapp.search.SubstringMatcher('car'))
     )
 
 
-def test_print_occurrence(capsys, occurrence_fixture):
-    myapp.app.print_occurrence(occurrence_fixture)
-    captured = capsys.readouterr()
-    assert captured.out == 'venv/path/file line=1: string\n'
-
-
 @mock.patch('pathlib.Path', spec=pathlib.Path)
 def test_file_does_not_exists_handler(pathlib_mock, capsys, file_factory_fixture):
     with pytest.raises(SystemExit):
@@ -138,20 +85,39 @@ def test_file_does_not_exists_handler(pathlib_mock, capsys, file_factory_fixture
     pathlib_mock.assert_called_once()
 
 
-@mock.patch('myapp.app.file_walk')
-@mock.patch('myapp.app.find_occurrences')
-@mock.patch('myapp.app.print_occurrence')
+@mock.patch('myapp.api.file_walk')
+@mock.patch('myapp.api.search_file')
+@mock.patch('myapp.app.OccurrenceWriter')
 def test_run(
-    print_occurrence_mock,
-    find_occurrences_mock,
+    writer_mock,
+    search_file_mock,
     file_walk_mock,
     occurrence_fixture,
     file_factory_fixture,
 ):
     file_path_mock = file_factory_fixture.get(path='string')
-    parsed_args = argparse.Namespace(substring='venv/path', path=file_path_mock)
+    parsed_args = argparse.Namespace(
+        substring='venv/path',
+        patterns=None,
+        regexp=False,
+        path=file_path_mock,
+        text=False,
+        include=[],
+        exclude=[],
+        exclude_dir=[],
+        no_ignore=True,
+        output_format='text',
+        processes=None,
+        jobs=1,
+        ordered=False,
+        max_count=None,
+        before_context=0,
+        after_context=0,
+        count=False,
+        follow=False,
+    )
 
-    find_occurrences_mock.return_value = [occurrence_fixture]
+    search_file_mock.side_effect = lambda *args: (item for item in [occurrence_fixture])
     file_walk_mock.return_value = [
         file_factory_fixture.get(
             path='venv/path/file1', content='string\nsssubbbstring\n\nsubstring'
@@ -159,8 +125,163 @@ def test_run(
         file_factory_fixture.get(path='venv/path/file2', content='\nsssubbbstring'),
     ]
 
+    with mock.patch('myapp.filters.find_index', return_value=None) as find_index_mock:
+        myapp.app.run(parsed_args)
+
+    file_walk_mock.assert_called_once_with(file_path_mock, mock.ANY)
+    find_index_mock.assert_called_once_with(file_path_mock)
+
+    writer_mock.return_value.write.assert_called_with([occurrence_fixture])
+    writer_mock.return_value.flush.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    'args', [['--jobs', '3', '--ordered'], ['--jobs', '3'], ['--processes', '2']]
+)
+def test_run_parallel(capsys, monkeypatch, tree_fixture, args):
+    monkeypatch.chdir(tree_fixture)
+    parsed_args = myapp.app.parse_args(['.', 'line', *args])
+
     myapp.app.run(parsed_args)
 
-    file_walk_mock.assert_called_once_with(file_path_mock)
+    expected = [
+        myapp.output.format_occurrence(occurrence)
+        for file in myapp.api.file_walk(tree_fixture)
+        for occurrence in myapp.search.search_file(
+            file, myapp.search.SubstringMatcher('line')
+        )
+    ]
+    lines = capsys.readouterr().out.splitlines()
+    # only threads print files in the order of completion by default
+    if args == ['--jobs', '3']:
+        lines, expected = sorted(lines), sorted(expected)
+    assert lines == expected
+
+
+@pytest.mark.parametrize('option', ['--jobs', '--processes'])
+@pytest.mark.parametrize('jobs', ['0', '-1', 'many'])
+def test_invalid_jobs(option, jobs):
+    with pytest.raises(SystemExit):
+        myapp.app.parse_args(['.', 'world', option, jobs])
+
+
+def test_patterns_file(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / 'patterns').write_text('file1\nfile5\n')
+
+    parsed_args = myapp.app.parse_args(['dir3', '-f', 'patterns'])
+    assert parsed_args.substring is None
+    assert parsed_args.patterns == ['file1', 'file5']
+
+    myapp.app.run(myapp.app.parse_args(['.', '-f', 'patterns']))
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(
+        [
+            'file1 line=1 pattern=file1: first line of file1',
+            'dir3/file5 line=1 pattern=file5: first line of dir3/file5',
+            'patterns line=1 pattern=file1: file1',
+            'patterns line=2 pattern=file5: file5',
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        ['.', '-f', 'not_existing_file'],
+        ['.', 'world', '-f', 'patterns'],
+        ['.', '-E', '(unclosed'],
+        ['.', '-E', '-f', 'patterns'],
+        ['.', 'world', '--json', '--null'],
+        ['.', 'world', '--jobs', '2', '--processes', '2'],
+        ['.', 'world', '-A', '-1'],
+        ['.', 'world', '-C', '1', '--processes', '2'],
+        ['.', 'world', '-c', '--follow'],
+    ],
+)
+def test_invalid_query(monkeypatch, tree_fixture, args: list[str]):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / 'patterns').write_text('world\n')
+
+    with pytest.raises(SystemExit):
+        myapp.app.parse_args(args)
+
+
+def test_regexp(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    myapp.app.run(myapp.app.parse_args(['dir1', '-E', r' dir\d/(dir\d/)?file4$']))
+
+    assert capsys.readouterr().out == (
+        'dir1/dir2/file4 line=1: first line of dir1/dir2/file4\n'
+    )
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_skipped_files(capsys, monkeypatch, tree_fixture, jobs):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / '.gitignore').write_text('file1\n')
+    (tree_fixture / 'dir3' / 'binary').write_bytes(b'\x00first line\n')
+    args = ['.', 'first', '--exclude-dir', 'dir1', '--exclude', 'file2', '-j', jobs]
+
+    myapp.app.run(myapp.app.parse_args(args))
+    assert capsys.readouterr().out == 'dir3/file5 line=1: first line of dir3/file5\n'
+
+    myapp.app.run(myapp.app.parse_args([*args, '--include', 'file*', '--no-ignore']))
+    assert sorted(capsys.readouterr().out.splitlines()) == [
+        'dir3/file5 line=1: first line of dir3/file5',
+        'file1 line=1: first line of file1',
+    ]
+
+    myapp.app.run(myapp.app.parse_args([*args, '--include', 'binary', '-a']))
+    assert capsys.readouterr().out == 'dir3/binary line=1: \x00first line\n'
+
+
+@pytest.mark.parametrize(
+    'option, output',
+    [
+        ('--null', 'dir3/file5\0line=2: second line\n'),
+        (
+            '--json',
+            '{"path": "dir3/file5", "line": 2, "text": "second line"}\n',
+        ),
+    ],
+)
+def test_output_format(capsys, monkeypatch, tree_fixture, option, output):
+    monkeypatch.chdir(tree_fixture)
+
+    myapp.app.run(myapp.app.parse_args(['dir3', 'second', option]))
+
+    assert capsys.readouterr().out == output
+
+
+def test_max_count(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+
+    myapp.app.run(myapp.app.parse_args(['.', 'line', '-m', '1']))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 5
+    assert all(' line=1: ' in line for line in lines)
+
+
+def test_context(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+    (tree_fixture / 'file2').write_text('a\nfound\nb\nc\nd\nfound\n')
+
+    myapp.app.run(myapp.app.parse_args(['file2', 'found', '-C', '1', '-B', '0']))
+
+    assert capsys.readouterr().out.splitlines() == [
+        'file2 line=2: found',
+        'file2 line=3- b',
+        '--',
+        'file2 line=6: found',
+    ]
+
+
+def test_count(capsys, monkeypatch, tree_fixture):
+    monkeypatch.chdir(tree_fixture)
+
+    myapp.app.run(myapp.app.parse_args(['dir3', 'line', '-c']))
+    myapp.app.run(myapp.app.parse_args(['dir3', 'missing', '-c', '-j', '2']))
 
-    print_occurrence_mock.assert_called_with(occurrence_fixture)
+    assert capsys.readouterr().out == 'dir3/file5 count=2\n'
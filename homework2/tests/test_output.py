@@ -0,0 +1,189 @@
+# pylint: disable=W0621
+import io
+import json
+import os
+import pathlib
+from unittest import mock
+
+import pytest
+
+import myapp.output
+from myapp.occurrence import FileCount, Occurrence
+
+
+@mock.patch('pathlib.Path', spec=pathlib.Path)
+def test_get_relative_path_view(pathlib_mock, file_factory_fixture):
+    relative_path = file_factory_fixture.get(path='dir/file')
+    pathlib_mock.return_value = pathlib_mock
+
+    output = myapp.output.get_relative_path_view(relative_path)
+
+    relative_path.relative_to.assert_called_once()
+    pathlib_mock.assert_called_once()
+    pathlib_mock.absolute.assert_called_once()
+    assert output == 'dir/file'
+
+
+def test_format_occurrence(occurrence_fixture):
+    assert (
+        myapp.output.format_occurrence(occurrence_fixture)
+        == 'venv/path/file line=1: string'
+    )
+    assert (
+        myapp.output.format_occurrence(occurrence_fixture._replace(pattern='str'))
+        == 'venv/path/file line=1 pattern=str: string'
+    )
+
+
+def test_print_occurrence(capsys, occurrence_fixture):
+    myapp.output.print_occurrence(occurrence_fixture)
+    captured = capsys.readouterr()
+    assert captured.out == 'venv/path/file line=1: string\n'
+
+
+class Stream(io.BytesIO):
+    def __init__(self, interactive: bool = False):
+        super().__init__()
+        self.interactive = interactive
+        self.flushes = 0
+
+    def isatty(self) -> bool:
+        return self.interactive
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_writer(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(myapp.output, 'BATCH_SIZE', 2)
+    stream = Stream()
+    writer = myapp.output.OccurrenceWriter(stream)
+    path = tmp_path / 'dir' / 'file'
+
+    writer.write(Occurrence(num, 'line', path) for num in range(1, 4))
+    # full batches are written at once
+    assert stream.getvalue() == b'dir/file line=1: line\ndir/file line=2: line\n'
+    writer.write([Occurrence(4, 'line', tmp_path / 'file', 'li')])
+    writer.flush()
+
+    assert stream.getvalue().decode().splitlines()[2:] == [
+        'dir/file line=3: line',
+        'file line=4 pattern=li: line',
+    ]
+    assert stream.flushes == 1
+
+
+def test_interactive_writer(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream(interactive=True)
+    writer = myapp.output.OccurrenceWriter(stream, myapp.output.JSON)
+
+    writer.write([Occurrence(1, 'строка', tmp_path / 'file', 'стр')])
+
+    # the terminal gets occurrences of every file at once
+    assert json.loads(stream.getvalue()) == {
+        'path': 'file',
+        'line': 1,
+        'text': 'строка',
+        'pattern': 'стр',
+    }
+
+
+def test_json_writer_undecodable_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream()
+    writer = myapp.output.OccurrenceWriter(stream, myapp.output.JSON)
+
+    writer.write([Occurrence(1, 'line', tmp_path / os.fsdecode(b'file\xff'))])
+    writer.flush()
+
+    # undecodable bytes are escaped, so the output is valid UTF-8 and the path is lossless
+    assert b'\\udcff' in stream.getvalue()
+    occurrence = json.loads(stream.getvalue().decode('utf-8'))
+    assert os.fsencode(occurrence['path']) == b'file\xff'
+
+
+def test_writer_equal_paths(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream()
+    writer = myapp.output.OccurrenceWriter(stream, context=True)
+
+    # different objects of the same path are the same file
+    writer.write([Occurrence(1, 'line', tmp_path / 'file')])
+    writer.write([Occurrence(2, 'line', tmp_path / 'file')])
+    writer.flush()
+
+    assert stream.getvalue() == b'file line=1: line\nfile line=2: line\n'
+
+
+def test_writer_outside_current_directory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream()
+    writer = myapp.output.OccurrenceWriter(stream, myapp.output.NULL)
+
+    # paths outside of the current directory stay absolute
+    writer.write([Occurrence(1, 'line', tmp_path.parent / 'file')])
+    writer.flush()
+
+    assert stream.getvalue() == f'{tmp_path.parent / "file"}\0line=1: line\n'.encode()
+    assert myapp.output.get_relative_path_view(pathlib.Path('/file')) == '/file'
+
+
+@pytest.mark.parametrize(
+    'output_format, expected',
+    [
+        (
+            myapp.output.TEXT,
+            'file line=1- before\nfile line=2: line\n--\n'
+            'file line=5: line\n--\ndir/file line=1: line\n',
+        ),
+        (
+            myapp.output.JSON,
+            '{"path": "file", "line": 1, "text": "before", "context": true}\n'
+            '{"path": "file", "line": 2, "text": "line"}\n'
+            '{"path": "file", "line": 5, "text": "line"}\n'
+            '{"path": "dir/file", "line": 1, "text": "line"}\n',
+        ),
+    ],
+)
+def test_context_writer(monkeypatch, tmp_path, output_format, expected):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream()
+    writer = myapp.output.OccurrenceWriter(stream, output_format, context=True)
+    path = tmp_path / 'file'
+
+    writer.write(
+        [Occurrence(1, 'before', path, context=True), Occurrence(2, 'line', path)]
+    )
+    # groups are separated between batches and files
+    writer.write([Occurrence(5, 'line', path)])
+    writer.write([Occurrence(1, 'line', tmp_path / 'dir' / 'file')])
+    writer.flush()
+
+    assert stream.getvalue().decode() == expected
+
+
+@pytest.mark.parametrize(
+    'output_format, expected',
+    [
+        (myapp.output.TEXT, 'file count=3\ndir/file count=1\n'),
+        (myapp.output.NULL, 'file\0count=3\ndir/file\0count=1\n'),
+        (
+            myapp.output.JSON,
+            '{"path": "file", "count": 3}\n{"path": "dir/file", "count": 1}\n',
+        ),
+    ],
+)
+def test_write_counts(monkeypatch, tmp_path, output_format, expected):
+    monkeypatch.chdir(tmp_path)
+    stream = Stream(interactive=True)
+    writer = myapp.output.OccurrenceWriter(stream, output_format)
+
+    writer.write_counts(
+        [FileCount(tmp_path / 'file', 3), FileCount(tmp_path / 'dir' / 'file', 1)]
+    )
+
+    assert stream.getvalue().decode() == expected
+    # the terminal gets every count at once
+    assert stream.flushes == 2
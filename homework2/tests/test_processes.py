@@ -0,0 +1,68 @@
+# pylint: disable=W0621
+import pathlib
+
+import pytest
+
+import myapp.api
+import myapp.processes
+import myapp.search
+from myapp.occurrence import Occurrence
+from myapp.processes import Task
+
+
+@pytest.fixture()
+def big_file(monkeypatch, tmp_path) -> pathlib.Path:
+    # every range is about five lines, small files are not split
+    monkeypatch.setattr(myapp.processes, 'SHARD_SIZE', 40)
+    path = tmp_path / 'big'
+    path.write_text(''.join(f'line {i}\n' for i in range(1, 21)))
+    return path
+
+
+def test_make_tasks(tree_fixture, big_file):
+    binary = tree_fixture / 'binary'
+    binary.write_bytes(b'\x00' * 50)
+    files = [tree_fixture / 'file1', big_file, binary, tree_fixture / 'not_existing']
+
+    tasks = list(myapp.processes.make_tasks(files))
+
+    assert tasks[0] == Task(str(tree_fixture / 'file1'))
+    assert [task.start for task in tasks[1:-1]] == [0, 40, 80, 120]
+    assert all(task.path == str(big_file) for task in tasks[1:-1])
+    assert tasks[-2].end == myapp.processes.FILE_END
+    # the worker fails on the file which cannot be read
+    assert tasks[-1] == Task(str(tree_fixture / 'not_existing'))
+    assert len(list(myapp.processes.make_tasks([binary], text=True))) == 2
+
+
+def test_search_task(monkeypatch, big_file):
+    monkeypatch.setattr(myapp.processes, '_matcher', myapp.search.SubstringMatcher('1'))
+
+    # ranges from the middle of lines start with next lines, they are lines 9-13
+    result = myapp.processes.search_task(Task(str(big_file), 50, 90))
+    assert result.newlines == 5
+    assert result.occurrences(8) == [
+        Occurrence(num, f'line {num}', big_file) for num in range(10, 14)
+    ]
+
+    result = myapp.processes.search_task(Task(str(big_file)))
+    assert result.occurrences(0)[:2] == [
+        Occurrence(1, 'line 1', big_file),
+        Occurrence(10, 'line 10', big_file),
+    ]
+    assert not myapp.processes.search_task(Task(str(big_file), 0, 0)).occurrences(0)
+
+
+@pytest.mark.parametrize('processes', [1, 3])
+def test_search_processes(tree_fixture, big_file, processes):
+    (tree_fixture / 'patterns').write_text('1\nline\n')
+    files = [big_file, *myapp.api.file_walk(tree_fixture)]
+    matcher = myapp.search.PatternsMatcher(['1', 'line'])
+
+    found = myapp.processes.search_processes(files, matcher, processes)
+
+    assert [occurrence for batch in found for occurrence in batch] == [
+        occurrence
+        for file in files
+        for occurrence in myapp.search.search_file(file, matcher)
+    ]
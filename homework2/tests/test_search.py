@@ -0,0 +1,158 @@
+import bz2
+import gzip
+import lzma
+import pathlib
+import re
+
+import pytest
+
+import myapp.blocks
+import myapp.search
+from myapp.occurrence import Occurrence
+
+
+@pytest.mark.parametrize('block_size', [2, 8, 1024])
+@pytest.mark.parametrize('pattern', [b'line', b'second', b'77', b''])
+def test_substring_matcher(monkeypatch, block_size: int, pattern: bytes):
+    # small blocks make both sparse and dense blocks
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', block_size)
+    path = pathlib.Path('file')
+    lines = [f'{i} line' if i % 3 else f'{i} second line ' for i in range(1, 200)]
+    buffer = '\n'.join(lines).encode()
+
+    expected = [
+        Occurrence(num, line.strip(), path)
+        for num, line in enumerate(lines, start=1)
+        if pattern.decode() in line
+    ]
+    matcher = myapp.search.SubstringMatcher(pattern.decode())
+
+    assert list(matcher.search(path, buffer)) == expected
+
+    # lines are counted without occurrences
+    assert sum(map(matcher.count_block, myapp.blocks.iter_blocks(buffer))) == len(
+        expected
+    )
+
+
+def test_search_file(tree_fixture):
+    binary = tree_fixture / 'binary'
+    binary.write_bytes(b'\x00\xff\xfeline\n\xff\n')
+    empty = tree_fixture / 'empty_file'
+    empty.write_bytes(b'')
+
+    # binary files are searched only as text
+    assert not list(
+        myapp.search.search_file(binary, myapp.search.SubstringMatcher('line'))
+    )
+    assert list(
+        myapp.search.search_file(binary, myapp.search.SubstringMatcher('line'), True)
+    ) == [Occurrence(1, '\x00��line', binary)]
+    archive = tree_fixture / 'archive.gz'
+    archive.write_bytes(gzip.compress(b'\x00line\n'))
+    assert not list(
+        myapp.search.search_file(archive, myapp.search.SubstringMatcher('line'))
+    )
+    assert not list(
+        myapp.search.search_file(empty, myapp.search.SubstringMatcher('line'))
+    )
+    assert not list(myapp.search.search_file(empty, myapp.search.SubstringMatcher('')))
+    assert list(
+        myapp.search.search_file(
+            tree_fixture / 'file1', myapp.search.SubstringMatcher('second')
+        )
+    ) == [Occurrence(2, 'second line', tree_fixture / 'file1')]
+
+
+def test_count_file(tree_fixture):
+    path = tree_fixture / 'log.gz'
+    path.write_bytes(gzip.compress(b'line\n' * 10))
+    binary = tree_fixture / 'binary'
+    binary.write_bytes(b'\x00line\n')
+    matcher = myapp.search.SubstringMatcher('line')
+
+    assert myapp.search.count_file(path, matcher) == 10
+    assert myapp.search.count_file(path, matcher, max_count=3) == 3
+    assert myapp.search.count_file(binary, matcher) == 0
+    assert myapp.search.count_file(binary, matcher, True) == 1
+
+
+@pytest.mark.parametrize('compress', [gzip.compress, bz2.compress, lzma.compress])
+def test_search_compressed_file(monkeypatch, tree_fixture, compress):
+    monkeypatch.setattr(myapp.compressed, 'CHUNK_SIZE', 16)
+    path = tree_fixture / 'log'
+    lines = [f'{i} line' for i in range(1, 100)]
+    # concatenated archives are searched as one file
+    path.write_bytes(
+        compress('\n'.join(lines[:50]).encode() + b'\n')
+        + compress('\n'.join(lines[50:]).encode())
+    )
+    matcher = myapp.search.RegexMatcher(r'^\d*7 ')
+
+    assert list(myapp.search.search_file(path, matcher)) == [
+        Occurrence(num, line, path)
+        for num, line in enumerate(lines, start=1)
+        if '7 ' in line
+    ]
+    # the search which is stopped early stops decompression
+    found = myapp.search.search_file(path, matcher)
+    assert next(found) == Occurrence(7, '7 line', path)
+    found.close()
+
+
+@pytest.mark.parametrize('block_size', [2, 1024])
+def test_patterns_matcher(monkeypatch, block_size: int):
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', block_size)
+    path = pathlib.Path('file')
+    buffer = 'E100 failed\nok\nE2 and E100\nпривет мир\n\xff E2'.encode()
+    matcher = myapp.search.PatternsMatcher(['E100', 'E2', 'мир', 'missing'])
+
+    assert list(matcher.search(path, buffer)) == [
+        Occurrence(1, 'E100 failed', path, 'E100'),
+        Occurrence(3, 'E2 and E100', path, 'E2'),
+        Occurrence(4, 'привет мир', path, 'мир'),
+        Occurrence(5, 'ÿ E2', path, 'E2'),
+    ]
+    assert sum(map(matcher.count_block, myapp.blocks.iter_blocks(buffer))) == 4
+    assert not list(myapp.search.PatternsMatcher([]).search(path, buffer))
+
+
+@pytest.mark.parametrize(
+    'pattern',
+    [
+        r'line \d+$',
+        r'(^|\s)1\d',
+        r'second|ine 7',
+        r'\d',
+        r'(?i)SECOND',
+        '',
+    ],
+)
+def test_regex_matcher(monkeypatch, pattern: str):
+    monkeypatch.setattr(myapp.blocks, 'BLOCK_SIZE', 64)
+    path = pathlib.Path('file')
+    lines = [f'line {i}' if i % 3 else f'  second line {i} ' for i in range(1, 40)]
+    buffer = '\n'.join(lines).encode()
+
+    expected = [
+        Occurrence(num, line.strip(), path)
+        for num, line in enumerate(lines, start=1)
+        if re.search(pattern, line)
+    ]
+    matcher = myapp.search.RegexMatcher(pattern)
+
+    assert list(matcher.search(path, buffer)) == expected
+
+    # lines are counted without occurrences
+    assert sum(map(matcher.count_block, myapp.blocks.iter_blocks(buffer))) == len(
+        expected
+    )
+
+
+def test_regex_matcher_literals():
+    assert myapp.search.RegexMatcher(r'\d+ мс').literals() == [' мс'.encode()]
+    assert myapp.search.RegexMatcher(r'ab|cd').literals() == [b'ab', b'cd']
+    assert myapp.search.RegexMatcher(r'\d+').literals() == [b'']
+    matcher = myapp.search.RegexMatcher('[\ud800]|\ud800')
+
+    assert not list(matcher.search(pathlib.Path('file'), b'\xed\xa0\x80\n'))
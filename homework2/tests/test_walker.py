@@ -0,0 +1,100 @@
+# pylint: disable=W0621
+import pathlib
+import threading
+import time
+
+import pytest
+
+import myapp.walker
+from myapp.walker import ParallelWalker, WorkStealingPool, iter_files
+
+
+def test_iter_files(tree_fixture):
+    files = list(iter_files(str(tree_fixture)))
+
+    assert sorted(files) == sorted(
+        str(tree_fixture / name)
+        for name in ('file1', 'file2', 'dir1/file3', 'dir1/dir2/file4', 'dir3/file5')
+    )
+    assert not list(iter_files(str(tree_fixture / 'not_existing')))
+
+
+@pytest.mark.parametrize('jobs', [1, 2, 8])
+def test_ordered_map(tree_fixture, jobs):
+    walker = ParallelWalker(jobs)
+
+    results = list(walker.map(tree_fixture, lambda path: path.name, ordered=True))
+
+    assert results == [
+        pathlib.Path(file).name for file in iter_files(str(tree_fixture))
+    ]
+
+
+def test_unordered_map(tree_fixture):
+    walker = ParallelWalker(4)
+
+    results = list(walker.map(tree_fixture, lambda path: path.read_text('utf-8')))
+
+    assert sorted(results) == sorted(
+        pathlib.Path(file).read_text('utf-8') for file in iter_files(str(tree_fixture))
+    )
+
+
+def test_map_single_file(tree_fixture):
+    walker = ParallelWalker(2)
+
+    assert list(walker.map(tree_fixture / 'file1', lambda path: path)) == [
+        tree_fixture / 'file1'
+    ]
+    assert not list(walker.map(tree_fixture / 'not_existing', lambda path: path))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_map_error(tree_fixture, ordered):
+    def fail(path: pathlib.Path):
+        raise ValueError(path)
+
+    with pytest.raises(ValueError):
+        list(ParallelWalker(2).map(tree_fixture, fail, ordered))
+
+
+def test_map_early_stop(tree_fixture):
+    results = ParallelWalker(2).map(tree_fixture, lambda path: path, ordered=True)
+
+    assert isinstance(next(results), pathlib.Path)
+    results.close()
+
+
+def test_map_waits_for_caller(monkeypatch, tree_fixture):
+    monkeypatch.setattr(myapp.walker, 'PENDING_PER_JOB', 1)
+    processed = []
+    results = ParallelWalker(1).map(tree_fixture, processed.append)
+
+    next(results)
+    time.sleep(0.1)
+
+    # the taken result and the one waiting for the caller
+    assert len(processed) <= 2
+    results.close()
+
+
+def test_pool_steals_tasks():
+    done = threading.Event()
+    threads = set()
+    lock = threading.Lock()
+
+    def task():
+        with lock:
+            threads.add(threading.get_ident())
+            if len(threads) == 2:
+                done.set()
+        done.wait(1)
+
+    pool = WorkStealingPool(2)
+    # both tasks go to the first deque, the second worker has to steal one of them
+    pool.submit(task)
+    pool.submit(task)
+
+    assert done.wait(2)
+    assert len(threads) == 2
+    pool.shutdown()
@@ -0,0 +1,82 @@
+# pylint: disable=W0621, W0212
+import ctypes
+import errno
+import os
+
+import pytest
+
+import myapp.watch
+
+
+def event(descriptor: int, mask: int, name: bytes = b'') -> bytes:
+    # names are padded with null bytes
+    name = name + b'\0' * (-len(name) % 16) if name else b''
+    return myapp.watch.EVENT.pack(descriptor, mask, 0, len(name)) + name
+
+
+@pytest.fixture()
+def inotify():
+    watcher = myapp.watch.make_watcher()
+    if not isinstance(watcher, myapp.watch.Inotify):
+        pytest.skip('inotify is not available')
+    yield watcher
+    watcher.close()
+
+
+def test_inotify(inotify, tmp_path):
+    (tmp_path / 'file').write_text('first\n')
+    inotify.watch(str(tmp_path))
+    inotify.watch(str(tmp_path / 'not_existing'))
+
+    with (tmp_path / 'file').open('a') as file:
+        file.write('second\n')
+    assert inotify.wait() == {str(tmp_path / 'file')}
+    (tmp_path / 'new').write_text('new\n')
+    assert inotify.wait() is None
+
+
+def test_parse_events(inotify):
+    inotify._directories[1] = '/logs'
+    parse = inotify._parse
+
+    data = event(1, myapp.watch.IN_MODIFY, b'app.log') + event(
+        2, myapp.watch.IN_MODIFY, b'x'
+    )
+    assert parse(data, set()) == {os.path.join('/logs', 'app.log')}
+    data += event(1, myapp.watch.IN_CREATE | myapp.watch.IN_ISDIR, b'dir')
+    assert parse(data, set()) is None
+    assert parse(event(1, myapp.watch.IN_Q_OVERFLOW), set()) is None
+
+
+def test_watch_errors(monkeypatch, inotify, tmp_path):
+    monkeypatch.setattr(inotify, '_libc', FailingLibc())
+
+    with pytest.raises(OSError):
+        inotify.watch(str(tmp_path))
+    with pytest.raises(OSError):
+        myapp.watch.Inotify(FailingLibc())
+
+
+class FailingLibc:
+    @staticmethod
+    def inotify_init1(*_args) -> int:
+        ctypes.set_errno(errno.EMFILE)
+        return -1
+
+    @staticmethod
+    def inotify_add_watch(*_args) -> int:
+        # there are too many watches
+        ctypes.set_errno(errno.ENOSPC)
+        return -1
+
+
+def test_poller(monkeypatch):
+    monkeypatch.setattr(myapp.watch.ctypes, 'CDLL', lambda *args, **kwargs: object())
+    monkeypatch.setattr(myapp.watch, 'POLL_INTERVAL', 0)
+
+    poller = myapp.watch.make_watcher()
+    poller.watch('/logs')
+
+    assert isinstance(poller, myapp.watch.Poller)
+    assert poller.wait() is None
+    poller.close()